@@ -0,0 +1,33 @@
+"""audit tenant created index
+
+Revision ID: 2e8f5a6c1d94
+Revises: 7c41d2e9b8a5
+Create Date: 2026-10-16 11:03:27.114562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e8f5a6c1d94'
+down_revision: Union[str, Sequence[str], None] = '7c41d2e9b8a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_audit_tenant_created', 'audit_logs', ['tenant_id', 'created_at'],
+                    unique=False, postgresql_include=['action', 'resource_type'])
+    # Prefix of uq_quota_tenant_type_period's index
+    op.drop_index('idx_quota_tenant_type', table_name='quota_usage')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('idx_quota_tenant_type', 'quota_usage', ['tenant_id', 'quota_type'],
+                    unique=False)
+    op.drop_index('idx_audit_tenant_created', table_name='audit_logs')
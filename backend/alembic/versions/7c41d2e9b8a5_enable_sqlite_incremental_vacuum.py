@@ -0,0 +1,38 @@
+"""enable sqlite incremental vacuum
+
+Revision ID: 7c41d2e9b8a5
+Revises: af3ea35d0333
+Create Date: 2026-10-16 10:12:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c41d2e9b8a5'
+down_revision: Union[str, Sequence[str], None] = 'af3ea35d0333'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _set_auto_vacuum(mode: str) -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    # auto_vacuum only changes on an existing file through a full VACUUM, which cannot run
+    # inside a transaction
+    with op.get_context().autocommit_block():
+        bind.exec_driver_sql(f"PRAGMA auto_vacuum={mode}")
+        bind.exec_driver_sql("VACUUM")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _set_auto_vacuum('INCREMENTAL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _set_auto_vacuum('NONE')
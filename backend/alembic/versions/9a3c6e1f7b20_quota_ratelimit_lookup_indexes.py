@@ -0,0 +1,66 @@
+"""quota and rate limit lookup indexes
+
+Revision ID: 9a3c6e1f7b20
+Revises: d41a7c08e6f3
+Create Date: 2026-10-16 15:08:41.502317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a3c6e1f7b20'
+down_revision: Union[str, Sequence[str], None] = 'd41a7c08e6f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, composite index, its columns, single-column index it replaces, that column)
+LOOKUP_INDEXES = (
+    ('quota_usage', 'ix_quota_lookup', ['tenant_id', 'metric_key', 'window_start'],
+     'ix_quota_usage_metric_key', 'metric_key'),
+    ('rate_limits', 'ix_ratelimit_lookup', ['tenant_id', 'bucket_key', 'user_id'],
+     'ix_rate_limits_bucket_key', 'bucket_key'),
+    ('billing_events', 'ix_billing_tenant_processed', ['tenant_id', 'processed', 'created_at'],
+     'ix_billing_events_tenant_id', 'tenant_id'),
+)
+
+
+def _columns(inspector, table):
+    if not inspector.has_table(table):
+        return set()
+    return {column['name'] for column in inspector.get_columns(table)}
+
+
+def _indexes(inspector, table):
+    if not inspector.has_table(table):
+        return set()
+    return {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # These columns (and billing_events) come from the models via create_all rather than
+    # an earlier revision, so only touch databases that actually have them
+    inspector = sa.inspect(op.get_bind())
+    for table, name, columns, replaced, _ in LOOKUP_INDEXES:
+        if not set(columns) <= _columns(inspector, table):
+            continue
+        indexes = _indexes(inspector, table)
+        if name not in indexes:
+            op.create_index(name, table, columns, unique=False)
+        if replaced in indexes:
+            op.drop_index(replaced, table_name=table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    for table, name, _, replaced, column in LOOKUP_INDEXES:
+        indexes = _indexes(inspector, table)
+        if name not in indexes:
+            continue
+        op.create_index(replaced, table, [column], unique=False)
+        op.drop_index(name, table_name=table)
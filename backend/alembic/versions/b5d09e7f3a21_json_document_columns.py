@@ -0,0 +1,44 @@
+"""json document columns
+
+Revision ID: b5d09e7f3a21
+Revises: 2e8f5a6c1d94
+Create Date: 2026-10-16 11:41:09.820317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d09e7f3a21'
+down_revision: Union[str, Sequence[str], None] = '2e8f5a6c1d94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns holding JSON text that become JSONB on Postgres. Other dialects keep the TEXT
+# storage that SQLAlchemy's JSON type already reads and writes, so nothing changes there.
+_COLUMNS = (('api_keys', 'permissions'), ('audit_logs', 'context_data'))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, column in _COLUMNS:
+        op.alter_column(table, column, type_=postgresql.JSONB(), existing_type=sa.Text(),
+                        existing_nullable=True, postgresql_using=f'{column}::jsonb')
+    op.create_index('idx_api_key_perm_gin', 'api_keys', ['permissions'], unique=False,
+                    postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('idx_api_key_perm_gin', table_name='api_keys')
+    for table, column in _COLUMNS:
+        op.alter_column(table, column, type_=sa.Text(), existing_type=postgresql.JSONB(),
+                        existing_nullable=True, postgresql_using=f'{column}::text')
@@ -0,0 +1,93 @@
+"""partition audit logs
+
+Revision ID: d41a7c08e6f3
+Revises: b5d09e7f3a21
+Create Date: 2026-10-16 13:22:54.067391
+
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41a7c08e6f3'
+down_revision: Union[str, Sequence[str], None] = 'b5d09e7f3a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Postgres only: audit_logs becomes RANGE (created_at) partitioned with one partition per
+# month, so the hot month's indexes stay small and old months can be detached instead of
+# DELETEd. A partitioned table's primary key must contain the partition key: (id, created_at).
+MONTHS_AHEAD = 2
+
+_INDEXES = (
+    ('idx_audit_created_at', ['created_at'], {}),
+    ('idx_audit_tenant_action', ['tenant_id', 'action'], {}),
+    ('idx_audit_user', ['user_id'], {}),
+    ('idx_audit_tenant_created', ['tenant_id', 'created_at'],
+     {'postgresql_include': ['action', 'resource_type']}),
+)
+
+
+def _next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def _rebuild(bind, partitioned: bool) -> None:
+    """Recreate audit_logs (partitioned or plain) with the same columns and rows"""
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_old")
+    op.execute(
+        "CREATE TABLE audit_logs (LIKE audit_logs_old INCLUDING DEFAULTS)"
+        + (" PARTITION BY RANGE (created_at)" if partitioned else "")
+    )
+    if partitioned:
+        first = bind.execute(sa.text("SELECT min(created_at) FROM audit_logs_old")).scalar()
+        first = first or datetime.utcnow()
+        month = first.date().replace(day=1)
+        last = datetime.utcnow().date().replace(day=1)
+        for _ in range(MONTHS_AHEAD):
+            last = _next_month(last)
+        while month <= last:
+            op.execute(
+                f"CREATE TABLE audit_logs_{month:%Y_%m} PARTITION OF audit_logs "
+                f"FOR VALUES FROM ('{month}') TO ('{_next_month(month)}')"
+            )
+            month = _next_month(month)
+        # Catches rows beyond the newest partition if the beat job ever falls behind
+        op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+    op.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_old")
+
+    # The id sequence belongs to the old table's column; move it before dropping that table
+    sequence = bind.execute(
+        sa.text("SELECT pg_get_serial_sequence('audit_logs_old', 'id')")
+    ).scalar()
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY audit_logs.id")
+    op.execute("DROP TABLE audit_logs_old")
+
+    op.create_primary_key('audit_logs_pkey', 'audit_logs',
+                          ['id', 'created_at'] if partitioned else ['id'])
+    op.create_foreign_key('audit_logs_tenant_id_fkey', 'audit_logs', 'tenants',
+                          ['tenant_id'], ['id'])
+    op.create_foreign_key('audit_logs_user_id_fkey', 'audit_logs', 'users', ['user_id'], ['id'])
+    for name, columns, kwargs in _INDEXES:
+        op.create_index(name, 'audit_logs', columns, unique=False, **kwargs)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    _rebuild(bind, partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    _rebuild(bind, partitioned=False)
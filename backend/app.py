@@ -7,31 +7,50 @@ handling data persistence, user management, and financial analysis storage.
 """
 
 import os
-import json
+import socket
 import uuid
 import logging
 import time
+import threading
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any
 
-from flask import Flask, request, jsonify, send_from_directory, g, make_response, Response
+from flask import (
+    Flask,
+    request,
+    send_from_directory,
+    g,
+    has_request_context,
+    make_response,
+    Response,
+    stream_with_context,
+)
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import HTTPException
 from werkzeug.http import http_date
 import hashlib
-from flask_cors import CORS
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import and_, bindparam, event, lambda_stmt, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import load_only, raiseload
+from sqlalchemy.pool import NullPool, StaticPool
 from flask_jwt_extended import JWTManager
-from flasgger import Swagger
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
+import orjson
 
 from .app_logging import configure_logging, request_start, log_request
 from .metrics import (
     init_app as metrics_init_app,
+    prebind_request_metrics,
     before_request as metrics_before_request,
     after_request as metrics_after_request,
 )
 from .settings import settings
-from .rate_limiter import auth_rate_limit, financial_data_rate_limit, rate_limit
-from .auth import AuthManager, auth_required, get_current_user_id
+from .rate_limiter import auth_rate_limit, financial_data_rate_limit, rate_limit, rate_limiter
+from .auth import AuthManager, auth_required, get_current_user_id, load_request_identity
 from weasyprint import HTML  # PDF generation
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
@@ -60,39 +79,177 @@ from api.tenant_management_routes import tenant_management_bp
 # Import ML registry for variant routing activation
 from ml_models.registry import registry as ml_registry
 
+def _redis_pool(url: str):
+    """Shared, bounded Redis pool: threads wait for a free connection instead of opening more.
+
+    Keepalive probes and periodic health checks catch connections silently dropped by NAT or
+    Redis' idle timeout before a request trips over them.
+    """
+    import redis
+
+    keepalive = {}
+    for opt, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+        if hasattr(socket, opt):
+            keepalive[getattr(socket, opt)] = value
+    return redis.BlockingConnectionPool.from_url(
+        url,
+        max_connections=int(os.environ.get("REDIS_MAX_CONNECTIONS", "64")),
+        timeout=5,
+        socket_keepalive=True,
+        socket_keepalive_options=keepalive,
+        health_check_interval=30,
+    )
+
+
 # Import monitoring system
 try:
     from monitoring import MonitoringManager, init_monitoring_routes
     import redis
 
-    redis_client = redis.Redis.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379"))
+    redis_client = redis.Redis(
+        connection_pool=_redis_pool(os.environ.get("REDIS_URL", "redis://localhost:6379"))
+    )
     monitoring_enabled = True
 except ImportError:
     monitoring_enabled = False
     redis_client = None
 
+if redis_client is not None:
+    # Rate limits as one Redis token bucket per client shared by every worker, instead of a
+    # sliding window per process; falls back to the local window while Redis is unreachable
+    rate_limiter.use_redis(redis_client)
+
 
 # Configuration
-class Config:
-    SECRET_KEY = os.environ.get("SECRET_KEY") or "dev-secret-key-change-in-production"
-    SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL") or "sqlite:///valor_ivx.db"
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
-    JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY") or "jwt-secret-key-change-in-production"
-    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
-    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+def _json_column_dumps(obj: Any) -> str:
+    # JSON/JSONB bind values: numpy scalars and int-keyed dicts encode as they do in API responses
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+def _is_sqlite_memory(database_uri: str) -> bool:
+    if database_uri in ("sqlite://", "sqlite:///"):
+        return True
+    return ":memory:" in database_uri or "mode=memory" in database_uri
+
+
+def _engine_options(database_uri: str) -> Dict[str, Any]:
+    """Connection pool settings for the primary database.
 
+    Under gunicorn+gevent every greenlet may hold a connection, so size the pool as
+    (workers x greenlets_per_worker) <= pool_size + max_overflow <= Postgres max_connections.
+    An in-memory SQLite database exists per connection, so it is shared as one connection
+    across threads; SQLite files keep the default pool, a connection (and transaction) per
+    checkout, with busy_timeout riding out writer contention.
+    JSON columns are encoded/decoded with orjson on every backend.
+    """
+    options: Dict[str, Any] = {
+        "json_serializer": _json_column_dumps,
+        "json_deserializer": orjson.loads,
+    }
+    if database_uri.startswith("sqlite"):
+        if _is_sqlite_memory(database_uri):
+            options.update(poolclass=StaticPool, connect_args={"check_same_thread": False})
+        return options
+    if os.environ.get("DB_PGBOUNCER", "").lower() in {"1", "true", "yes"}:
+        # PgBouncer in transaction mode does the pooling; a second client-side pool only
+        # pins server slots
+        options["poolclass"] = NullPool
+        return options
+    options.update(
+        pool_size=int(os.environ.get("DB_POOL_SIZE", "20")),
+        max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", "40")),
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        pool_use_lifo=True,
+    )
+    if database_uri.startswith(("postgresql://", "postgresql+psycopg2://")):
+        # Batch UPDATE/DELETE executemany too, not just INSERTs
+        options["executemany_mode"] = "values_plus_batch"
+    return options
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Route jsonify()/request.get_json() (including every blueprint) through orjson.
+
+    Dates and datetimes are passed through to Flask's default(), so jsonify() keeps emitting
+    HTTP dates as before; Decimal and other types orjson can't encode fall back there too.
+    Bodies orjson rejects (NaN/Infinity literals) are re-parsed by the stdlib, which accepts them.
+    Differences from the stdlib provider: keys are not sorted, indent and other kwargs are
+    ignored, and NaN/Infinity floats are encoded as null.
+    """
 
-# Initialize Flask app
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=_PROVIDER_OPTIONS).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            return super().loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=_PROVIDER_OPTIONS),
+            mimetype=self.mimetype,
+        )
+
+
+# Initialize Flask app (configuration comes from the validated settings object)
 app = Flask(__name__, static_folder="../", static_url_path="")
-app.config.from_object(Config)
+app.json = ORJSONProvider(app)
+app.config.update(
+    SECRET_KEY=settings.SECRET_KEY,
+    SQLALCHEMY_DATABASE_URI=settings.DATABASE_URL,
+    SQLALCHEMY_ENGINE_OPTIONS=_engine_options(settings.DATABASE_URL),
+    SQLALCHEMY_TRACK_MODIFICATIONS=False,
+    JWT_SECRET_KEY=settings.JWT_SECRET_KEY,
+    JWT_ACCESS_TOKEN_EXPIRES=timedelta(hours=24),
+    JWT_REFRESH_TOKEN_EXPIRES=timedelta(days=30),
+)
 
 # Configure structured logging (via structlog backend/logging.py)
 configure_logging()
 app.logger.setLevel(getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO))
 
 
+# CORS is answered by the request hooks below; an exact set lookup replaces Flask-CORS's
+# per-request origin matching. Credentials are not allowed cross-origin.
+_ALLOWED_ORIGINS = frozenset({
+    "http://localhost:8000",
+    "http://127.0.0.1:8000",
+    "http://localhost:5001",
+    "http://127.0.0.1:5001",
+})
+_CORS_ALLOW_METHODS = "GET, HEAD, POST, OPTIONS, PUT, PATCH, DELETE"
+
+
+def _apply_cors_headers(response):
+    origin = request.headers.get("Origin")
+    if origin not in _ALLOWED_ORIGINS:
+        return response
+    response.headers["Access-Control-Allow-Origin"] = origin
+    response.vary.add("Origin")
+    if _is_cors_preflight():
+        response.headers["Access-Control-Allow-Methods"] = _CORS_ALLOW_METHODS
+        requested_headers = request.headers.get("Access-Control-Request-Headers")
+        if requested_headers:
+            response.headers["Access-Control-Allow-Headers"] = requested_headers
+    return response
+
+
+def _is_cors_preflight() -> bool:
+    return request.method == "OPTIONS" and "Access-Control-Request-Method" in request.headers
+
+
 @app.before_request
-def inject_request_context() -> None:
+def inject_request_context():
+    # Answer CORS preflights before any other hook (metrics, auth, DB) runs. Returning here
+    # skips the remaining before_request hooks; set_request_id_header adds the CORS headers.
+    if _is_cors_preflight():
+        g.request_id = "-"
+        return app.response_class(status=204)
+
     rid = request.headers.get("X-Request-ID") or str(uuid.uuid4())
     g.request_id = rid
     # capture tenant id if provided for correlation/metrics
@@ -102,8 +259,15 @@ def inject_request_context() -> None:
     # metrics timer handled from metrics_before_request hook
 
 
+# Bearer token parsed and verified once per request; @auth_required only reads g
+app.before_request(load_request_identity)
+
+
 @app.after_request
 def set_request_id_header(response):
+    _apply_cors_headers(response)
+    if _is_cors_preflight():
+        return response
     rid = getattr(g, "request_id", None)
     if rid:
         response.headers["X-Request-ID"] = rid
@@ -112,10 +276,27 @@ def set_request_id_header(response):
 
 
 # Initialize extensions
-CORS(app, origins=["http://localhost:8000", "http://127.0.0.1:8000"])
 db = SQLAlchemy(app)
 jwt = JWTManager(app)
 
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """WAL lets readers proceed while a writer is active; NORMAL sync is safe under WAL."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    # Pooled connections write concurrently: wait for the write lock instead of failing
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
+if app.config["SQLALCHEMY_DATABASE_URI"].startswith("sqlite"):
+    with app.app_context():
+        event.listen(db.engine, "connect", _set_sqlite_pragmas)
+
 # Initialize monitoring system
 if monitoring_enabled:
     monitoring_manager = MonitoringManager(redis_client)
@@ -141,35 +322,47 @@ _jinja_env = Environment(
 websocket_manager.init_app(app)
 
 # Swagger (OpenAPI) setup (feature-flag via ENABLE_SWAGGER, default True)
-if os.environ.get("ENABLE_SWAGGER", "true").lower() in {"1", "true", "yes"}:
-    swagger_template = {
-        "swagger": "2.0",
-        "info": {
-            "title": "Valor IVX Backend API",
-            "description": "API documentation for Valor IVX services",
-            "version": "1.0.0",
-        },
-        "schemes": ["http", "https"],
-        "basePath": "/",
-        "tags": [
-            {"name": "System", "description": "System and health endpoints"},
-            {"name": "Runs", "description": "DCF Runs management"},
-            {"name": "Scenarios", "description": "DCF Scenarios management"},
-            {"name": "Financial Data", "description": "Financial data retrieval"},
-            {"name": "LBO", "description": "LBO runs and scenarios"},
-            {"name": "M&A", "description": "M&A runs and scenarios"},
-            {"name": "WebSocket", "description": "Realtime/WebSocket status"},
-        ],
-        "securityDefinitions": {
-            "BearerAuth": {
-                "type": "apiKey",
-                "name": "Authorization",
-                "in": "header",
-                "description": "JWT Authorization header using the Bearer scheme. Example: 'Bearer {token}'",
-            }
-        },
-    }
-    Swagger(app, template=swagger_template)
+SWAGGER_TEMPLATE = {
+    "swagger": "2.0",
+    "info": {
+        "title": "Valor IVX Backend API",
+        "description": "API documentation for Valor IVX services",
+        "version": "1.0.0",
+    },
+    "schemes": ["http", "https"],
+    "basePath": "/",
+    "tags": [
+        {"name": "System", "description": "System and health endpoints"},
+        {"name": "Runs", "description": "DCF Runs management"},
+        {"name": "Scenarios", "description": "DCF Scenarios management"},
+        {"name": "Financial Data", "description": "Financial data retrieval"},
+        {"name": "LBO", "description": "LBO runs and scenarios"},
+        {"name": "M&A", "description": "M&A runs and scenarios"},
+        {"name": "WebSocket", "description": "Realtime/WebSocket status"},
+    ],
+    "securityDefinitions": {
+        "BearerAuth": {
+            "type": "apiKey",
+            "name": "Authorization",
+            "in": "header",
+            "description": (
+                "JWT Authorization header using the Bearer scheme. Example: 'Bearer {token}'"
+            ),
+        }
+    },
+}
+
+
+def _install_swagger(flask_app: Flask) -> None:
+    # flasgger is only imported by processes that actually serve /apidocs
+    from flasgger import Swagger
+
+    Swagger(flask_app, template=SWAGGER_TEMPLATE)
+
+
+# Background workers (Celery) import this module for the models but never serve docs
+if settings.ENABLE_SWAGGER and settings.WORKER_CLASS != "background":
+    _install_swagger(app)
 
 # Wire Prometheus metrics via centralized backend/metrics.py if feature enabled
 if settings.FEATURE_PROMETHEUS_METRICS:
@@ -179,6 +372,10 @@ if settings.FEATURE_PROMETHEUS_METRICS:
 
 
 # Database Models
+# JSON payload columns: native JSONB on Postgres, JSON-encoded TEXT elsewhere
+JSONType = db.JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+
 class User(db.Model):
     """User model for authentication and data ownership"""
 
@@ -191,9 +388,18 @@ class User(db.Model):
     last_login = db.Column(db.DateTime)
 
     # Relationships
-    runs = db.relationship("Run", backref="user", lazy=True, cascade="all, delete-orphan")
-    scenarios = db.relationship("Scenario", backref="user", lazy=True, cascade="all, delete-orphan")
-    notes = db.relationship("Note", backref="user", lazy=True, cascade="all, delete-orphan")
+    # Collections load lazily and only when navigated; list endpoints query the child
+    # tables directly by user_id. Callers that iterate them should add
+    # .options(selectinload(User.runs)) to batch the load into one IN query.
+    runs = db.relationship(
+        "Run", back_populates="user", lazy="select", cascade="all, delete-orphan"
+    )
+    scenarios = db.relationship(
+        "Scenario", back_populates="user", lazy="select", cascade="all, delete-orphan"
+    )
+    notes = db.relationship(
+        "Note", back_populates="user", lazy="select", cascade="all, delete-orphan"
+    )
 
     # Indexes for performance
     __table_args__ = (
@@ -211,12 +417,15 @@ class Run(db.Model):
     tenant_id = db.Column(db.Integer, db.ForeignKey("tenant.id"), nullable=False)  # Multi-tenant support
     run_id = db.Column(db.String(36), unique=True, nullable=False)  # UUID
     ticker = db.Column(db.String(20), nullable=False)
-    inputs = db.Column(db.Text, nullable=False)  # JSON
-    mc_settings = db.Column(db.Text)  # JSON
-    results = db.Column(db.Text)  # JSON
+    inputs = db.Column(JSONType, nullable=False)
+    mc_settings = db.Column(JSONType)
+    results = db.Column(JSONType)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Serializers never touch the owner; refuse implicit per-row loads
+    user = db.relationship("User", back_populates="runs", lazy="raise_on_sql")
+
     # Indexes for performance
     __table_args__ = (
         db.Index('idx_run_tenant_id', 'tenant_id'),
@@ -224,16 +433,21 @@ class Run(db.Model):
         db.Index('idx_run_ticker', 'ticker'),
         db.Index('idx_run_created_at', 'created_at'),
         db.Index('idx_run_tenant_user', 'tenant_id', 'user_id'),
+        db.Index('idx_run_user_updated', 'user_id', 'updated_at'),
+        db.Index('idx_run_user_run_id', 'user_id', 'run_id'),
     )
 
+    # Columns returned by list endpoints with ?fields=summary (skips the JSON payloads)
+    SUMMARY_FIELDS = ("id", "run_id", "ticker", "created_at", "updated_at")
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
             "run_id": self.run_id,
             "ticker": self.ticker,
-            "inputs": json.loads(self.inputs),
-            "mc_settings": json.loads(self.mc_settings) if self.mc_settings else None,
-            "results": json.loads(self.results) if self.results else None,
+            "inputs": self.inputs,
+            "mc_settings": self.mc_settings,
+            "results": self.results,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
         }
@@ -248,11 +462,14 @@ class Scenario(db.Model):
     scenario_id = db.Column(db.String(36), unique=True, nullable=False)  # UUID
     name = db.Column(db.String(100), nullable=False)
     ticker = db.Column(db.String(20), nullable=False)
-    inputs = db.Column(db.Text, nullable=False)  # JSON
-    mc_settings = db.Column(db.Text)  # JSON
+    inputs = db.Column(JSONType, nullable=False)
+    mc_settings = db.Column(JSONType)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Serializers never touch the owner; refuse implicit per-row loads
+    user = db.relationship("User", back_populates="scenarios", lazy="raise_on_sql")
+
     # Indexes for performance
     __table_args__ = (
         db.Index('idx_scenario_tenant_id', 'tenant_id'),
@@ -260,16 +477,22 @@ class Scenario(db.Model):
         db.Index('idx_scenario_ticker', 'ticker'),
         db.Index('idx_scenario_created_at', 'created_at'),
         db.Index('idx_scenario_tenant_user', 'tenant_id', 'user_id'),
+        db.Index('idx_scenario_user_updated', 'user_id', 'updated_at'),
+        db.Index('uq_scenario_user_ticker_name', 'user_id', 'ticker', 'name', unique=True),
+        db.Index('idx_scenario_user_scenario_id', 'user_id', 'scenario_id'),
     )
 
+    # Columns returned by list endpoints with ?fields=summary (skips the JSON payloads)
+    SUMMARY_FIELDS = ("id", "scenario_id", "name", "ticker", "created_at", "updated_at")
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
             "scenario_id": self.scenario_id,
             "name": self.name,
             "ticker": self.ticker,
-            "inputs": json.loads(self.inputs),
-            "mc_settings": json.loads(self.mc_settings) if self.mc_settings else None,
+            "inputs": self.inputs,
+            "mc_settings": self.mc_settings,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
         }
@@ -287,12 +510,16 @@ class Note(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Serializers never touch the owner; refuse implicit per-row loads
+    user = db.relationship("User", back_populates="notes", lazy="raise_on_sql")
+
     # Indexes for performance
     __table_args__ = (
         db.Index('idx_note_tenant_id', 'tenant_id'),
         db.Index('idx_note_user_id', 'user_id'),
         db.Index('idx_note_ticker', 'ticker'),
         db.Index('idx_note_tenant_user_ticker', 'tenant_id', 'user_id', 'ticker'),
+        db.Index('uq_note_user_ticker', 'user_id', 'ticker', unique=True),
     )
 
     def etag(self) -> str:
@@ -318,18 +545,27 @@ class LBORun(db.Model):
     tenant_id = db.Column(db.Integer, db.ForeignKey("tenant.id"), nullable=False)  # Multi-tenant support
     run_id = db.Column(db.String(36), unique=True, nullable=False)  # UUID
     company_name = db.Column(db.String(100), nullable=False)
-    inputs = db.Column(db.Text, nullable=False)  # JSON
-    results = db.Column(db.Text)  # JSON
+    inputs = db.Column(JSONType, nullable=False)
+    results = db.Column(JSONType)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Indexes for performance
+    __table_args__ = (
+        db.Index('idx_lbo_run_user_updated', 'user_id', 'updated_at'),
+        db.Index('idx_lbo_run_user_run_id', 'user_id', 'run_id'),
+    )
+
+    # Columns returned by list endpoints with ?fields=summary (skips the JSON payloads)
+    SUMMARY_FIELDS = ("id", "run_id", "company_name", "created_at", "updated_at")
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
             "run_id": self.run_id,
             "company_name": self.company_name,
-            "inputs": json.loads(self.inputs),
-            "results": json.loads(self.results) if self.results else None,
+            "inputs": self.inputs,
+            "results": self.results,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
         }
@@ -344,17 +580,29 @@ class LBOScenario(db.Model):
     scenario_id = db.Column(db.String(36), unique=True, nullable=False)  # UUID
     name = db.Column(db.String(100), nullable=False)
     company_name = db.Column(db.String(100), nullable=False)
-    inputs = db.Column(db.Text, nullable=False)  # JSON
+    inputs = db.Column(JSONType, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Indexes for performance
+    __table_args__ = (
+        db.Index('idx_lbo_scenario_user_updated', 'user_id', 'updated_at'),
+        db.Index(
+            'uq_lbo_scenario_user_company_name', 'user_id', 'company_name', 'name', unique=True
+        ),
+        db.Index('idx_lbo_scenario_user_scenario_id', 'user_id', 'scenario_id'),
+    )
+
+    # Columns returned by list endpoints with ?fields=summary (skips the JSON payloads)
+    SUMMARY_FIELDS = ("id", "scenario_id", "name", "company_name", "created_at", "updated_at")
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
             "scenario_id": self.scenario_id,
             "name": self.name,
             "company_name": self.company_name,
-            "inputs": json.loads(self.inputs),
+            "inputs": self.inputs,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
         }
@@ -370,11 +618,22 @@ class MARun(db.Model):
     deal_name = db.Column(db.String(100), nullable=False)
     acquirer_name = db.Column(db.String(100), nullable=False)
     target_name = db.Column(db.String(100), nullable=False)
-    inputs = db.Column(db.Text, nullable=False)  # JSON
-    results = db.Column(db.Text)  # JSON
+    inputs = db.Column(JSONType, nullable=False)
+    results = db.Column(JSONType)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Indexes for performance
+    __table_args__ = (
+        db.Index('idx_ma_run_user_created', 'user_id', 'created_at'),
+        db.Index('idx_ma_run_user_run_id', 'user_id', 'run_id'),
+    )
+
+    # Columns returned by list endpoints with ?fields=summary (skips the JSON payloads)
+    SUMMARY_FIELDS = (
+        "id", "run_id", "deal_name", "acquirer_name", "target_name", "created_at", "updated_at",
+    )
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
@@ -382,8 +641,8 @@ class MARun(db.Model):
             "deal_name": self.deal_name,
             "acquirer_name": self.acquirer_name,
             "target_name": self.target_name,
-            "inputs": json.loads(self.inputs),
-            "results": json.loads(self.results) if self.results else None,
+            "inputs": self.inputs,
+            "results": self.results,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
         }
@@ -400,10 +659,23 @@ class MAScenario(db.Model):
     deal_name = db.Column(db.String(100), nullable=False)
     acquirer_name = db.Column(db.String(100), nullable=False)
     target_name = db.Column(db.String(100), nullable=False)
-    inputs = db.Column(db.Text, nullable=False)  # JSON
+    inputs = db.Column(JSONType, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Indexes for performance
+    __table_args__ = (
+        db.Index('idx_ma_scenario_user_created', 'user_id', 'created_at'),
+        db.Index('uq_ma_scenario_user_name', 'user_id', 'name', unique=True),
+        db.Index('idx_ma_scenario_user_scenario_id', 'user_id', 'scenario_id'),
+    )
+
+    # Columns returned by list endpoints with ?fields=summary (skips the JSON payloads)
+    SUMMARY_FIELDS = (
+        "id", "scenario_id", "name", "deal_name", "acquirer_name", "target_name",
+        "created_at", "updated_at",
+    )
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
@@ -412,37 +684,109 @@ class MAScenario(db.Model):
             "deal_name": self.deal_name,
             "acquirer_name": self.acquirer_name,
             "target_name": self.target_name,
-            "inputs": json.loads(self.inputs),
+            "inputs": self.inputs,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
         }
 
 
+# The app's AuthManager: with Redis, logins buffer last_login there for the
+# auth.flush_last_login beat task instead of writing the row on every login
+auth_manager = AuthManager(db, User, redis_client)
+
+
 # Helper functions
+# Demo user id resolved once per process; the row never changes after creation
+_DEMO_USER_ID: Optional[int] = None
+# Authenticated requests carry their user id in the JWT; only the demo user id needs looking up,
+# so workers share it through Redis instead of each running the username query on first use.
+_DEMO_USER_ID_KEY = "user:demo:id:" + hashlib.sha1(
+    app.config["SQLALCHEMY_DATABASE_URI"].encode()
+).hexdigest()[:12]
+
+
+def _shared_demo_user_id() -> Optional[int]:
+    if redis_client is None:
+        return None
+    try:
+        value = redis_client.get(_DEMO_USER_ID_KEY)
+        return int(value) if value is not None else None
+    except Exception:
+        return None
+
+
+def _share_demo_user_id(user_id: int) -> None:
+    if redis_client is None:
+        return
+    try:
+        redis_client.set(_DEMO_USER_ID_KEY, user_id, ex=86400)
+    except Exception:
+        pass
+
+
 def get_or_create_user() -> User:
-    """Get or create a default user for demo purposes"""
+    """Get or create a default user for demo purposes (memoized on flask.g per request)"""
+    if "user" in g:
+        return g.user
+
+    global _DEMO_USER_ID
+    user = None
     # Prefer authenticated user if present
     current_user_id = get_current_user_id()
     if current_user_id:
-        user = User.query.get(current_user_id)
-        if user:
-            return user
+        user = db.session.get(User, current_user_id)
     # Fallback to demo user for unauthenticated flows (non-sensitive)
-    user = User.query.filter_by(username="demo_user").first()
-    if not user:
-        # bcrypt hash of literal "demo_password"
-        # Precomputed once to avoid runtime bcrypt dependency here
-        # Use backend/auth.py for hashing logic for real users
-        user = User(
-            username="demo_user",
-            email="demo@valor-ivx.com",
-            password_hash="$2b$12$h0QxqYV9z8kF0f2s2s6bO.3b0fJ2FIV4ZrI9Jp6i5a7wM8w4sZr7u",  # bcrypt("demo_password")
-        )
-        db.session.add(user)
-        db.session.commit()
+    if user is None and _DEMO_USER_ID is None:
+        _DEMO_USER_ID = _shared_demo_user_id()
+    if user is None and _DEMO_USER_ID is not None:
+        user = db.session.get(User, _DEMO_USER_ID)
+        if user is not None and user.username != "demo_user":
+            user = None
+    if user is None:
+        user = User.query.filter_by(username="demo_user").first()
+        if not user:
+            # bcrypt hash of literal "demo_password"
+            # Precomputed once to avoid runtime bcrypt dependency here
+            # Use backend/auth.py for hashing logic for real users
+            user = User(
+                username="demo_user",
+                email="demo@valor-ivx.com",
+                # bcrypt("demo_password")
+                password_hash="$2b$12$h0QxqYV9z8kF0f2s2s6bO.3b0fJ2FIV4ZrI9Jp6i5a7wM8w4sZr7u",
+            )
+            db.session.add(user)
+            db.session.commit()
+        _DEMO_USER_ID = user.id
+        _share_demo_user_id(user.id)
+
+    g.user = user
     return user
 
 
+def _current_user_id() -> int:
+    """Id of the requesting user, resolved exactly as get_or_create_user() does.
+
+    A token whose user no longer exists falls back to the demo user, and a cached demo id is
+    only trusted after its row is confirmed to still be demo_user; both are primary-key gets.
+    """
+    return get_or_create_user().id
+
+
+@lru_cache(maxsize=None)
+def _owned_stmt(model, key: str):
+    """SELECT model WHERE user_id = :user_id AND <key> = :key, built once per (model, key)"""
+    return select(model).where(
+        model.user_id == bindparam("user_id"), getattr(model, key) == bindparam("key")
+    )
+
+
+def _get_owned(model, user_id: int, **unique_key: Any):
+    """The user's row matching a unique key (run_id, scenario_id, ticker), or None"""
+    (key, value), = unique_key.items()
+    params = {"user_id": user_id, "key": value}
+    return db.session.execute(_owned_stmt(model, key), params).scalar_one_or_none()
+
+
 # Pydantic schemas (minimal, additive; replaces ad-hoc validation where used)
 class RunInputSchema(BaseModel):
     inputs: Dict[str, Any]
@@ -477,8 +821,393 @@ class MARunSchema(BaseModel):
     results: Optional[Dict[str, Any]] = None
 
 
+class MAScenarioSchema(BaseModel):
+    name: str
+    deal_name: str
+    acquirer_name: str
+    target_name: str
+    inputs: Dict[str, Any]
+
+
+class MAScenarioBatchSchema(BaseModel):
+    # Items are validated individually by persist_ma_scenarios so one bad entry doesn't sink
+    # the batch
+    scenarios: List[Any]
+
+
+# Built once so the compiled validators are reused across requests
+_SCENARIO_LIST = TypeAdapter(List[ScenarioSchema])
+_LBO_SCENARIO_LIST = TypeAdapter(List[LBOScenarioSchema])
+_MA_SCENARIO_LIST = TypeAdapter(List[MAScenarioSchema])
+
+
+def _validate_json_list(schema, adapter: TypeAdapter, raw: bytes) -> Optional[List[Any]]:
+    """Parse and validate a JSON array body in one pass.
+
+    Falls back to per-item validation when some entries are invalid, skipping those.
+    Returns None when the body is not a non-empty JSON array.
+    """
+    try:
+        return adapter.validate_json(raw) or None
+    except ValidationError:
+        pass
+
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+    if not data or not isinstance(data, list):
+        return None
+    return _validate_each(schema, data)
+
+
+def _validate_list(schema, adapter: TypeAdapter, items: List[Any]) -> List[Any]:
+    """Validate already-decoded items in one pass, falling back to skipping invalid entries"""
+    try:
+        return adapter.validate_python(items)
+    except ValidationError:
+        return _validate_each(schema, items)
+
+
+def _validate_each(schema, items: List[Any]) -> List[Any]:
+    valid = []
+    for item in items:
+        try:
+            valid.append(schema.model_validate(item))
+        except ValidationError as e:
+            # Lazy %-args: the error text is only built if the record is emitted
+            app.logger.warning("Invalid %s payload skipped: %s", schema.__name__, e)
+    return valid
+
+
+# orjson handles numpy scalars from the analytics paths and int-keyed dicts
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+# jsonify() keeps Flask's datetime format (RFC 822 HTTP dates) by handing them to default()
+_PROVIDER_OPTIONS = _ORJSON_OPTIONS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _json_response(obj: Any, status: int = 200) -> Response:
+    """Serialize obj with orjson into a JSON response (bypasses jsonify's stdlib encoder)"""
+    return app.response_class(
+        orjson.dumps(obj, option=_ORJSON_OPTIONS), status=status, mimetype="application/json"
+    )
+
+
+def _not_modified(etag: str) -> Optional[Response]:
+    """A bodiless 304 when If-None-Match already holds etag (weak comparison), else None"""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    resp = app.response_class(status=304)
+    resp.set_etag(etag, weak=True)
+    return resp
+
+
+def _conditional_body(body: bytes) -> Response:
+    """JSON response for a prebuilt (usually cached) body, tagged with a weak ETag of its bytes"""
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    resp = _not_modified(etag)
+    if resp is None:
+        resp = app.response_class(body, mimetype="application/json")
+        resp.set_etag(etag, weak=True)
+    return resp
+
+
+def _row_response(row) -> Response:
+    """{"success": true, "data": row} tagged with a weak ETag from (id, updated_at).
+
+    A matching If-None-Match skips serializing the row entirely.
+    """
+    stamp = row.updated_at.timestamp() if row.updated_at else 0
+    etag = f"{row.id}-{stamp:.6f}"
+    resp = _not_modified(etag)
+    if resp is None:
+        body = b'{"success":true,"data":' + _row_json(row) + b"}"
+        resp = app.response_class(body, mimetype="application/json")
+        resp.set_etag(etag, weak=True)
+    return resp
+
+
+def _new_ids(n: int) -> List[str]:
+    """n time-ordered UUIDv7 hex ids (RFC 9562).
+
+    The 48-bit millisecond prefix keeps new run/scenario ids appending to the right edge of
+    their btree indexes instead of landing on random pages like uuid4. One clock read and one
+    urandom call serve the whole batch.
+    """
+    ms = time.time_ns() // 1_000_000
+    rand = os.urandom(10 * n)
+    ids = []
+    for i in range(n):
+        r = int.from_bytes(rand[10 * i:10 * i + 10], "big")
+        value = (ms << 80) | (0x7 << 76) | ((r >> 68) << 64) | (0b10 << 62) | (r & ((1 << 62) - 1))
+        ids.append(f"{value:032x}")
+    return ids
+
+
+def _new_id() -> str:
+    return _new_ids(1)[0]
+
+
+def _request_now() -> datetime:
+    """Clock read once per request in request_start; a fresh reading outside requests (Celery).
+
+    Naive UTC, like the datetime.utcnow column defaults it is written next to.
+    """
+    now = getattr(g, "request_now", None) if has_request_context() else None
+    return (now or datetime.now(timezone.utc)).replace(tzinfo=None)
+
+
+def _request_now_iso() -> str:
+    now_iso = getattr(g, "request_now_iso", None) if has_request_context() else None
+    return now_iso or datetime.now(timezone.utc).isoformat()
+
+
+def _upsert_rows(
+    model, rows: List[Dict[str, Any]], conflict_cols: List[str], update_cols: List[str]
+) -> None:
+    """Insert rows in one statement, updating update_cols where conflict_cols already exist"""
+    dialect = db.engine.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=conflict_cols,
+            set_={col: stmt.excluded[col] for col in update_cols},
+        )
+        db.session.execute(stmt)
+        return
+
+    # Other backends: resolve every conflict key with one tuple IN query, then merge in Python
+    def key_of(obj, get=getattr):
+        return tuple(get(obj, col) for col in conflict_cols)
+
+    keys = [key_of(row, dict.get) for row in rows]
+    columns = tuple_(*(getattr(model, col) for col in conflict_cols))
+    existing = {key_of(obj): obj for obj in model.query.filter(columns.in_(keys)).all()}
+    for key, row in zip(keys, rows):
+        obj = existing.get(key)
+        if obj is not None:
+            for col in update_cols:
+                setattr(obj, col, row[col])
+        else:
+            existing[key] = obj = model(**row)
+            db.session.add(obj)
+
+
+def _summary_requested() -> bool:
+    return request.args.get("fields") == "summary"
+
+
+def _list_query(query, model):
+    """Loader options for list endpoints.
+
+    Serialization must be satisfied by the list SELECT itself: relationships raise instead of
+    lazy-loading per row, and with ?fields=summary only SUMMARY_FIELDS are loaded (touching any
+    other column raises rather than issuing one query per row).
+    """
+    if not _summary_requested():
+        return query.options(raiseload("*"))
+    columns = (getattr(model, f) for f in model.SUMMARY_FIELDS)
+    return query.options(load_only(*columns, raiseload=True), raiseload("*"))
+
+
+def _summary_dict(row) -> Dict[str, Any]:
+    data = {}
+    for field in row.SUMMARY_FIELDS:
+        value = getattr(row, field)
+        data[field] = value.isoformat() if isinstance(value, datetime) else value
+    return data
+
+
+# Rows fetched per round trip when a list is streamed straight off the cursor
+STREAM_BATCH_SIZE = 500
+
+
+# Encoded to_dict() per (model, id, updated_at): rows that haven't changed since the last
+# request are spliced in as bytes instead of rebuilt and re-encoded. FIFO-evicted down to
+# ROW_JSON_CACHE_MAX_BYTES of encoded JSON; rows over ROW_JSON_CACHE_MAX_ROW_BYTES (large
+# inputs/results payloads) are never cached, so one of them can't flush everything else.
+ROW_JSON_CACHE_MAX_BYTES = int(os.environ.get("ROW_JSON_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+ROW_JSON_CACHE_MAX_ROW_BYTES = int(os.environ.get("ROW_JSON_CACHE_MAX_ROW_BYTES", str(256 * 1024)))
+_row_json_cache: Dict[tuple, bytes] = {}
+_row_json_cache_bytes = 0
+_row_json_lock = threading.Lock()
+
+
+def _row_json(row) -> bytes:
+    global _row_json_cache_bytes
+    key = (type(row), row.id, row.updated_at)
+    with _row_json_lock:
+        hit = _row_json_cache.get(key)
+    if hit is not None:
+        return hit
+
+    body = orjson.dumps(row.to_dict(), option=_ORJSON_OPTIONS)
+    if len(body) > ROW_JSON_CACHE_MAX_ROW_BYTES:
+        return body
+    with _row_json_lock:
+        _row_json_cache_bytes -= len(_row_json_cache.pop(key, b""))
+        while _row_json_cache and _row_json_cache_bytes + len(body) > ROW_JSON_CACHE_MAX_BYTES:
+            _row_json_cache_bytes -= len(_row_json_cache.pop(next(iter(_row_json_cache))))
+        _row_json_cache[key] = body
+        _row_json_cache_bytes += len(body)
+    return body
+
+
+def _summary_json(row) -> bytes:
+    return orjson.dumps(_summary_dict(row), option=_ORJSON_OPTIONS)
+
+
+def _iter_rows(rows, prefix: bytes, suffix=b"]}"):
+    """Yield a JSON envelope around rows, encoding one row at a time.
+
+    prefix must open the array (e.g. b'{"success":true,"runs":['); suffix closes it, and may be
+    a callable evaluated once the rows are exhausted (e.g. a cursor that depends on the last row).
+    """
+    encode = _summary_json if _summary_requested() else _row_json
+    yield prefix
+    for i, row in enumerate(rows):
+        yield (b"," if i else b"") + encode(row)
+    yield suffix() if callable(suffix) else suffix
+
+
+def _stream_rows(rows, prefix: bytes, suffix=b"]}") -> Response:
+    """Stream rows so the full list of dicts and the encoded body are never held at once.
+
+    Pass a Query to have it read in STREAM_BATCH_SIZE batches (yield_per) instead of buffered
+    by .all().
+    """
+    if hasattr(rows, "yield_per"):
+        rows = rows.yield_per(STREAM_BATCH_SIZE)
+    return app.response_class(
+        stream_with_context(_iter_rows(rows, prefix, suffix)), mimetype="application/json"
+    )
+
+
+# Read-through cache for per-user GET endpoints. Each resource is one Redis hash whose
+# fields are response variants (full/summary/last), so writers invalidate with a single DEL.
+LIST_CACHE_TTL = 60
+
+
+def _cache_key(resource: str, user_id: int, *parts: str) -> str:
+    return ":".join(("cache", resource, str(user_id)) + parts)
+
+
+def _cached_body(key: str, variant: str, build) -> Optional[bytes]:
+    """Return the cached body for key/variant, or build() it and cache the result.
+
+    build() returning None (e.g. not found) is not cached. Redis errors fall through to build().
+    """
+    if redis_client is None:
+        return build()
+    try:
+        hit = redis_client.hget(key, variant)
+        if hit is not None:
+            return hit
+    except Exception as e:
+        app.logger.debug(f"Cache read failed for {key}: {e}")
+        return build()
+
+    body = build()
+    if body is not None:
+        try:
+            pipe = redis_client.pipeline()
+            pipe.hset(key, variant, body)
+            pipe.expire(key, LIST_CACHE_TTL)
+            pipe.execute()
+        except Exception as e:
+            app.logger.debug(f"Cache write failed for {key}: {e}")
+    return body
+
+
+# Keyset pagination for the LBO/M&A list endpoints: ?limit=N&cursor=<next_cursor>
+DEFAULT_LIST_LIMIT = 50
+MAX_LIST_LIMIT = 200
+
+
+def _keyset_query(query, model, order_attr: str):
+    """Apply ?cursor/&limit to query ordered by (order_attr desc, id desc).
+
+    The cursor is "<iso timestamp>_<id>" of the last row returned, so ties on the timestamp
+    are still paged exactly. Returns (page_query, limit). Raises ValueError on a malformed cursor.
+    """
+    order_col = getattr(model, order_attr)
+    limit = min(max(request.args.get("limit", DEFAULT_LIST_LIMIT, type=int), 1), MAX_LIST_LIMIT)
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        ts, _, last_id = cursor.rpartition("_")
+        after, last_id = datetime.fromisoformat(ts), int(last_id)
+        query = query.filter(or_(order_col < after, and_(order_col == after, model.id < last_id)))
+
+    return _list_query(query.order_by(order_col.desc(), model.id.desc()).limit(limit), model), limit
+
+
+def _next_cursor_suffix(last, count: int, limit: int, order_attr: str) -> bytes:
+    """Close the page array; next_cursor is null once a page comes back short"""
+    next_cursor = None
+    if count == limit:
+        next_cursor = f"{getattr(last, order_attr).isoformat()}_{last.id}"
+    return b'],"next_cursor":' + orjson.dumps(next_cursor) + b"}"
+
+
+def _paged_rows_response(key: str, query, model, order_attr: str, prefix: bytes):
+    """One keyset page as {..., [rows], "next_cursor": ...}, served from cache when possible.
+
+    Cache variants are keyed by the query string (fields/limit/cursor); streamed off the
+    cursor when Redis is off, with next_cursor taken from the last row sent.
+    """
+    try:
+        page_query, limit = _keyset_query(query, model, order_attr)
+
+        if redis_client is None:
+            seen = {"count": 0, "last": None, "failed": False}
+
+            def tracked():
+                try:
+                    for row in page_query.yield_per(STREAM_BATCH_SIZE):
+                        seen["count"] += 1
+                        seen["last"] = row
+                        yield row
+                except Exception as e:
+                    # The 200 headers are already out: close the JSON and flag the page instead
+                    db.session.rollback()
+                    app.logger.error(f"Streaming {key} failed after {seen['count']} rows: {e}")
+                    seen["failed"] = True
+
+            def suffix() -> bytes:
+                if seen["failed"]:
+                    return b'],"next_cursor":null,"error":"Page truncated"}'
+                return _next_cursor_suffix(seen["last"], seen["count"], limit, order_attr)
+
+            return _stream_rows(tracked(), prefix, suffix)
+
+        def build() -> bytes:
+            rows = page_query.all()
+            last = rows[-1] if rows else None
+            suffix = _next_cursor_suffix(last, len(rows), limit, order_attr)
+            return b"".join(_iter_rows(rows, prefix, suffix))
+
+        body = _cached_body(key, b"list?" + request.query_string, build)
+    except ValueError:
+        return _json_response({"error": "Invalid cursor"}), 400
+    return _conditional_body(body)
+
+
+def _invalidate_cache(*keys: str) -> None:
+    if redis_client is None or not keys:
+        return
+    try:
+        redis_client.unlink(*keys)
+    except Exception as e:
+        app.logger.warning(f"Cache invalidation failed for {keys}: {e}")
+
+
 def _validation_error_response(e: ValidationError):
-    return jsonify({"error": "ValidationError", "details": e.errors()}), 400
+    # e.json() serializes the error list in pydantic-core; splice it in rather than
+    # round-trip via e.errors()
+    body = b'{"error":"ValidationError","details":' + e.json().encode() + b"}"
+    return app.response_class(body, status=400, mimetype="application/json")
 
 
 # API Routes
@@ -488,10 +1217,15 @@ def index():
     return send_from_directory(app.static_folder, "index.html")
 
 
+# Constant probe body; only the timestamp is stamped per request
+_HEALTH_TEMPLATE = b'{"status":"healthy","timestamp":"%s","version":"1.0.0"}'
+
+
 @app.route("/api/health")
 def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "healthy", "timestamp": datetime.now(timezone.utc).isoformat(), "version": "1.0.0"})
+    body = _HEALTH_TEMPLATE % _request_now_iso().encode()
+    return app.response_class(body, mimetype="application/json")
 
 
 @app.route("/api/readiness")
@@ -541,7 +1275,47 @@ def readiness_check():
 
     all_ok = all(v.get("ok") for v in checks.values())
     status_code = 200 if all_ok else 503
-    return jsonify({"status": "ready" if all_ok else "degraded", "checks": checks, "timestamp": datetime.now(timezone.utc).isoformat()}), status_code
+    return _json_response({
+        "status": "ready" if all_ok else "degraded",
+        "checks": checks,
+        "timestamp": _request_now_iso(),
+    }), status_code
+
+
+# Background save jobs (?async=true): the status hash lives in Redis for JOB_TTL seconds and is
+# updated by the Celery task; clients poll GET /api/jobs/<job_id>.
+JOB_TTL = 3600
+
+
+def _job_key(job_id: str) -> str:
+    return f"job:save:{job_id}"
+
+
+def _async_requested() -> bool:
+    async_arg = request.args.get("async", "").lower()
+    return async_arg in {"1", "true", "yes"} and redis_client is not None
+
+
+def _enqueue_save_job(
+    task_name: str, user_id: int, *args: Any, extra: Optional[Dict[str, Any]] = None
+):
+    """Record a queued job, send task_name(*args, job_id) to Celery and return the 202 response"""
+    from .tasks import celery_app
+
+    job_id = str(uuid.uuid4())
+    key = _job_key(job_id)
+    redis_client.hset(key, mapping={"status": "queued", "user_id": user_id})
+    redis_client.expire(key, JOB_TTL)
+    celery_app.send_task(task_name, args=(user_id, *args, job_id))
+
+    body = {
+        "success": True,
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/api/jobs/{job_id}",
+    }
+    body.update(extra or {})
+    return _json_response(body), 202
 
 
 # Run Management Endpoints
@@ -552,32 +1326,27 @@ def readiness_check():
 def save_run():
     """Save a DCF analysis run"""
     try:
-        data = request.get_json() or {}
-        try:
-            payload = RunInputSchema.model_validate(data)
-        except ValidationError as e:
-            return _validation_error_response(e)
-
-        user = get_or_create_user()
-
-        run = Run(
-            user_id=user.id,
-            run_id=str(uuid.uuid4()),
-            ticker=payload.inputs.get("ticker", "UNKNOWN"),
-            inputs=json.dumps(payload.inputs),
-            mc_settings=json.dumps(payload.mc_settings) if payload.mc_settings else None,
-            results=json.dumps(payload.results) if payload.results else None,
-        )
-
-        db.session.add(run)
-        db.session.commit()
+        payload = RunInputSchema.model_validate_json(request.get_data(cache=False) or b"{}")
+    except ValidationError as e:
+        return _validation_error_response(e)
+
+    user = get_or_create_user()
+
+    run = Run(
+        user_id=user.id,
+        run_id=_new_id(),
+        ticker=payload.inputs.get("ticker", "UNKNOWN"),
+        inputs=payload.inputs,
+        mc_settings=payload.mc_settings,
+        results=payload.results,
+    )
 
-        return jsonify({"success": True, "run_id": run.run_id, "message": "Run saved successfully"})
+    db.session.add(run)
+    db.session.commit()
 
-    except Exception as e:
-        db.session.rollback()
-        app.logger.error(f"save_run failed: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+    return _json_response(
+        {"success": True, "run_id": run.run_id, "message": "Run saved successfully"}
+    )
 
 
 @app.route("/api/runs/last", methods=["GET"])
@@ -586,17 +1355,13 @@ def save_run():
 @tenant_required
 def get_last_run():
     """Get the most recent run for the user"""
-    try:
-        user = get_or_create_user()
-        run = Run.query.filter_by(user_id=user.id).order_by(Run.updated_at.desc()).first()
+    user_id = _current_user_id()
+    run = Run.query.filter_by(user_id=user_id).order_by(Run.updated_at.desc()).first()
 
-        if not run:
-            return jsonify({"error": "No runs found"}), 404
+    if not run:
+        return _json_response({"error": "No runs found"}), 404
 
-        return jsonify({"success": True, "data": run.to_dict()})
-
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return _row_response(run)
 
 
 @app.route("/api/runs/<run_id>", methods=["GET"])
@@ -605,17 +1370,13 @@ def get_last_run():
 @tenant_required
 def get_run(run_id):
     """Get a specific run by ID"""
-    try:
-        user = get_or_create_user()
-        run = Run.query.filter_by(user_id=user.id, run_id=run_id).first()
-
-        if not run:
-            return jsonify({"error": "Run not found"}), 404
+    user_id = _current_user_id()
+    run = _get_owned(Run, user_id, run_id=run_id)
 
-        return jsonify({"success": True, "data": run.to_dict()})
+    if not run:
+        return _json_response({"error": "Run not found"}), 404
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return _row_response(run)
 
 
 @app.route("/api/runs", methods=["GET"])
@@ -624,40 +1385,37 @@ def get_run(run_id):
 @tenant_required
 def list_runs():
     """List all runs for the current user with pagination"""
-    try:
-        user = get_or_create_user()
-        
-        # Import pagination utilities
-        from utils.pagination import (
-            apply_pagination, create_paginated_response, 
-            apply_tenant_filter, apply_user_filter, get_search_params
-        )
-        
-        # Start with base query
-        query = Run.query
-        
-        # Apply tenant filter
-        query = apply_tenant_filter(query, g.tenant_id)
-        
-        # Apply user filter
-        query = apply_user_filter(query, user.id)
-        
-        # Apply search filter if provided
-        search_field, search_term = get_search_params()
-        if search_field and search_term:
-            query = apply_search_filter(query, Run, search_field, search_term)
-        
-        # Apply pagination
-        paginated_query, pagination_info = apply_pagination(query, Run)
-        
-        # Convert to dict format
-        runs = [run.to_dict() for run in paginated_query.items]
-        
-        return jsonify(create_paginated_response(runs, pagination_info, "runs"))
-        
-    except Exception as e:
-        app.logger.error(f"Error retrieving runs: {str(e)}")
-        return jsonify({"error": "Failed to retrieve runs"}), 500
+    user_id = _current_user_id()
+    
+    # Import pagination utilities
+    from utils.pagination import (
+        apply_pagination,
+        apply_tenant_filter, apply_user_filter, get_search_params
+    )
+    
+    # Start with base query
+    query = Run.query
+    
+    # Apply tenant filter
+    query = apply_tenant_filter(query, g.tenant_id)
+    
+    # Apply user filter
+    query = apply_user_filter(query, user_id)
+    
+    # Apply search filter if provided
+    search_field, search_term = get_search_params()
+    if search_field and search_term:
+        query = apply_search_filter(query, Run, search_field, search_term)
+    
+    # Apply pagination
+    paginated_query, pagination_info = apply_pagination(_list_query(query, Run), Run)
+    
+    # Same envelope as create_paginated_response, streamed row by row
+    return _stream_rows(
+        paginated_query.items,
+        b'{"success":true,"data":{"runs":[',
+        b'],"pagination":' + orjson.dumps(pagination_info) + b"}}",
+    )
 
 
 # Scenario Management Endpoints
@@ -667,48 +1425,43 @@ def list_runs():
 @tenant_required
 def save_scenarios():
     """Save multiple scenarios"""
-    try:
-        data = request.get_json()
-        if not data or not isinstance(data, list):
-            return jsonify({"error": "Invalid scenarios data"}), 400
-
-        user = get_or_create_user()
-        saved_count = 0
-
-        for scenario_data in data:
-            try:
-                sc = ScenarioSchema.model_validate(scenario_data)
-            except ValidationError as e:
-                app.logger.warning(f"Invalid scenario payload skipped: {e.errors()}")
-                continue
-
-            existing = Scenario.query.filter_by(user_id=user.id, ticker=sc.ticker, name=sc.name).first()
-
-            if existing:
-                existing.inputs = json.dumps(sc.inputs)
-                existing.mc_settings = json.dumps(sc.mc_settings) if sc.mc_settings else None
-                existing.updated_at = datetime.now(timezone.utc)
-            else:
-                scenario = Scenario(
-                    user_id=user.id,
-                    scenario_id=str(uuid.uuid4()),
-                    name=sc.name,
-                    ticker=sc.ticker,
-                    inputs=json.dumps(sc.inputs),
-                    mc_settings=json.dumps(sc.mc_settings) if sc.mc_settings else None,
-                )
-                db.session.add(scenario)
-
-            saved_count += 1
+    scenarios = _validate_json_list(ScenarioSchema, _SCENARIO_LIST, request.get_data(cache=False))
+    if scenarios is None:
+        return _json_response({"error": "Invalid scenarios data"}), 400
+
+    user = get_or_create_user()
+    now = _request_now()
+    # Keyed on the unique (ticker, name) pair so a repeated entry doesn't hit the same row twice
+    rows: Dict[tuple, Dict[str, Any]] = {}
+    ids = iter(_new_ids(len(scenarios)))
+
+    for sc in scenarios:
+        rows[(sc.ticker, sc.name)] = {
+            "user_id": user.id,
+            "tenant_id": user.tenant_id,
+            "scenario_id": next(ids),
+            "name": sc.name,
+            "ticker": sc.ticker,
+            "inputs": sc.inputs,
+            "mc_settings": sc.mc_settings,
+            "updated_at": now,
+        }
 
-        db.session.commit()
+    if rows:
+        _upsert_rows(
+            Scenario,
+            list(rows.values()),
+            ["user_id", "ticker", "name"],
+            ["inputs", "mc_settings", "updated_at"],
+        )
+    db.session.commit()
+    saved_count = len(rows)
 
-        return jsonify({"success": True, "saved_count": saved_count, "message": f"{saved_count} scenarios saved successfully"})
-
-    except Exception as e:
-        db.session.rollback()
-        app.logger.error(f"save_scenarios failed: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+    return _json_response({
+        "success": True,
+        "saved_count": saved_count,
+        "message": f"{saved_count} scenarios saved successfully",
+    })
 
 
 @app.route("/api/scenarios", methods=["GET"])
@@ -717,14 +1470,10 @@ def save_scenarios():
 @tenant_required
 def get_scenarios():
     """Get all scenarios for the user"""
-    try:
-        user = get_or_create_user()
-        scenarios = Scenario.query.filter_by(user_id=user.id).order_by(Scenario.updated_at.desc()).all()
+    user_id = _current_user_id()
+    query = Scenario.query.filter_by(user_id=user_id).order_by(Scenario.updated_at.desc())
 
-        return jsonify({"success": True, "scenarios": [scenario.to_dict() for scenario in scenarios]})
-
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return _stream_rows(_list_query(query, Scenario), b'{"success":true,"scenarios":[')
 
 
 @app.route("/api/scenarios/<scenario_id>", methods=["DELETE"])
@@ -733,21 +1482,31 @@ def get_scenarios():
 @tenant_required
 def delete_scenario(scenario_id):
     """Delete a specific scenario"""
-    try:
-        user = get_or_create_user()
-        scenario = Scenario.query.filter_by(user_id=user.id, scenario_id=scenario_id).first()
+    user_id = _current_user_id()
+    scenario = _get_owned(Scenario, user_id, scenario_id=scenario_id)
 
-        if not scenario:
-            return jsonify({"error": "Scenario not found"}), 404
+    if not scenario:
+        return _json_response({"error": "Scenario not found"}), 404
 
-        db.session.delete(scenario)
-        db.session.commit()
+    db.session.delete(scenario)
+    db.session.commit()
 
-        return jsonify({"success": True, "message": "Scenario deleted successfully"})
+    return _json_response({"success": True, "message": "Scenario deleted successfully"})
 
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": str(e)}), 500
+
+# Shared pool for the independent upstream statement fetches
+_financial_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="financial-fetch")
+
+
+def _fetch_financial_statements(ticker: str) -> tuple:
+    """Fetch overview, income, balance sheet and cash flow concurrently (wall time ~ slowest)"""
+    futures = [
+        _financial_executor.submit(financial_api.get_company_overview, ticker),
+        _financial_executor.submit(financial_api.get_income_statement, ticker),
+        _financial_executor.submit(financial_api.get_balance_sheet, ticker),
+        _financial_executor.submit(financial_api.get_cash_flow, ticker),
+    ]
+    return tuple(f.result() for f in futures)
 
 
 # Financial Data API Endpoints
@@ -759,21 +1518,19 @@ def get_financial_data(ticker):
     start_time = time.time()
     success = False
     try:
-        overview_data = financial_api.get_company_overview(ticker)
-        income_data = financial_api.get_income_statement(ticker)
-        balance_data = financial_api.get_balance_sheet(ticker)
-        cash_flow_data = financial_api.get_cash_flow(ticker)
+        statements = _fetch_financial_statements(ticker)
+        overview_data, income_data, balance_data, cash_flow_data = statements
 
         if not overview_data:
-            return jsonify({"success": False, "error": "No financial data found for this ticker"}), 404
+            return _json_response(
+                {"success": False, "error": "No financial data found for this ticker"}
+            ), 404
 
         parsed_data = parse_financial_data(overview_data, income_data, balance_data, cash_flow_data)
 
         success = True
-        return jsonify({"success": True, "data": parsed_data})
+        return _json_response({"success": True, "data": parsed_data})
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
     finally:
         if monitoring_enabled:
             duration = time.time() - start_time
@@ -793,23 +1550,21 @@ def get_dcf_inputs(ticker):
     start_time = time.time()
     success = False
     try:
-        overview_data = financial_api.get_company_overview(ticker)
-        income_data = financial_api.get_income_statement(ticker)
-        balance_data = financial_api.get_balance_sheet(ticker)
-        cash_flow_data = financial_api.get_cash_flow(ticker)
+        statements = _fetch_financial_statements(ticker)
+        overview_data, income_data, balance_data, cash_flow_data = statements
 
         if not overview_data:
-            return jsonify({"success": False, "error": "No financial data found for this ticker"}), 404
+            return _json_response(
+                {"success": False, "error": "No financial data found for this ticker"}
+            ), 404
 
         parsed_data = parse_financial_data(overview_data, income_data, balance_data, cash_flow_data)
 
         dcf_inputs = calculate_dcf_inputs(parsed_data)
 
         success = True
-        return jsonify({"success": True, "data": dcf_inputs})
+        return _json_response({"success": True, "data": dcf_inputs})
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
     finally:
         if monitoring_enabled:
             duration = time.time() - start_time
@@ -826,18 +1581,16 @@ def get_dcf_inputs(ticker):
 @tenant_required
 def get_historical_prices(ticker):
     """Get historical price data for a ticker"""
-    try:
-        interval = request.args.get("interval", "daily")
-
-        price_data = financial_api.get_historical_prices(ticker, interval)
+    interval = request.args.get("interval", "daily")
 
-        if not price_data:
-            return jsonify({"success": False, "error": "No historical price data found for this ticker"}), 404
+    price_data = financial_api.get_historical_prices(ticker, interval)
 
-        return jsonify({"success": True, "data": price_data})
+    if not price_data:
+        return _json_response(
+            {"success": False, "error": "No historical price data found for this ticker"}
+        ), 404
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return _json_response({"success": True, "data": price_data})
 
 
 # Report Generation Endpoints (DCF/LBO)
@@ -864,33 +1617,28 @@ def report_dcf():
       - run_id: UUID of the DCF Run
       - format: 'html' for HTML response; otherwise inline PDF by default
     """
-    try:
-        run_id = request.args.get("run_id")
-        if not run_id:
-            return jsonify({"error": "run_id is required"}), 400
-
-        user = get_or_create_user()
-        run = Run.query.filter_by(user_id=user.id, run_id=run_id).first()
-        if not run:
-            return jsonify({"error": "Run not found"}), 404
-
-        # Prepare context
-        ctx = {
-            "title": f"DCF Report - {run.ticker}",
-            "generated_at": datetime.now(timezone.utc).isoformat(),
-            "user": {"id": user.id, "username": user.username},
-            "run": run.to_dict(),
-        }
-
-        fmt = request.args.get("format", "").lower()
-        html_str = _render_html("dcf_report.html", ctx)
-        if fmt == "html":
-            return make_response(html_str, 200, {"Content-Type": "text/html; charset=utf-8"})
-        return _pdf_response(html_str, f"dcf_report_{run.ticker}_{run.run_id}.pdf")
+    run_id = request.args.get("run_id")
+    if not run_id:
+        return _json_response({"error": "run_id is required"}), 400
+
+    user = get_or_create_user()
+    run = _get_owned(Run, user.id, run_id=run_id)
+    if not run:
+        return _json_response({"error": "Run not found"}), 404
+
+    # Prepare context
+    ctx = {
+        "title": f"DCF Report - {run.ticker}",
+        "generated_at": _request_now_iso(),
+        "user": {"id": user.id, "username": user.username},
+        "run": run.to_dict(),
+    }
 
-    except Exception as e:
-        app.logger.error(f"report_dcf failed: {str(e)}")
-        return jsonify({"error": "Failed to generate DCF report"}), 500
+    fmt = request.args.get("format", "").lower()
+    html_str = _render_html("dcf_report.html", ctx)
+    if fmt == "html":
+        return make_response(html_str, 200, {"Content-Type": "text/html; charset=utf-8"})
+    return _pdf_response(html_str, f"dcf_report_{run.ticker}_{run.run_id}.pdf")
 
 @app.route("/api/reports/lbo", methods=["GET"])
 @auth_required
@@ -903,33 +1651,28 @@ def report_lbo():
       - run_id: UUID of the LBO Run
       - format: 'html' for HTML response; otherwise inline PDF by default
     """
-    try:
-        run_id = request.args.get("run_id")
-        if not run_id:
-            return jsonify({"error": "run_id is required"}), 400
-
-        user = get_or_create_user()
-        lbo_run = LBORun.query.filter_by(user_id=user.id, run_id=run_id).first()
-        if not lbo_run:
-            return jsonify({"error": "LBO run not found"}), 404
-
-        # Prepare context
-        ctx = {
-            "title": f"LBO Report - {lbo_run.company_name}",
-            "generated_at": datetime.now(timezone.utc).isoformat(),
-            "user": {"id": user.id, "username": user.username},
-            "run": lbo_run.to_dict(),
-        }
-
-        fmt = request.args.get("format", "").lower()
-        html_str = _render_html("lbo_report.html", ctx)
-        if fmt == "html":
-            return make_response(html_str, 200, {"Content-Type": "text/html; charset=utf-8"})
-        return _pdf_response(html_str, f"lbo_report_{lbo_run.company_name}_{lbo_run.run_id}.pdf")
+    run_id = request.args.get("run_id")
+    if not run_id:
+        return _json_response({"error": "run_id is required"}), 400
+
+    user = get_or_create_user()
+    lbo_run = _get_owned(LBORun, user.id, run_id=run_id)
+    if not lbo_run:
+        return _json_response({"error": "LBO run not found"}), 404
+
+    # Prepare context
+    ctx = {
+        "title": f"LBO Report - {lbo_run.company_name}",
+        "generated_at": _request_now_iso(),
+        "user": {"id": user.id, "username": user.username},
+        "run": lbo_run.to_dict(),
+    }
 
-    except Exception as e:
-        app.logger.error(f"report_lbo failed: {str(e)}")
-        return jsonify({"error": "Failed to generate LBO report"}), 500
+    fmt = request.args.get("format", "").lower()
+    html_str = _render_html("lbo_report.html", ctx)
+    if fmt == "html":
+        return make_response(html_str, 200, {"Content-Type": "text/html; charset=utf-8"})
+    return _pdf_response(html_str, f"lbo_report_{lbo_run.company_name}_{lbo_run.run_id}.pdf")
 
 # LBO Management Endpoints
 @app.route("/api/lbo/runs", methods=["POST"])
@@ -939,31 +1682,27 @@ def report_lbo():
 def save_lbo_run():
     """Save an LBO analysis run"""
     try:
-        data = request.get_json() or {}
-        try:
-            payload = LBORunSchema.model_validate(data)
-        except ValidationError as e:
-            return _validation_error_response(e)
-
-        user = get_or_create_user()
-
-        lbo_run = LBORun(
-            user_id=user.id,
-            run_id=str(uuid.uuid4()),
-            company_name=payload.inputs.get("companyName", "Unknown Company"),
-            inputs=json.dumps(payload.inputs),
-            results=json.dumps(payload.results) if payload.results else None,
-        )
-
-        db.session.add(lbo_run)
-        db.session.commit()
+        payload = LBORunSchema.model_validate_json(request.get_data(cache=False) or b"{}")
+    except ValidationError as e:
+        return _validation_error_response(e)
+
+    user = get_or_create_user()
+
+    lbo_run = LBORun(
+        user_id=user.id,
+        run_id=_new_id(),
+        company_name=payload.inputs.get("companyName", "Unknown Company"),
+        inputs=payload.inputs,
+        results=payload.results,
+    )
 
-        return jsonify({"success": True, "run_id": lbo_run.run_id, "message": "LBO run saved successfully"})
+    db.session.add(lbo_run)
+    db.session.commit()
+    _invalidate_cache(_cache_key("lbo_runs", user.id))
 
-    except Exception as e:
-        db.session.rollback()
-        app.logger.error(f"save_lbo_run failed: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+    return _json_response(
+        {"success": True, "run_id": lbo_run.run_id, "message": "LBO run saved successfully"}
+    )
 
 
 @app.route("/api/lbo/runs/last", methods=["GET"])
@@ -972,17 +1711,13 @@ def save_lbo_run():
 @tenant_required
 def get_last_lbo_run():
     """Get the most recent LBO run for the user"""
-    try:
-        user = get_or_create_user()
-        lbo_run = LBORun.query.filter_by(user_id=user.id).order_by(LBORun.updated_at.desc()).first()
+    user_id = _current_user_id()
+    lbo_run = LBORun.query.filter_by(user_id=user_id).order_by(LBORun.updated_at.desc()).first()
 
-        if not lbo_run:
-            return jsonify({"error": "No LBO runs found"}), 404
+    if not lbo_run:
+        return _json_response({"error": "No LBO runs found"}), 404
 
-        return jsonify({"success": True, "data": lbo_run.to_dict()})
-
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return _row_response(lbo_run)
 
 
 @app.route("/api/lbo/runs/<run_id>", methods=["GET"])
@@ -991,17 +1726,13 @@ def get_last_lbo_run():
 @tenant_required
 def get_lbo_run(run_id):
     """Get a specific LBO run by ID"""
-    try:
-        user = get_or_create_user()
-        lbo_run = LBORun.query.filter_by(user_id=user.id, run_id=run_id).first()
-
-        if not lbo_run:
-            return jsonify({"error": "LBO run not found"}), 404
+    user_id = _current_user_id()
+    lbo_run = _get_owned(LBORun, user_id, run_id=run_id)
 
-        return jsonify({"success": True, "data": lbo_run.to_dict()})
+    if not lbo_run:
+        return _json_response({"error": "LBO run not found"}), 404
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return _row_response(lbo_run)
 
 
 @app.route("/api/lbo/runs", methods=["GET"])
@@ -1010,14 +1741,52 @@ def get_lbo_run(run_id):
 @tenant_required
 def list_lbo_runs():
     """List all LBO runs for the user"""
-    try:
-        user = get_or_create_user()
-        lbo_runs = LBORun.query.filter_by(user_id=user.id).order_by(LBORun.updated_at.desc()).limit(50).all()
+    user_id = _current_user_id()
+    query = LBORun.query.filter_by(user_id=user_id)
 
-        return jsonify({"success": True, "runs": [run.to_dict() for run in lbo_runs]})
+    return _paged_rows_response(
+        _cache_key("lbo_runs", user_id), query, LBORun, "updated_at", b'{"success":true,"runs":['
+    )
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+
+def persist_lbo_scenarios(
+    user_id: int, tenant_id: int, scenarios_data: List[Dict[str, Any]]
+) -> int:
+    """Upsert validated LBO scenario dicts for a user in one statement; returns the row count.
+
+    Shared by save_lbo_scenarios and the ``lbo.save_scenarios`` Celery task.
+    """
+    now = _request_now()
+    # Keyed on the unique (company_name, name) pair so a repeated entry doesn't hit the same
+    # row twice
+    rows: Dict[tuple, Dict[str, Any]] = {}
+    ids = iter(_new_ids(len(scenarios_data)))
+    for sc in scenarios_data:
+        company_name = sc.get("companyName") or "Unknown"
+        rows[(company_name, sc["name"])] = {
+            "user_id": user_id,
+            "tenant_id": tenant_id,
+            "scenario_id": next(ids),
+            "name": sc["name"],
+            "company_name": company_name,
+            "inputs": sc["inputs"],
+            "updated_at": now,
+        }
+
+    try:
+        if rows:
+            _upsert_rows(
+                LBOScenario,
+                list(rows.values()),
+                ["user_id", "company_name", "name"],
+                ["inputs", "updated_at"],
+            )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    _invalidate_cache(_cache_key("lbo_scenarios", user_id))
+    return len(rows)
 
 
 @app.route("/api/lbo/scenarios", methods=["POST"])
@@ -1025,47 +1794,28 @@ def list_lbo_runs():
 @rate_limit("api")
 @tenant_required
 def save_lbo_scenarios():
-    """Save multiple LBO scenarios"""
-    try:
-        data = request.get_json()
-        if not data or not isinstance(data, list):
-            return jsonify({"error": "Invalid LBO scenarios data"}), 400
-
-        user = get_or_create_user()
-        saved_count = 0
+    """Save multiple LBO scenarios
 
-        for scenario_data in data:
-            try:
-                sc = LBOScenarioSchema.model_validate(scenario_data)
-            except ValidationError as e:
-                app.logger.warning(f"Invalid LBO scenario payload skipped: {e.errors()}")
-                continue
-
-            existing = LBOScenario.query.filter_by(user_id=user.id, company_name=sc.companyName or "Unknown", name=sc.name).first()
-
-            if existing:
-                existing.inputs = json.dumps(sc.inputs)
-                existing.updated_at = datetime.now(timezone.utc)
-            else:
-                scenario = LBOScenario(
-                    user_id=user.id,
-                    scenario_id=str(uuid.uuid4()),
-                    name=sc.name,
-                    company_name=sc.companyName or "Unknown",
-                    inputs=json.dumps(sc.inputs),
-                )
-                db.session.add(scenario)
-
-            saved_count += 1
+    Pass ``?async=true`` to persist on the Celery worker (``202`` with a job status URL).
+    """
+    scenarios = _validate_json_list(
+        LBOScenarioSchema, _LBO_SCENARIO_LIST, request.get_data(cache=False)
+    )
+    if scenarios is None:
+        return _json_response({"error": "Invalid LBO scenarios data"}), 400
 
-        db.session.commit()
+    user = get_or_create_user()
+    scenarios_data = [sc.model_dump() for sc in scenarios]
+    if _async_requested():
+        return _enqueue_save_job("lbo.save_scenarios", user.id, user.tenant_id, scenarios_data)
 
-        return jsonify({"success": True, "saved_count": saved_count, "message": f"{saved_count} LBO scenarios saved successfully"})
+    saved_count = persist_lbo_scenarios(user.id, user.tenant_id, scenarios_data)
 
-    except Exception as e:
-        db.session.rollback()
-        app.logger.error(f"save_lbo_scenarios failed: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+    return _json_response({
+        "success": True,
+        "saved_count": saved_count,
+        "message": f"{saved_count} LBO scenarios saved successfully",
+    })
 
 
 @app.route("/api/lbo/scenarios", methods=["GET"])
@@ -1074,14 +1824,16 @@ def save_lbo_scenarios():
 @tenant_required
 def get_lbo_scenarios():
     """Get all LBO scenarios for the user"""
-    try:
-        user = get_or_create_user()
-        scenarios = LBOScenario.query.filter_by(user_id=user.id).order_by(LBOScenario.updated_at.desc()).all()
-
-        return jsonify({"success": True, "scenarios": [scenario.to_dict() for scenario in scenarios]})
-
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    user_id = _current_user_id()
+    query = LBOScenario.query.filter_by(user_id=user_id)
+
+    return _paged_rows_response(
+        _cache_key("lbo_scenarios", user_id),
+        query,
+        LBOScenario,
+        "updated_at",
+        b'{"success":true,"scenarios":[',
+    )
 
 
 @app.route("/api/lbo/scenarios/<scenario_id>", methods=["DELETE"])
@@ -1090,21 +1842,17 @@ def get_lbo_scenarios():
 @tenant_required
 def delete_lbo_scenario(scenario_id):
     """Delete a specific LBO scenario"""
-    try:
-        user = get_or_create_user()
-        scenario = LBOScenario.query.filter_by(user_id=user.id, scenario_id=scenario_id).first()
+    user_id = _current_user_id()
+    scenario = _get_owned(LBOScenario, user_id, scenario_id=scenario_id)
 
-        if not scenario:
-            return jsonify({"error": "LBO scenario not found"}), 404
+    if not scenario:
+        return _json_response({"error": "LBO scenario not found"}), 404
 
-        db.session.delete(scenario)
-        db.session.commit()
+    db.session.delete(scenario)
+    db.session.commit()
+    _invalidate_cache(_cache_key("lbo_scenarios", user_id))
 
-        return jsonify({"success": True, "message": "LBO scenario deleted successfully"})
-
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({"error": str(e)}), 500
+    return _json_response({"success": True, "message": "LBO scenario deleted successfully"})
 
 
 # Notes Management Endpoints
@@ -1114,22 +1862,30 @@ def delete_lbo_scenario(scenario_id):
 @tenant_required
 def get_notes(ticker):
     """Get notes for a specific ticker with ETag/version for optimistic concurrency"""
-    try:
-        user = get_or_create_user()
-        note = Note.query.filter_by(user_id=user.id, ticker=ticker.upper()).first()
+    user_id = _current_user_id()
+    key = _cache_key("notes", user_id, ticker.upper())
 
+    # Cached as one orjson blob holding the body plus its validators
+    def build() -> bytes:
+        note = _get_owned(Note, user_id, ticker=ticker.upper())
         if not note:
-            # Create ephemeral empty response with no ETag/version
-            resp = jsonify({"success": True, "content": "", "version": 0})
-            return resp
-
-        resp = jsonify({"success": True, "content": note.content, "version": note.version})
-        resp.headers["ETag"] = note.etag()
-        resp.headers["Last-Modified"] = http_date(note.updated_at)
-        return resp
-
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+            # Ephemeral empty response with no ETag/version
+            return orjson.dumps({"body": {"success": True, "content": "", "version": 0}})
+        return orjson.dumps({
+            "body": {"success": True, "content": note.content, "version": note.version},
+            "etag": note.etag(),
+            "last_modified": http_date(note.updated_at),
+        })
+
+    cached = orjson.loads(_cached_body(key, "note", build))
+    if "etag" in cached and request.if_none_match.contains_weak(cached["etag"]):
+        resp = app.response_class(status=304)
+    else:
+        resp = _json_response(cached["body"])
+    if "etag" in cached:
+        resp.headers["ETag"] = cached["etag"]
+        resp.headers["Last-Modified"] = cached["last_modified"]
+    return resp
 
 
 @app.route("/api/notes/<ticker>", methods=["POST"])
@@ -1138,41 +1894,71 @@ def get_notes(ticker):
 @tenant_required
 def save_notes(ticker):
     """Save notes for a specific ticker with optimistic locking via If-Match ETag or version"""
-    try:
-        data = request.get_json() or {}
-        if "content" not in data:
-            return jsonify({"error": "Invalid notes data"}), 400
-
-        user = get_or_create_user()
-        note = Note.query.filter_by(user_id=user.id, ticker=ticker.upper()).first()
-
-        # Determine client version/etag
-        client_version = data.get("version")
-        client_etag = request.headers.get("If-Match")
-
-        if note:
-            # check version/etag if provided
-            if client_version is not None and int(client_version) != int(note.version):
-                return jsonify({"error": "Version conflict"}), 409
-            if client_etag and client_etag != note.etag():
-                return jsonify({"error": "ETag conflict"}), 409
-
-            note.content = data["content"]
-            note.version = int(note.version) + 1
-            note.updated_at = datetime.now(timezone.utc)
-        else:
-            note = Note(user_id=user.id, ticker=ticker.upper(), content=data["content"], version=1)
-            db.session.add(note)
+    data = request.get_json() or {}
+    if "content" not in data:
+        return _json_response({"error": "Invalid notes data"}), 400
+
+    user = get_or_create_user()
+    note = _get_owned(Note, user.id, ticker=ticker.upper())
+
+    # Determine client version/etag
+    client_version = data.get("version")
+    client_etag = request.headers.get("If-Match")
+
+    if note:
+        # check version/etag if provided
+        if client_version is not None and int(client_version) != int(note.version):
+            return _json_response({"error": "Version conflict"}), 409
+        if client_etag and client_etag != note.etag():
+            return _json_response({"error": "ETag conflict"}), 409
+
+        note.content = data["content"]
+        note.version = int(note.version) + 1
+    else:
+        note = Note(user_id=user.id, ticker=ticker.upper(), content=data["content"], version=1)
+        db.session.add(note)
+
+    db.session.commit()
+    _invalidate_cache(_cache_key("notes", user.id, ticker.upper()))
+    resp = _json_response(
+        {"success": True, "message": "Notes saved successfully", "version": note.version}
+    )
+    resp.headers["ETag"] = note.etag()
+    resp.headers["Last-Modified"] = http_date(note.updated_at)
+    return resp
 
-        db.session.commit()
-        resp = jsonify({"success": True, "message": "Notes saved successfully", "version": note.version})
-        resp.headers["ETag"] = note.etag()
-        resp.headers["Last-Modified"] = http_date(note.updated_at)
-        return resp
 
-    except Exception as e:
+def persist_ma_run(user_id: int, run_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Insert a validated M&A run; shared by save_ma_run and the ``ma.save_run`` Celery task"""
+    ma_run = MARun(
+        user_id=user_id,
+        run_id=run_id,
+        deal_name=payload["deal_name"],
+        acquirer_name=payload["acquirer_name"],
+        target_name=payload["target_name"],
+        inputs=payload["inputs"],
+        results=payload.get("results"),
+    )
+    try:
+        db.session.add(ma_run)
+        db.session.commit()
+    except Exception:
         db.session.rollback()
-        return jsonify({"error": str(e)}), 500
+        raise
+    _invalidate_cache(_cache_key("ma_runs", user_id))
+    return {"run_id": run_id, "deal_name": ma_run.deal_name}
+
+
+def _last_ma_run_stmt(user_id: int):
+    """Newest run for a user, served by idx_ma_run_user_created with LIMIT 1.
+
+    Built as a lambda_stmt so the compiled SQL is cached on the lambda's code location
+    and only user_id is re-bound per call.
+    """
+    stmt = lambda_stmt(lambda: select(MARun))
+    stmt += lambda s: s.where(MARun.user_id == user_id)
+    stmt += lambda s: s.order_by(MARun.created_at.desc()).limit(1)
+    return stmt
 
 
 # M&A Analysis Endpoints
@@ -1181,37 +1967,31 @@ def save_notes(ticker):
 @rate_limit("api")
 @tenant_required
 def save_ma_run():
-    """Save M&A analysis run"""
-    try:
-        user = get_or_create_user()
-        data = request.get_json() or {}
+    """Save M&A analysis run
 
-        try:
-            payload = MARunSchema.model_validate(data)
-        except ValidationError as e:
-            return _validation_error_response(e)
-
-        run_id = str(uuid.uuid4())
-
-        ma_run = MARun(
-            user_id=user.id,
-            run_id=run_id,
-            deal_name=payload.deal_name,
-            acquirer_name=payload.acquirer_name,
-            target_name=payload.target_name,
-            inputs=json.dumps(payload.inputs),
-            results=json.dumps(payload.results) if payload.results else None,
+    Pass ``?async=true`` to persist on the Celery worker (``202`` with the run_id and a job
+    status URL).
+    """
+    user = get_or_create_user()
+
+    try:
+        payload = MARunSchema.model_validate_json(request.get_data(cache=False) or b"{}")
+    except ValidationError as e:
+        return _validation_error_response(e)
+
+    run_id = _new_id()
+    if _async_requested():
+        return _enqueue_save_job(
+            "ma.save_run", user.id, run_id, payload.model_dump(), extra={"run_id": run_id}
         )
 
-        db.session.add(ma_run)
-        db.session.commit()
+    persist_ma_run(user.id, run_id, payload.model_dump())
 
-        return jsonify({"success": True, "message": "M&A run saved successfully", "data": {"run_id": run_id, "deal_name": payload.deal_name}})
-
-    except Exception as e:
-        db.session.rollback()
-        app.logger.error(f"Error saving M&A run: {str(e)}")
-        return jsonify({"error": "Failed to save M&A run"}), 500
+    return _json_response({
+        "success": True,
+        "message": "M&A run saved successfully",
+        "data": {"run_id": run_id, "deal_name": payload.deal_name},
+    })
 
 
 @app.route("/api/ma/runs/last", methods=["GET"])
@@ -1220,19 +2000,19 @@ def save_ma_run():
 @tenant_required
 def get_last_ma_run():
     """Get the most recent M&A run"""
-    try:
-        user = get_or_create_user()
-
-        ma_run = MARun.query.filter_by(user_id=user.id).order_by(MARun.created_at.desc()).first()
+    user_id = _current_user_id()
 
+    def build() -> Optional[bytes]:
+        ma_run = db.session.scalars(_last_ma_run_stmt(user_id)).first()
         if not ma_run:
-            return jsonify({"error": "No M&A runs found"}), 404
+            return None
+        return orjson.dumps({"success": True, "data": ma_run.to_dict()}, option=_ORJSON_OPTIONS)
 
-        return jsonify({"success": True, "data": ma_run.to_dict()})
+    body = _cached_body(_cache_key("ma_runs", user_id), "last", build)
+    if body is None:
+        return _json_response({"error": "No M&A runs found"}), 404
 
-    except Exception as e:
-        app.logger.error(f"Error retrieving M&A run: {str(e)}")
-        return jsonify({"error": "Failed to retrieve M&A run"}), 500
+    return _conditional_body(body)
 
 
 @app.route("/api/ma/runs/<run_id>", methods=["GET"])
@@ -1241,19 +2021,14 @@ def get_last_ma_run():
 @tenant_required
 def get_ma_run(run_id):
     """Get specific M&A run by ID"""
-    try:
-        user = get_or_create_user()
+    user_id = _current_user_id()
 
-        ma_run = MARun.query.filter_by(user_id=user.id, run_id=run_id).first()
+    ma_run = _get_owned(MARun, user_id, run_id=run_id)
 
-        if not ma_run:
-            return jsonify({"error": "M&A run not found"}), 404
+    if not ma_run:
+        return _json_response({"error": "M&A run not found"}), 404
 
-        return jsonify({"success": True, "data": ma_run.to_dict()})
-
-    except Exception as e:
-        app.logger.error(f"Error retrieving M&A run: {str(e)}")
-        return jsonify({"error": "Failed to retrieve M&A run"}), 500
+    return _row_response(ma_run)
 
 
 @app.route("/api/ma/runs", methods=["GET"])
@@ -1262,16 +2037,69 @@ def get_ma_run(run_id):
 @tenant_required
 def list_ma_runs():
     """List all M&A runs for the user"""
+    user_id = _current_user_id()
+
+    query = MARun.query.filter_by(user_id=user_id)
+
+    return _paged_rows_response(
+        _cache_key("ma_runs", user_id), query, MARun, "created_at", b'{"success":true,"data":['
+    )
+
+
+def persist_ma_scenarios(user_id: int, scenarios_data: List[Any]) -> List[Dict[str, Any]]:
+    """Upsert a batch of M&A scenarios for a user and return their serialized rows.
+
+    Shared by the synchronous endpoint and the ``ma.save_scenarios`` Celery task.
+    Caller owns the surrounding app context; rolls back on failure.
+    """
+    valid_scenarios: List[MAScenarioSchema] = _validate_list(
+        MAScenarioSchema, _MA_SCENARIO_LIST, scenarios_data
+    )
+
     try:
-        user = get_or_create_user()
+        # Resolve all name conflicts with one SELECT instead of one per scenario
+        names = {sc.name for sc in valid_scenarios}
+        existing_by_name: Dict[str, MAScenario] = {}
+        if names:
+            existing_by_name = {
+                row.name: row
+                for row in MAScenario.query.filter(
+                    MAScenario.user_id == user_id, MAScenario.name.in_(names)
+                ).all()
+            }
+
+        now = _request_now()
+        ids = iter(_new_ids(len(valid_scenarios)))
+        touched: List[MAScenario] = []
+        new_rows: List[MAScenario] = []
+        for sc in valid_scenarios:
+            scenario = existing_by_name.get(sc.name)
+            if scenario is None:
+                scenario = MAScenario(user_id=user_id, scenario_id=next(ids), name=sc.name)
+                existing_by_name[scenario.name] = scenario
+                new_rows.append(scenario)
+            else:
+                scenario.updated_at = now
+            scenario.deal_name = sc.deal_name
+            scenario.acquirer_name = sc.acquirer_name
+            scenario.target_name = sc.target_name
+            scenario.inputs = sc.inputs
+            touched.append(scenario)
+
+        # One flush emits the inserts as a single executemany and the updates together
+        db.session.add_all(new_rows)
+        db.session.flush()
+        saved_scenarios = [scenario.to_dict() for scenario in touched]
 
-        ma_runs = MARun.query.filter_by(user_id=user.id).order_by(MARun.created_at.desc()).all()
+        db.session.commit()
+        _invalidate_cache(_cache_key("ma_scenarios", user_id))
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return saved_scenarios
 
-        return jsonify({"success": True, "data": [run.to_dict() for run in ma_runs]})
 
-    except Exception as e:
-        app.logger.error(f"Error listing M&A runs: {str(e)}")
-        return jsonify({"error": "Failed to list M&A runs"}), 500
 
 
 @app.route("/api/ma/scenarios", methods=["POST"])
@@ -1279,59 +2107,53 @@ def list_ma_runs():
 @rate_limit("api")
 @tenant_required
 def save_ma_scenarios():
-    """Save M&A scenarios"""
+    """Save M&A scenarios
+
+    Pass ``?async=true`` to enqueue the batch on the Celery worker and get a
+    ``202 Accepted`` with a job status URL instead of waiting for the commit.
+    """
+    user = get_or_create_user()
     try:
-        user = get_or_create_user()
-        data = request.get_json() or {}
-
-        scenarios_data = data.get("scenarios")
-        if not scenarios_data or not isinstance(scenarios_data, list):
-            return jsonify({"error": "Scenarios must be a non-empty list"}), 400
-
-        saved_scenarios: List[Dict[str, Any]] = []
-
-        for scenario_data in scenarios_data:
-            if not isinstance(scenario_data, dict):
-                continue
-            required_fields = ["name", "deal_name", "acquirer_name", "target_name", "inputs"]
-            missing = [f for f in required_fields if f not in scenario_data]
-            if missing:
-                app.logger.warning(f"Skipping M&A scenario due to missing fields: {missing}")
-                continue
-
-            scenario_id = str(uuid.uuid4())
-
-            existing = MAScenario.query.filter_by(user_id=user.id, name=scenario_data["name"]).first()
-            if existing:
-                existing.deal_name = scenario_data["deal_name"]
-                existing.acquirer_name = scenario_data["acquirer_name"]
-                existing.target_name = scenario_data["target_name"]
-                existing.inputs = json.dumps(scenario_data["inputs"])
-                existing.updated_at = datetime.now(timezone.utc)
-                db.session.commit()
-                saved_scenarios.append(existing.to_dict())
-            else:
-                scenario = MAScenario(
-                    user_id=user.id,
-                    scenario_id=scenario_id,
-                    name=scenario_data["name"],
-                    deal_name=scenario_data["deal_name"],
-                    acquirer_name=scenario_data["acquirer_name"],
-                    target_name=scenario_data["target_name"],
-                    inputs=json.dumps(scenario_data["inputs"]),
-                )
-                db.session.add(scenario)
-                db.session.flush()
-                saved_scenarios.append(scenario.to_dict())
+        batch = MAScenarioBatchSchema.model_validate_json(request.get_data(cache=False) or b"{}")
+    except ValidationError:
+        batch = None
+    if batch is None or not batch.scenarios:
+        return _json_response({"error": "Scenarios must be a non-empty list"}), 400
+    scenarios_data = batch.scenarios
 
-        db.session.commit()
+    if _async_requested():
+        return _enqueue_save_job("ma.save_scenarios", user.id, scenarios_data)
 
-        return jsonify({"success": True, "message": f"{len(saved_scenarios)} M&A scenarios saved successfully", "data": saved_scenarios})
+    saved_scenarios = persist_ma_scenarios(user.id, scenarios_data)
 
-    except Exception as e:
-        db.session.rollback()
-        app.logger.error(f"Error saving M&A scenarios: {str(e)}")
-        return jsonify({"error": "Failed to save M&A scenarios"}), 500
+    return _json_response({
+        "success": True,
+        "message": f"{len(saved_scenarios)} M&A scenarios saved successfully",
+        "data": saved_scenarios,
+    })
+
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+@app.route("/api/ma/scenarios/jobs/<job_id>", methods=["GET"])
+@auth_required
+@rate_limit("api")
+@tenant_required
+def get_save_job(job_id):
+    """Get the status of a background save (LBO scenarios, M&A run or M&A scenarios)"""
+    if redis_client is None:
+        return _json_response({"error": "Background jobs unavailable"}), 503
+
+    user_id = _current_user_id()
+    job = {k.decode(): v.decode() for k, v in redis_client.hgetall(_job_key(job_id)).items()}
+    if not job or job.get("user_id") != str(user_id):
+        return _json_response({"error": "Job not found"}), 404
+
+    payload: Dict[str, Any] = {"job_id": job_id, "status": job["status"]}
+    if "result" in job:
+        payload["data"] = orjson.loads(job["result"])
+    if "error" in job:
+        payload["error"] = job["error"]
+    return _json_response({"success": True, "data": payload})
 
 
 @app.route("/api/ma/scenarios", methods=["GET"])
@@ -1340,16 +2162,17 @@ def save_ma_scenarios():
 @tenant_required
 def get_ma_scenarios():
     """Get all M&A scenarios for the user"""
-    try:
-        user = get_or_create_user()
-
-        scenarios = MAScenario.query.filter_by(user_id=user.id).order_by(MAScenario.created_at.desc()).all()
+    user_id = _current_user_id()
 
-        return jsonify({"success": True, "data": [scenario.to_dict() for scenario in scenarios]})
+    query = MAScenario.query.filter_by(user_id=user_id)
 
-    except Exception as e:
-        app.logger.error(f"Error retrieving M&A scenarios: {str(e)}")
-        return jsonify({"error": "Failed to retrieve M&A scenarios"}), 500
+    return _paged_rows_response(
+        _cache_key("ma_scenarios", user_id),
+        query,
+        MAScenario,
+        "created_at",
+        b'{"success":true,"data":[',
+    )
 
 
 @app.route("/api/ma/scenarios/<scenario_id>", methods=["DELETE"])
@@ -1358,23 +2181,18 @@ def get_ma_scenarios():
 @tenant_required
 def delete_ma_scenario(scenario_id):
     """Delete M&A scenario by ID"""
-    try:
-        user = get_or_create_user()
+    user_id = _current_user_id()
 
-        scenario = MAScenario.query.filter_by(user_id=user.id, scenario_id=scenario_id).first()
+    scenario = _get_owned(MAScenario, user_id, scenario_id=scenario_id)
 
-        if not scenario:
-            return jsonify({"error": "M&A scenario not found"}), 404
+    if not scenario:
+        return _json_response({"error": "M&A scenario not found"}), 404
 
-        db.session.delete(scenario)
-        db.session.commit()
+    db.session.delete(scenario)
+    db.session.commit()
+    _invalidate_cache(_cache_key("ma_scenarios", user_id))
 
-        return jsonify({"success": True, "message": "M&A scenario deleted successfully"})
-
-    except Exception as e:
-        db.session.rollback()
-        app.logger.error(f"Error deleting M&A scenario: {str(e)}")
-        return jsonify({"error": "Failed to delete M&A scenario"}), 500
+    return _json_response({"success": True, "message": "M&A scenario deleted successfully"})
 
 
 # WebSocket status endpoints
@@ -1382,54 +2200,61 @@ def delete_ma_scenario(scenario_id):
 @rate_limit("api")
 def websocket_status():
     """Get WebSocket server status"""
-    try:
-        status = {
-            "connected": True,
-            "rooms": len(websocket_manager.rooms),
-            "users": len(websocket_manager.users),
-            "timestamp": datetime.now().isoformat(),
-        }
-        return jsonify({"success": True, "data": status})
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+    status = {
+        "connected": True,
+        "rooms": len(websocket_manager.rooms),
+        "users": len(websocket_manager.users),
+        "timestamp": _request_now_iso(),
+    }
+    return _json_response({"success": True, "data": status})
 
 
 @app.route("/api/websocket/room/<room_id>/status")
 @rate_limit("api")
 def room_status(room_id):
     """Get room status"""
-    try:
-        status = websocket_manager.get_room_status(room_id)
-        return jsonify({"success": True, "data": status})
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+    status = websocket_manager.get_room_status(room_id)
+    return _json_response({"success": True, "data": status})
 
 
 @app.route("/api/websocket/user/<user_id>/status")
 @rate_limit("api")
 def user_status(user_id):
     """Get user status"""
-    try:
-        status = websocket_manager.get_user_status(user_id)
-        if status:
-            return jsonify({"success": True, "data": status})
-        else:
-            return jsonify({"success": False, "error": "User not found"}), 404
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+    status = websocket_manager.get_user_status(user_id)
+    if status:
+        return _json_response({"success": True, "data": status})
+    else:
+        return _json_response({"success": False, "error": "User not found"}), 404
 
 
 # Error handlers
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({"error": "Not found"}), 404
+    return _json_response({"error": "Not found"}), 404
 
 
 @app.errorhandler(500)
 def internal_error(error):
     db.session.rollback()
     app.logger.error(f"Unhandled error: {error}")
-    return jsonify({"error": "Internal server error"}), 500
+    return _json_response({"error": "Internal server error"}), 500
+
+
+@app.errorhandler(Exception)
+def unhandled_exception(error):
+    """Single failure path for route handlers: roll back, log with traceback, generic 500.
+
+    Handlers don't wrap themselves in try/except; the exception text (often SQL) never
+    reaches clients.
+    """
+    if isinstance(error, HTTPException):
+        return error
+    db.session.rollback()
+    app.logger.exception(
+        f"Unhandled error on {request.method} {request.path}: {type(error).__name__}"
+    )
+    return _json_response({"error": "Internal server error"}), 500
 
 
 # Database initialization
@@ -1437,9 +2262,21 @@ def init_db():
     """Initialize the database"""
     with app.app_context():
         db.create_all()
+        _ensure_indexes()
         print("Database initialized successfully")
 
 
+def _ensure_indexes():
+    """Backfill model indexes onto tables that predate them (create_all skips existing tables)"""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=db.engine, checkfirst=True)
+            except Exception as e:
+                # e.g. a unique index over rows that already contain duplicates
+                app.logger.warning(f"Could not create index {index.name}: {e}")
+
+
 def init_ml_variant_routing():
     """Initialize ML variant routing based on settings"""
     try:
@@ -1464,8 +2301,18 @@ def init_ml_variant_routing():
         app.logger.error(f"Error initializing ML variant routing: {str(e)}")
 
 
+# Every route is registered by now
+prebind_request_metrics(app)
+
+
 if __name__ == "__main__":
     init_db()
     init_ml_variant_routing()
+    # Development server only; production runs gunicorn -c gunicorn.conf.py app:app (see Dockerfile)
     # Standardize to port 5002 as per STATUS_REPORT.md
-    app.run(debug=True, host="0.0.0.0", port=5002)
+    app.run(
+        debug=os.environ.get("FLASK_DEBUG", "true").lower() in {"1", "true", "yes"},
+        host="0.0.0.0",
+        port=5002,
+        threaded=True,
+    )
@@ -1,9 +1,12 @@
 import logging
+import logging.handlers
 import time
 import uuid
+from datetime import datetime, timezone
 from typing import Any, Dict
 
 from flask import g, request, has_request_context
+import orjson
 import structlog
 
 from .settings import settings
@@ -21,25 +24,46 @@ def _add_request_context(_, __, event_dict: Dict[str, Any]) -> Dict[str, Any]:
     return event_dict
 
 
+def _add_timestamp(_, __, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    # Reuse the timestamp formatted once in request_start; format per record only outside requests
+    ts = getattr(g, "request_now_iso", None) if has_request_context() else None
+    event_dict["timestamp"] = ts or datetime.now(timezone.utc).isoformat()
+    return event_dict
+
+
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    # JSONRenderer passes default= for objects orjson can't encode natively
+    return orjson.dumps(obj, default=kwargs.get("default")).decode()
+
+
 def configure_logging(level: int = logging.INFO) -> None:
     # Choose renderer based on settings.LOG_JSON
     processors = [
-        structlog.processors.TimeStamper(fmt="iso"),
+        _add_timestamp,
         _add_request_context,
         structlog.processors.add_log_level,
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
     ]
     if settings.LOG_JSON:
-        processors.append(structlog.processors.JSONRenderer())
+        processors.append(structlog.processors.JSONRenderer(serializer=_orjson_dumps))
         fmt = "%(message)s"
     else:
         processors.append(structlog.dev.ConsoleRenderer())
         fmt = "%(levelname)s %(message)s"
 
+    handler: logging.Handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(fmt))
+    if settings.LOG_BUFFER_CAPACITY > 0:
+        # Batch writes instead of one syscall per record
+        handler = logging.handlers.MemoryHandler(
+            capacity=settings.LOG_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=handler,
+        )
+
     logging.basicConfig(
-        format=fmt,
-        stream=None,
+        handlers=[handler],
         level=getattr(logging, settings.LOG_LEVEL.upper(), level),
     )
 
@@ -58,12 +82,16 @@ logger = structlog.get_logger()
 
 
 def request_start() -> None:
-    g.start_time = time.time()
+    # perf_counter: monotonic, so durations survive clock adjustments (shared with monitoring.py)
+    g.start_time = time.perf_counter()
+    g.request_now = datetime.now(timezone.utc)
+    g.request_now_iso = g.request_now.isoformat()
     g.request_id = getattr(g, "request_id", str(uuid.uuid4()))
 
 
 def log_request(response):
-    duration = time.time() - getattr(g, "start_time", time.time())
+    now = time.perf_counter()
+    duration = now - getattr(g, "start_time", now)
     logger.info(
         "request_processed",
         status_code=getattr(response, "status_code", None),
@@ -0,0 +1,301 @@
+"""
+Buffered audit logging for the enterprise audit_logs table.
+
+tenant_required enqueues one 'api_call' row per tenant request; other code calls
+enqueue_audit() or audit_request() and returns immediately. One writer thread per process
+inserts queued rows in batches (up to AUDIT_BATCH_SIZE rows or AUDIT_FLUSH_INTERVAL seconds,
+whichever comes first) with a single executemany per transaction. A batch rejected by the
+database is retried row by row, so one bad row only loses itself.
+
+Entries enqueued with must_persist=True (logins, permission changes) are also appended and
+fsynced to a spill file before enqueue_audit returns. Each process writes its own file, named
+with a random token (PIDs get reused across container restarts) and held under an exclusive
+flock for the life of the process. Once spilled entries commit the file is truncated, or
+rewritten with just the entries still pending; those left unwritten by a database outage are
+retried with the next batch. A file whose lock can be taken belongs to a process that died,
+and is replayed by the next writer to start, so these entries are written at least once.
+"""
+
+import fcntl
+import glob
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import orjson
+from flask import g, has_request_context, request
+from sqlalchemy.exc import DataError, IntegrityError
+
+logger = logging.getLogger(__name__)
+
+AUDIT_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 0.2
+AUDIT_SPILL_DIR = os.environ.get('AUDIT_SPILL_DIR', '.')
+
+_queue: Optional["queue.SimpleQueue[tuple]"] = None
+_writer_pid: Optional[int] = None
+_writer_lock = threading.Lock()
+
+# Rows enqueued but not yet written (or dropped); drain() waits for this to reach zero
+_outstanding = 0
+_outstanding_cond = threading.Condition()
+
+# Guards the spill file and the must_persist entries in it not yet committed (seq -> line)
+_spill_lock = threading.Lock()
+_spill_file = None
+_spill_name: Optional[str] = None
+_spill_pending: Dict[int, bytes] = {}
+_spill_seq = itertools.count()
+
+# Errors that condemn a row rather than the connection: retrying it can't succeed
+_REJECTED = (IntegrityError, DataError)
+
+
+def _spill_path(token: str) -> str:
+    return os.path.join(AUDIT_SPILL_DIR, f'audit-spill-{token}.jsonl')
+
+
+def _open_spill_file(lines: bytes = b''):
+    """A new spill file holding lines, fsynced and locked before it becomes visible to replay"""
+    global _spill_name
+    path = _spill_path(f'{os.getpid()}-{uuid.uuid4().hex}')
+    spill = open(f'{path}.new', 'ab')
+    fcntl.flock(spill.fileno(), fcntl.LOCK_EX)
+    if lines:
+        spill.write(lines)
+        spill.flush()
+        os.fsync(spill.fileno())
+    os.rename(f'{path}.new', path)
+    _spill_name = path
+    return spill
+
+
+def _insert_rows(rows: List[Dict[str, Any]]) -> None:
+    from .db_enterprise import insert_audit_rows
+
+    insert_audit_rows(rows)
+
+
+def _write(rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Insert rows in one transaction; the indexes of rows a transient error left unwritten.
+
+    When the database rejects the batch (a constraint or a bad value somewhere in it), rows are
+    inserted one at a time instead; the rejected ones are logged and dropped.
+    """
+    try:
+        _insert_rows(rows)
+        return []
+    except _REJECTED:
+        if len(rows) == 1:
+            logger.exception('audit row %r rejected', rows[0].get('action'))
+            return []
+    except Exception:
+        logger.exception('audit batch of %d rows not written', len(rows))
+        return list(range(len(rows)))
+    for index, row in enumerate(rows):
+        try:
+            _insert_rows([row])
+        except _REJECTED:
+            logger.exception('audit row %r rejected', row.get('action'))
+        except Exception:
+            logger.exception('audit batch of %d rows not written', len(rows) - index)
+            return list(range(index, len(rows)))
+    return []
+
+
+def _release_spilled(seqs: List[int]) -> None:
+    """Forget committed must_persist entries and shrink the spill file to those still pending"""
+    global _spill_file
+    with _spill_lock:
+        for seq in seqs:
+            _spill_pending.pop(seq, None)
+        if not _spill_pending:
+            os.ftruncate(_spill_file.fileno(), 0)
+            return
+        # Rewrite rather than keep committed lines a restart would replay as duplicates; the
+        # new file is complete before the old one goes
+        old_file, old_name = _spill_file, _spill_name
+        _spill_file = _open_spill_file(b''.join(_spill_pending.values()))
+        os.remove(old_name)
+        old_file.close()
+
+
+def _load_rows(spill) -> List[Dict[str, Any]]:
+    rows = []
+    for line in spill:
+        try:
+            row = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            # A torn last line from the crash; everything before it was fsynced whole
+            continue
+        row['created_at'] = datetime.fromisoformat(row['created_at'])
+        rows.append(row)
+    return rows
+
+
+def _replay_orphaned_spills() -> None:
+    """Insert rows from spill files whose owning process died before committing them"""
+    own = _spill_name if _spill_file is not None else None
+    for path in glob.glob(_spill_path('*')):
+        if path == own:
+            continue
+        try:
+            spill = open(path, 'rb')
+        except OSError:
+            continue
+        with spill:
+            try:
+                # The owner holds this lock until it exits; held means alive
+                fcntl.flock(spill.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                continue
+            try:
+                if os.stat(path).st_ino != os.fstat(spill.fileno()).st_ino:
+                    continue
+            except FileNotFoundError:
+                # Another writer replayed and removed it while we waited for the lock
+                continue
+            rows = _load_rows(spill)
+            if rows and _write(rows):
+                # The database is unreachable: leave the file for a later writer
+                continue
+            os.remove(path)
+
+
+def _drain(pending: "queue.SimpleQueue[tuple]") -> None:
+    try:
+        _replay_orphaned_spills()
+    except Exception:
+        # Files not yet removed are left for the next writer to replay
+        logger.exception('audit spill replay failed')
+
+    # (row, seq) for spilled entries a transient error left unwritten; retried with each batch
+    retry: List[tuple] = []
+    while True:
+        batch = [pending.get()]
+        deadline = time.monotonic() + AUDIT_FLUSH_INTERVAL
+        while len(retry) + len(batch) < AUDIT_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        entries = retry + batch
+        failed = set(_write([row for row, _ in entries]))
+        # Unspilled rows a transient error left unwritten are dropped rather than retried
+        retry = [entries[i] for i in sorted(failed) if entries[i][1] is not None]
+        written = [seq for i, (_, seq) in enumerate(entries) if seq is not None and i not in failed]
+        if written:
+            try:
+                _release_spilled(written)
+            except OSError:
+                # The committed entries stay in the file; a restart replays them again
+                logger.exception('audit spill file not shrunk')
+        _settle(len(batch))
+
+
+def _settle(count: int) -> None:
+    global _outstanding
+    with _outstanding_cond:
+        _outstanding -= count
+        if _outstanding <= 0:
+            _outstanding_cond.notify_all()
+
+
+def _ensure_writer() -> "queue.SimpleQueue[tuple]":
+    global _queue, _writer_pid, _outstanding, _spill_file, _spill_name
+    # Threads don't survive fork (gunicorn --preload); start one writer per process on first use
+    if _writer_pid != os.getpid():
+        with _writer_lock:
+            if _writer_pid != os.getpid():
+                if _spill_file is not None:
+                    # The parent's file: our inherited descriptor would keep its lock held
+                    _spill_file.close()
+                    _spill_file = _spill_name = None
+                _spill_pending.clear()
+                _outstanding = 0
+                _queue = queue.SimpleQueue()
+                writer = threading.Thread(
+                    target=_drain, args=(_queue,), name='audit-writer', daemon=True
+                )
+                writer.start()
+                _writer_pid = os.getpid()
+    return _queue
+
+
+def enqueue_audit(entry: Dict[str, Any], must_persist: bool = False) -> None:
+    """
+    Queue one audit_logs row (a dict of column values) for the background writer.
+
+    created_at defaults to now, not to when the batch is written. With must_persist, the row
+    is fsynced to this process's spill file before returning. A row without a tenant_id
+    (NOT NULL in audit_logs) is logged and dropped here rather than failing in the database.
+    """
+    global _spill_file, _outstanding
+    if entry.get('tenant_id') is None:
+        logger.warning('audit row %r dropped: no tenant_id', entry.get('action'))
+        return
+    entry.setdefault('created_at', datetime.utcnow())
+    pending = _ensure_writer()
+    with _outstanding_cond:
+        _outstanding += 1
+    seq = None
+    if must_persist:
+        line = orjson.dumps(entry) + b'\n'
+        with _spill_lock:
+            if _spill_file is None:
+                _spill_file = _open_spill_file()
+            _spill_file.write(line)
+            _spill_file.flush()
+            os.fsync(_spill_file.fileno())
+            seq = next(_spill_seq)
+            _spill_pending[seq] = line
+    pending.put((entry, seq))
+
+
+def audit_request(
+    action: str,
+    resource_type: Optional[str] = None,
+    resource_id: Optional[str] = None,
+    context: Optional[Dict[str, Any]] = None,
+    must_persist: bool = False,
+) -> None:
+    """
+    enqueue_audit() for the current tenant request (g.tenant_pk), with client IP and agent.
+
+    user_id is the enterprise user behind an X-API-Key (g.enterprise_user_id). The main app's
+    JWT subject (g.user_id) is not an enterprise users.id, so it goes in context_data instead.
+    """
+    entry = {
+        'action': action,
+        'resource_type': resource_type,
+        'resource_id': resource_id,
+        'context_data': context,
+    }
+    if has_request_context():
+        if g.get('user_id') is not None:
+            entry['context_data'] = {**(context or {}), 'app_user_id': g.user_id}
+        entry.update(
+            tenant_id=g.get('tenant_pk'),
+            user_id=g.get('enterprise_user_id'),
+            ip_address=request.remote_addr,
+            user_agent=request.headers.get('User-Agent'),
+        )
+    enqueue_audit(entry, must_persist=must_persist)
+
+
+def drain(timeout: float = 5.0) -> bool:
+    """Wait (up to timeout seconds) for queued rows to be written; True if the queue emptied"""
+    if _writer_pid != os.getpid():
+        return True
+    with _outstanding_cond:
+        return _outstanding_cond.wait_for(lambda: _outstanding <= 0, timeout)
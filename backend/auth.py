@@ -8,21 +8,130 @@ import jwt
 import bcrypt
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-from functools import wraps
-from flask import request, jsonify, current_app
+from functools import lru_cache, wraps
+from flask import g, request, jsonify, current_app
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import load_only
 import re
+import string
+import threading
+import time
+import hashlib
 
 # Email validation regex
 EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 
+# Letters, numbers, underscores and hyphens (at least one letter or number), in one C-level scan
+USERNAME_REGEX = re.compile(r'(?=[\w-]*[^\W_])[\w-]+')
+
+# Password character classes as bits, so one pass over the password finds all four
+_PW_LOWER, _PW_UPPER, _PW_DIGIT, _PW_SPECIAL = 1, 2, 4, 8
+_PW_ALL_CLASSES = _PW_LOWER | _PW_UPPER | _PW_DIGIT | _PW_SPECIAL
+_PW_SPECIAL_CHARS = '!@#$%^&*()_+=[]{}|\\:";\'<>?,./~`-'
+_PW_CHAR_CLASS = {
+    **dict.fromkeys(string.ascii_lowercase, _PW_LOWER),
+    **dict.fromkeys(string.ascii_uppercase, _PW_UPPER),
+    **dict.fromkeys(string.digits, _PW_DIGIT),
+    **dict.fromkeys(_PW_SPECIAL_CHARS, _PW_SPECIAL),
+}
+_PW_REQUIREMENTS = (
+    (_PW_LOWER, 'lowercase letters'),
+    (_PW_UPPER, 'uppercase letters'),
+    (_PW_DIGIT, 'numbers'),
+    (_PW_SPECIAL, 'special characters'),
+)
+
+# Rejected outright (compared lower-cased)
+_COMMON_PASSWORDS = frozenset(('password', '123456', 'qwerty', 'admin'))
+
+
+def _bcrypt_rounds(value: str) -> int:
+    """The configured work factor, clamped to the 4..31 range bcrypt.gensalt accepts"""
+    return min(max(int(value), 4), 31)
+
+
+# bcrypt work factor for new hashes. Each +1 doubles hash/verify time; existing hashes
+# keep verifying at their own cost and are rehashed to this one on the next login.
+# Clamped so a bad value can't break every registration.
+BCRYPT_ROUNDS = _bcrypt_rounds(os.environ.get('BCRYPT_ROUNDS', '12'))
+
+
+# bcrypt releases the GIL, so concurrent logins already hash on separate cores from the request
+# threads; cap them at one per core so a login storm can't starve every other request of CPU.
+_BCRYPT_SLOTS = threading.BoundedSemaphore(int(os.environ.get('BCRYPT_CONCURRENCY', os.cpu_count() or 1)))
+
+
+def _hash_password(password: str) -> str:
+    with _BCRYPT_SLOTS:
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
+
+
+def _check_password(password: str, password_hash: str) -> bool:
+    with _BCRYPT_SLOTS:
+        return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+def _needs_rehash(password_hash: str) -> bool:
+    """True when a $2b$<cost>$ hash was made with a different work factor than BCRYPT_ROUNDS"""
+    try:
+        return int(password_hash.split('$')[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
+# Redis hash of user_id -> epoch seconds of the latest login, drained into users.last_login
+# by the ``auth.flush_last_login`` Celery beat task
+LAST_LOGIN_KEY = 'auth:last_login'
+
+
+def flush_last_logins(db, User, redis_client) -> int:
+    """Write buffered last_login timestamps in one batched UPDATE; returns the rows written"""
+    pipe = redis_client.pipeline()  # MULTI: no login recorded between the read and the delete is lost
+    pipe.hgetall(LAST_LOGIN_KEY)
+    pipe.delete(LAST_LOGIN_KEY)
+    buffered, _ = pipe.execute()
+    if not buffered:
+        return 0
+
+    rows = [
+        {'uid': int(user_id), 'ts': datetime.utcfromtimestamp(float(ts))}
+        for user_id, ts in buffered.items()
+    ]
+    stmt = update(User.__table__).where(User.__table__.c.id == bindparam('uid')).values(last_login=bindparam('ts'))
+    try:
+        db.session.execute(stmt, rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        # Put them back unless a newer login has been buffered meanwhile
+        pipe = redis_client.pipeline()
+        for user_id, ts in buffered.items():
+            pipe.hsetnx(LAST_LOGIN_KEY, user_id, ts)
+        pipe.execute()
+        raise
+    return len(rows)
+
+
 class AuthManager:
     """Authentication manager for user operations"""
     
-    def __init__(self, db, User):
+    def __init__(self, db, User, redis_client=None):
         self.db = db
         self.User = User
+        # When set, last_login is buffered here instead of written on every login
+        self.redis_client = redis_client
+    
+    def _record_login(self, user) -> bool:
+        """Buffer the login time in Redis; False if the caller must write last_login itself"""
+        if self.redis_client is None:
+            return False
+        try:
+            self.redis_client.hset(LAST_LOGIN_KEY, user.id, time.time())
+            return True
+        except Exception:
+            return False
     
     def register_user(self, username: str, email: str, password: str) -> Dict[str, Any]:
         """Register a new user with validation"""
@@ -32,21 +141,24 @@ class AuthManager:
             if not validation_result['valid']:
                 return validation_result
             
-            # Check if user already exists
-            if self.User.query.filter_by(username=username).first():
+            # Check if user already exists (username and email in one query)
+            taken = self.User.query.with_entities(self.User.username, self.User.email).filter(
+                (self.User.username == username) | (self.User.email == email)
+            ).all()
+            if any(row.username == username for row in taken):
                 return {
                     'valid': False,
                     'error': 'Username already exists'
                 }
             
-            if self.User.query.filter_by(email=email).first():
+            if taken:
                 return {
                     'valid': False,
                     'error': 'Email already registered'
                 }
             
             # Create new user (bcrypt)
-            password_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+            password_hash = _hash_password(password)
             new_user = self.User(
                 username=username,
                 email=email,
@@ -82,10 +194,16 @@ class AuthManager:
     def login_user(self, username: str, password: str) -> Dict[str, Any]:
         """Authenticate user and return tokens"""
         try:
-            # Find user by username or email
-            user = self.User.query.filter(
-                (self.User.username == username) | (self.User.email == username)
-            ).first()
+            # Find user by username or email. Usernames can't contain '@' and emails always do,
+            # so one equality lookup on the matching unique index replaces the OR across both
+            # Only the columns login reads; last_login/password_hash writes don't need the rest
+            query = self.User.query.options(
+                load_only(self.User.id, self.User.username, self.User.email, self.User.password_hash)
+            )
+            if '@' in username:
+                user = query.filter_by(email=username).first()
+            else:
+                user = query.filter_by(username=username).first()
             
             if not user:
                 return {
@@ -95,7 +213,7 @@ class AuthManager:
             
             # Check password (bcrypt)
             try:
-                valid_pw = bcrypt.checkpw(password.encode("utf-8"), user.password_hash.encode("utf-8"))
+                valid_pw = _check_password(password, user.password_hash)
             except Exception:
                 valid_pw = False
             if not valid_pw:
@@ -104,21 +222,32 @@ class AuthManager:
                     'error': 'Invalid username or password'
                 }
             
-            # Update last login
-            user.last_login = datetime.utcnow()
-            self.db.session.commit()
+            # Read before commit expires the instance, which would cost a refresh SELECT
+            user_info = {
+                'id': user.id,
+                'username': user.username,
+                'email': user.email
+            }
+            
+            # Update last login (buffered when Redis is available); upgrade the hash to the
+            # configured cost, committing only if something was written to the row
+            dirty = False
+            if not self._record_login(user):
+                user.last_login = datetime.utcnow()
+                dirty = True
+            if _needs_rehash(user.password_hash):
+                user.password_hash = _hash_password(password)
+                dirty = True
+            if dirty:
+                self.db.session.commit()
             
             # Generate tokens
-            access_token = create_access_token(identity=user.id)
-            refresh_token = create_refresh_token(identity=user.id)
+            access_token = create_access_token(identity=user_info['id'])
+            refresh_token = create_refresh_token(identity=user_info['id'])
             
             return {
                 'valid': True,
-                'user': {
-                    'id': user.id,
-                    'username': user.username,
-                    'email': user.email
-                },
+                'user': user_info,
                 'access_token': access_token,
                 'refresh_token': refresh_token
             }
@@ -192,7 +321,7 @@ class AuthManager:
                 'error': 'Username must be at least 3 characters long'
             }
         
-        if not username.replace('_', '').replace('-', '').isalnum():
+        if not USERNAME_REGEX.fullmatch(username):
             return {
                 'valid': False,
                 'error': 'Username can only contain letters, numbers, underscores, and hyphens'
@@ -213,20 +342,13 @@ class AuthManager:
             }
         
         # Character complexity requirements
-        has_lower = bool(re.search(r'[a-z]', password))
-        has_upper = bool(re.search(r'[A-Z]', password))
-        has_digit = bool(re.search(r'\d', password))
-        has_special = bool(re.search(r'[!@#$%^&*()_+=\[\]{}|\\:";\'<>?,./~`-]', password))
+        classes = 0
+        for c in password:
+            classes |= _PW_CHAR_CLASS.get(c, 0)
+            if classes == _PW_ALL_CLASSES:
+                break
         
-        missing_requirements = []
-        if not has_lower:
-            missing_requirements.append('lowercase letters')
-        if not has_upper:
-            missing_requirements.append('uppercase letters')
-        if not has_digit:
-            missing_requirements.append('numbers')
-        if not has_special:
-            missing_requirements.append('special characters')
+        missing_requirements = [name for bit, name in _PW_REQUIREMENTS if not classes & bit]
         
         if missing_requirements:
             return {
@@ -235,7 +357,7 @@ class AuthManager:
             }
         
         # Check for common password patterns
-        if password.lower() in ['password', '123456', 'qwerty', 'admin']:
+        if password.lower() in _COMMON_PASSWORDS:
             return {
                 'valid': False,
                 'error': 'Password is too common'
@@ -243,45 +365,102 @@ class AuthManager:
         
         return {'valid': True}
 
+# Access tokens are HS256 only
+_JWT_ALGORITHMS = ['HS256']
+_BEARER_PREFIX_LEN = len('Bearer ')
+
+# Verified tokens -> (user_id, valid_until). Clients reuse one access token for its whole
+# lifetime, so most requests skip the HMAC + claims decode. Entries live at most
+# JWT_CACHE_TTL seconds and never past the token's own exp. Keyed by a blake2b MAC of the
+# token under the signing secret, so rotating JWT_SECRET_KEY orphans every entry.
+JWT_CACHE_TTL = int(os.environ.get('JWT_CACHE_TTL', '60'))
+JWT_CACHE_MAXSIZE = 10000
+_jwt_cache: Dict[bytes, tuple] = {}
+_jwt_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _secret_bytes(secret: str) -> bytes:
+    # The secret is fixed per process (a few values at most across test apps), so encode it
+    # once instead of on every request here and again inside PyJWT's HMAC key preparation
+    return secret.encode('utf-8')
+
+
+def _verified_user_id(token: str, secret: str) -> Any:
+    """The token's sub, from cache or a full jwt.decode; raises jwt errors like jwt.decode"""
+    secret_key = _secret_bytes(secret)
+    key = hashlib.blake2b(token.encode('utf-8'), digest_size=16, key=secret_key[:64]).digest()
+    now = time.time()
+    with _jwt_cache_lock:
+        hit = _jwt_cache.get(key)
+    if hit is not None and hit[1] > now:
+        return hit[0]
+
+    payload = jwt.decode(token, secret_key, algorithms=_JWT_ALGORITHMS)
+    user_id = payload.get('sub')
+    if user_id:
+        valid_until = now + JWT_CACHE_TTL
+        if payload.get('exp') is not None:
+            valid_until = min(valid_until, float(payload['exp']))
+        with _jwt_cache_lock:
+            if len(_jwt_cache) >= JWT_CACHE_MAXSIZE:
+                _jwt_cache.pop(next(iter(_jwt_cache)), None)
+            _jwt_cache[key] = (user_id, valid_until)
+    return user_id
+
+def load_request_identity() -> None:
+    """
+    Resolve the request's bearer token once, as a before_request hook.
+
+    Sets g.user_id (None when unauthenticated) and g.auth_error (the 401 message, or None),
+    so auth_required and get_current_user_id only read flask.g.
+    """
+    g.user_id = None
+    g.auth_error = None
+    try:
+        # Check for Authorization header
+        auth_header = request.headers.get('Authorization')
+        if not auth_header:
+            g.auth_error = 'Authorization header required'
+            return
+        
+        # Extract token
+        if not auth_header.startswith('Bearer '):
+            g.auth_error = 'Invalid authorization header format'
+            return
+        
+        token = auth_header[_BEARER_PREFIX_LEN:]
+        
+        # Verify token (PyJWT's HS256 is hmac over hashlib, i.e. OpenSSL SHA-256)
+        user_id = _verified_user_id(token, current_app.config['JWT_SECRET_KEY'])
+        if not user_id:
+            g.auth_error = 'Invalid token'
+            return
+        
+        g.user_id = user_id
+        # Kept for callers that still read request.user_id
+        request.user_id = user_id
+        
+    except jwt.ExpiredSignatureError:
+        g.auth_error = 'Token expired'
+    except jwt.InvalidTokenError:
+        g.auth_error = 'Invalid token'
+    except Exception as e:
+        g.auth_error = f'Authentication failed: {str(e)}'
+
 def auth_required(f):
     """Decorator to require authentication for routes"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        try:
-            # Check for Authorization header
-            auth_header = request.headers.get('Authorization')
-            if not auth_header:
-                return jsonify({'error': 'Authorization header required'}), 401
-            
-            # Extract token
-            if not auth_header.startswith('Bearer '):
-                return jsonify({'error': 'Invalid authorization header format'}), 401
-            
-            token = auth_header.split(' ')[1]
-            
-            # Verify token
-            payload = jwt.decode(
-                token,
-                current_app.config['JWT_SECRET_KEY'],
-                algorithms=['HS256']
-            )
-            
-            # Add user_id to request context
-            request.user_id = payload.get('sub')
-            if not request.user_id:
-                return jsonify({'error': 'Invalid token'}), 401
-            
-            return f(*args, **kwargs)
-            
-        except jwt.ExpiredSignatureError:
-            return jsonify({'error': 'Token expired'}), 401
-        except jwt.InvalidTokenError:
-            return jsonify({'error': 'Invalid token'}), 401
-        except Exception as e:
-            return jsonify({'error': f'Authentication failed: {str(e)}'}), 401
+        # Apps that don't register the hook resolve the token on first use
+        if 'auth_error' not in g:
+            load_request_identity()
+        if g.user_id is None:
+            return jsonify({'error': g.auth_error}), 401
+        return f(*args, **kwargs)
     
     return decorated_function
 
 def get_current_user_id() -> Optional[int]:
     """Get current user ID from request context"""
-    return getattr(request, 'user_id', None)
+    return g.get('user_id', getattr(request, 'user_id', None))
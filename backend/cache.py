@@ -1,56 +1,273 @@
-import json
+import inspect
+import itertools
+import os
+import queue
+import socket
+import threading
+import time
 from functools import wraps
-from typing import Any, Callable, Optional
+from hashlib import blake2b
+from typing import Any, Callable, Dict, Iterable, Optional
 
+import orjson
 import redis
 
 from .settings import settings
 
-# Initialize Redis client from settings
-redis_client = redis.from_url(settings.REDIS_URL)
 
+def _keepalive_options() -> dict:
+    # TCP_KEEP* are Linux names; other platforms fall back to the OS keepalive timers
+    options = {}
+    for opt, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+        if hasattr(socket, opt):
+            options[getattr(socket, opt)] = value
+    return options
 
-def cache_result(ttl: int = 3600, key_prefix: Optional[str] = None) -> Callable:
+
+# Initialize Redis client from settings: bounded blocking pool with keepalive and health checks
+redis_client = redis.Redis(
+    connection_pool=redis.BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=64,
+        timeout=5,
+        socket_keepalive=True,
+        socket_keepalive_options=_keepalive_options(),
+        health_check_interval=30,
+    )
+)
+
+
+_VALUE_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+# No OPT_NON_STR_KEYS for keys: it would give f({1: x}) and f({"1": x}) the same key
+_KEY_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS
+
+
+def _key_digest(values: Any, fallback: Callable[[], str]) -> str:
+    try:
+        payload = orjson.dumps(values, default=repr, option=_KEY_OPTIONS)
+    except TypeError:
+        # Non-str dict keys and ints beyond 64 bits never reach default=; key by repr instead
+        # (the "r:" prefix keeps these apart from JSON payloads)
+        payload = b"r:" + fallback().encode()
+    return blake2b(payload, digest_size=16).hexdigest()
+
+
+def _cache_key(prefix: str, args: tuple, kwargs: dict) -> str:
+    digest = _key_digest([args, kwargs], lambda: repr((args, sorted(kwargs.items()))))
+    return f"cache:{prefix}:{digest}"
+
+
+def _hash_key(prefix: str, values: tuple) -> str:
+    return f"cache:{prefix}:{_key_digest(values, lambda: repr(values))}"
+
+
+def _specialized_key_builder(func: Callable, prefix: str) -> Optional[Callable[..., str]]:
+    """
+    Generate a key builder with func's exact parameter list, e.g. for f(ticker, period=1):
+
+        def _key(ticker, period=__ck_d1): return __ck_hash(__ck_prefix, (ticker, period))
+
+    The interpreter's own argument binding then normalizes positional/keyword/default
+    spellings of a call into one fixed-order tuple, so no kwargs dict is encoded or sorted.
+    Returns None (use _cache_key) for *args/**kwargs signatures or anything uninspectable.
+    """
+    try:
+        params = list(inspect.signature(func).parameters.values())
+    except (TypeError, ValueError):
+        return None
+    namespace: Dict[str, Any] = {"__ck_hash": _hash_key, "__ck_prefix": prefix}
+    spec, names = [], []
+    seen_kw_only = False
+    for i, param in enumerate(params):
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD) or not param.name.isidentifier():
+            return None
+        if param.kind is param.KEYWORD_ONLY and not seen_kw_only:
+            spec.append("*")
+            seen_kw_only = True
+        entry = param.name
+        if param.default is not param.empty:
+            namespace[f"__ck_d{i}"] = param.default
+            entry += f"=__ck_d{i}"
+        spec.append(entry)
+        if param.kind is param.POSITIONAL_ONLY and (
+            i + 1 == len(params) or params[i + 1].kind is not param.POSITIONAL_ONLY
+        ):
+            spec.append("/")
+        names.append(param.name)
+    values = "(" + "".join(f"{name}, " for name in names) + ")"
+    source = f"def _key({', '.join(spec)}):\n    return __ck_hash(__ck_prefix, {values})\n"
+    exec(source, namespace)
+    return namespace["_key"]
+
+
+def invalidate_pattern(pattern: str, batch_size: int = 500) -> int:
+    """
+    Delete every key matching a glob pattern; returns the number of keys removed.
+
+    Walks the keyspace with SCAN rather than KEYS (which blocks Redis for the whole scan)
+    and unlinks matches batch_size at a time, one UNLINK round trip per batch.
+    """
+    removed = 0
+    batch = []
+    for key in redis_client.scan_iter(match=pattern, count=batch_size):
+        batch.append(key)
+        if len(batch) >= batch_size:
+            removed += redis_client.unlink(*batch)
+            batch = []
+    if batch:
+        removed += redis_client.unlink(*batch)
+    return removed
+
+
+def get_many(keys: Iterable[str]) -> Dict[str, Any]:
+    """
+    Fetch several cached values in one MGET round trip.
+
+    Returns {key: value} for hits only; misses and undecodable entries are omitted.
+    """
+    keys = list(keys)
+    if not keys:
+        return {}
+    found = {}
+    for key, cached in zip(keys, redis_client.mget(keys)):
+        if cached is None:
+            continue
+        try:
+            found[key] = orjson.loads(cached)
+        except orjson.JSONDecodeError:
+            continue
+    return found
+
+
+# Write-behind for cache_result misses: the request thread enqueues and returns, and a daemon
+# thread SETEXes batches (up to 256 entries or 10 ms) in one pipeline. A crash loses at most
+# the queued entries, which for a cache only means a later miss. The queue is bounded: while
+# Redis is slow or down the writer falls behind, and further entries are dropped, not queued.
+WRITE_BATCH_SIZE = 256
+WRITE_BATCH_WAIT = 0.01
+WRITE_QUEUE_MAXSIZE = 10000
+
+_write_queue: Optional["queue.Queue[tuple]"] = None
+_writer_pid: Optional[int] = None
+_writer_lock = threading.Lock()
+
+
+def _drain_writes(pending: "queue.Queue[tuple]") -> None:
+    while True:
+        batch = [pending.get()]
+        deadline = time.monotonic() + WRITE_BATCH_WAIT
+        while len(batch) < WRITE_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for key, payload, ttl in batch:
+                pipe.setex(key, ttl, payload)
+            pipe.execute()
+        except Exception:
+            # Best effort, like the synchronous write it replaces
+            pass
+
+
+def _enqueue_write(key: str, payload: bytes, ttl: int) -> None:
+    global _write_queue, _writer_pid
+    # Threads don't survive fork (gunicorn --preload); start one writer per process on first use
+    if _writer_pid != os.getpid():
+        with _writer_lock:
+            if _writer_pid != os.getpid():
+                _write_queue = queue.Queue(maxsize=WRITE_QUEUE_MAXSIZE)
+                threading.Thread(
+                    target=_drain_writes, args=(_write_queue,), name="cache-writer", daemon=True
+                ).start()
+                _writer_pid = os.getpid()
+    try:
+        _write_queue.put_nowait((key, payload, ttl))
+    except queue.Full:
+        # Skipping the write only costs a later miss
+        pass
+
+
+def _count_reader(counter: "itertools.count") -> Callable[[], int]:
+    """Read an itertools.count: next() advances it too, so subtract the reads made so far"""
+    reads = itertools.count()
+    lock = threading.Lock()
+
+    def read() -> int:
+        with lock:
+            return next(counter) - next(reads)
+
+    return read
+
+
+def cache_result(
+    ttl: int = 3600, key_prefix: Optional[str] = None, max_bytes: Optional[int] = None
+) -> Callable:
     """
-    Decorator to cache function results in Redis using JSON serialization.
+    Decorator to cache function results in Redis using JSON serialization (orjson).
 
     Args:
         ttl: Time to live in seconds for the cached item.
         key_prefix: Optional static prefix for the cache key.
+        max_bytes: Skip caching results whose encoded size exceeds this (None = no limit),
+            so occasional multi-MB outputs don't push hotter small entries out of Redis.
 
     Notes:
-        - Cache key is composed of key_prefix (or function name) and a hash of args/kwargs.
-        - Function result must be JSON-serializable.
+        - Cache key is composed of key_prefix (or function name) and a blake2b hash of the
+          orjson-encoded arguments (non-JSON args hash by repr). For fixed signatures the
+          arguments are bound by a generated builder, so f(1, b=2), f(1, 2) and, when 2 is
+          b's default, f(1) share a key; *args/**kwargs functions hash args and sorted kwargs.
+        - Function result must be JSON-serializable (numpy scalars/arrays included).
+        - Results are written behind the call: an immediate repeat may still miss.
+        - ``func.cache_info()`` returns this process's {"hits": n, "misses": n}.
+        - ``func.cache_key(*args, **kwargs)`` returns the key for a call (for get_many), and
+          ``func.cache_clear()`` drops every cached result of func via invalidate_pattern.
     """
 
     def decorator(func: Callable) -> Callable:
         prefix = key_prefix or func.__name__
+        build_key = _specialized_key_builder(func, prefix) or (
+            lambda *args, **kwargs: _cache_key(prefix, args, kwargs)
+        )
+        # next() on an itertools.count is a single C call and atomic under the GIL, so the
+        # hot path bumps these without a lock or dict update; cache_info() reads them back
+        hits, misses = itertools.count(), itertools.count()
 
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            # Create a stable key by using repr of args/kwargs
-            raw_key = f"{prefix}:{repr(args)}:{repr(sorted(kwargs.items()))}"
-            cache_key = f"cache:{raw_key}"
+            cache_key = build_key(*args, **kwargs)
 
             cached = redis_client.get(cache_key)
             if cached is not None:
                 try:
-                    return json.loads(cached)
+                    result = orjson.loads(cached)
+                    next(hits)
+                    return result
                 except Exception:
                     # Fallback: delete bad cache and recompute
                     redis_client.delete(cache_key)
 
+            next(misses)
             result = func(*args, **kwargs)
 
             try:
-                payload = json.dumps(result)
-                redis_client.setex(cache_key, ttl, payload)
+                payload = orjson.dumps(result, option=_VALUE_OPTIONS)
+                if max_bytes is None or len(payload) <= max_bytes:
+                    _enqueue_write(cache_key, payload, ttl)
             except Exception:
                 # If result is not JSON serializable, skip caching
                 pass
 
             return result
 
+        wrapper.cache_key = build_key
+        wrapper.cache_clear = lambda: invalidate_pattern(f"cache:{prefix}:*")
+        read_hits, read_misses = _count_reader(hits), _count_reader(misses)
+        wrapper.cache_info = lambda: {"hits": read_hits(), "misses": read_misses()}
         return wrapper
 
     return decorator
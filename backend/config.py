@@ -5,11 +5,16 @@ Configuration settings for Valor IVX Backend
 import os
 from datetime import timedelta
 
+# Environment read once at import; the config classes below only reference these
+_SECRET_KEY = os.environ.get('SECRET_KEY')
+_JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY')
+_DATABASE_URL = os.environ.get('DATABASE_URL')
+
 class Config:
     """Base configuration class"""
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
+    SECRET_KEY = _SECRET_KEY or 'dev-secret-key-change-in-production'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
+    JWT_SECRET_KEY = _JWT_SECRET_KEY or 'jwt-secret-key-change-in-production'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
     
@@ -24,17 +29,17 @@ class Config:
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
-    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///valor_ivx_dev.db'
+    SQLALCHEMY_DATABASE_URI = _DATABASE_URL or 'sqlite:///valor_ivx_dev.db'
     SQLALCHEMY_ECHO = True
 
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
-    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///valor_ivx.db'
+    SQLALCHEMY_DATABASE_URI = _DATABASE_URL or 'sqlite:///valor_ivx.db'
     
     # Security settings for production
-    SECRET_KEY = os.environ.get('SECRET_KEY')
-    JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY')
+    SECRET_KEY = _SECRET_KEY
+    JWT_SECRET_KEY = _JWT_SECRET_KEY
     
     # Only validate in actual production environment
     if os.environ.get('FLASK_ENV') == 'production':
@@ -3,12 +3,21 @@ Database configuration for enterprise models
 Provides engine and session factory for enterprise tables
 """
 
+import asyncio
+import hashlib
+import logging
 import os
-from sqlalchemy import create_engine
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import date, datetime
+from sqlalchemy import bindparam, create_engine, event, or_, select, text
 from sqlalchemy.orm import sessionmaker, scoped_session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
-from models.enterprise_models import EnterpriseBase
+from models.enterprise_models import ApiKey, AuditLog, EnterpriseBase, Tenant, User
 
 
 def get_database_url():
@@ -32,6 +41,106 @@ def get_database_url():
     return "sqlite:///valor_ivx_enterprise.db"
 
 
+# Page size for new SQLite files; only honoured before the first page is written
+SQLITE_PAGE_SIZE = 8192
+
+
+# Per-connection settings, sent in one executescript round trip on every new connection.
+# busy_timeout waits out a concurrent writer instead of failing with "database is locked";
+# NORMAL sync is safe under WAL; cache_size is negative, i.e. 64 MiB regardless of page size.
+_CONNECTION_PRAGMAS = """
+PRAGMA synchronous=NORMAL;
+PRAGMA busy_timeout=5000;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+PRAGMA mmap_size=1073741824;
+PRAGMA wal_autocheckpoint=1000;
+"""
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply the per-connection pragmas; file-level ones are set once by _initialize_sqlite_file"""
+    dbapi_connection.executescript(_CONNECTION_PRAGMAS)
+
+
+def _initialize_sqlite_file(engine):
+    """
+    Set the pragmas stored in the database file itself, once at engine creation.
+
+    WAL lets readers proceed while a writer is active and persists across connections.
+    page_size and auto_vacuum only apply to a file with no pages yet, and page_size must
+    precede WAL (existing files are converted by the enable_sqlite_incremental_vacuum migration).
+    """
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        if cursor.execute("PRAGMA page_count").fetchone()[0] == 0:
+            cursor.execute(f"PRAGMA page_size={SQLITE_PAGE_SIZE}")
+            cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+    finally:
+        connection.close()
+
+
+def _optimize_sqlite(dbapi_connection, connection_record):
+    """Refresh planner statistics for tables this connection used (SQLite's advice on close)"""
+    try:
+        dbapi_connection.execute("PRAGMA optimize")
+    except Exception:
+        # Never block closing a connection on planner housekeeping
+        pass
+
+
+# Slow-query log: statements slower than DB_SLOW_QUERY_MS go to the backend.db.slow_query
+# logger from a background thread, so a burst of slow queries never waits on log handlers.
+# Past DB_SLOW_QUERY_MAX_PER_SEC records in a second, only 1 in DB_SLOW_QUERY_SAMPLE is kept.
+DB_SLOW_QUERY_MS = float(os.environ.get('DB_SLOW_QUERY_MS', '1000'))
+DB_SLOW_QUERY_MAX_PER_SEC = int(os.environ.get('DB_SLOW_QUERY_MAX_PER_SEC', '20'))
+DB_SLOW_QUERY_SAMPLE = int(os.environ.get('DB_SLOW_QUERY_SAMPLE', '10'))
+
+slow_query_logger = logging.getLogger('backend.db.slow_query')
+_slow_query_threshold_ns = int(DB_SLOW_QUERY_MS * 1e6)
+_slow_queries = None
+_slow_query_pid = None
+_slow_query_lock = threading.Lock()
+_slow_query_window = [0, 0]  # [second, records emitted in it]
+
+
+def _log_slow_queries(pending):
+    while True:
+        duration_ms, statement = pending.get()
+        slow_query_logger.warning("slow query (%.1f ms): %s", duration_ms, statement)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # A connection runs one statement at a time, so a single slot is enough
+    conn.info['query_start_ns'] = time.perf_counter_ns()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    global _slow_queries, _slow_query_pid
+    elapsed = time.perf_counter_ns() - conn.info.pop('query_start_ns', time.perf_counter_ns())
+    if elapsed < _slow_query_threshold_ns:
+        return
+    second = int(time.monotonic())
+    if _slow_query_window[0] != second:
+        _slow_query_window[:] = [second, 0]
+    _slow_query_window[1] += 1
+    over_budget = _slow_query_window[1] > DB_SLOW_QUERY_MAX_PER_SEC
+    if over_budget and random.random() * DB_SLOW_QUERY_SAMPLE >= 1:
+        return
+    # Threads don't survive fork; start one logging thread per process on first use
+    if _slow_query_pid != os.getpid():
+        with _slow_query_lock:
+            if _slow_query_pid != os.getpid():
+                _slow_queries = queue.SimpleQueue()
+                threading.Thread(target=_log_slow_queries, args=(_slow_queries,),
+                                 name='slow-query-log', daemon=True).start()
+                _slow_query_pid = os.getpid()
+    _slow_queries.put((elapsed / 1e6, statement[:200]))
+
+
 # Create engine with appropriate configuration
 def create_enterprise_engine():
     """Create SQLAlchemy engine for enterprise models"""
@@ -45,15 +154,32 @@ def create_enterprise_engine():
             poolclass=StaticPool,
             echo=False  # Set to True for SQL debugging
         )
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        event.listen(engine, "close", _optimize_sqlite)
+        _initialize_sqlite_file(engine)
+    elif os.environ.get('DB_PGBOUNCER', '').lower() in ('1', 'true', 'yes'):
+        # PgBouncer (transaction pooling) owns the server connections; don't pool twice
+        engine = create_engine(
+            db_url,
+            poolclass=NullPool,
+            echo=False
+        )
     else:
-        # Production database (PostgreSQL, etc.)
+        # Production database (PostgreSQL, etc.): sized to the host unless overridden, with
+        # burst headroom of twice the steady pool; LIFO keeps the same few server backends warm
+        pool_size = int(os.environ.get('DB_POOL_SIZE', max(5, (os.cpu_count() or 1) * 2)))
         engine = create_engine(
             db_url,
+            pool_size=pool_size,
+            max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', pool_size * 2)),
             pool_pre_ping=True,
-            pool_recycle=3600,
+            pool_recycle=1800,
+            pool_use_lifo=True,
             echo=False
         )
-    
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
     return engine
 
 
@@ -67,15 +193,155 @@ enterprise_session_factory = sessionmaker(
     bind=enterprise_engine
 )
 
-# Create scoped session for thread safety
-enterprise_session = scoped_session(enterprise_session_factory)
+def _session_scope():
+    """
+    Key for enterprise_session: the running asyncio task, else the thread. Coroutines sharing
+    an event-loop thread each get their own session (gevent workers monkey-patch get_ident
+    to the greenlet, so greenlets are already separate). The task object, not id(task), so a
+    finished task's id can't be reused into a stale session.
+
+    Task keys would otherwise pin every finished task and its session in the registry, so
+    the first lookup from a task registers _release_task_session to run when it completes.
+    """
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is None:
+        return threading.get_ident()
+    if task not in enterprise_session.registry.registry:
+        task.add_done_callback(_release_task_session)
+    return task
+
+
+def _release_task_session(task):
+    """Close and drop a finished task's session (the per-task enterprise_session.remove())"""
+    session = enterprise_session.registry.registry.pop(task, None)
+    if session is not None:
+        session.close()
+
+
+# Create scoped session for thread/task safety
+enterprise_session = scoped_session(enterprise_session_factory, scopefunc=_session_scope)
+
+
+# Seconds close_enterprise_db waits for checked-out connections to come back before disposing
+DB_SHUTDOWN_GRACE_SECONDS = float(os.environ.get('DB_SHUTDOWN_GRACE_SECONDS', '10'))
+_shutting_down = False
 
 
 def get_enterprise_session():
     """Get enterprise database session"""
+    if _shutting_down:
+        raise RuntimeError("Enterprise database is shutting down")
     return enterprise_session()
 
 
+def find_active_tenant_id(tenant_key):
+    """Primary key of the active tenant whose slug (or numeric id) is tenant_key, else None"""
+    condition = Tenant.slug == tenant_key
+    if tenant_key.isdigit():
+        condition = or_(condition, Tenant.id == int(tenant_key))
+    with enterprise_session_factory() as session:
+        row = (
+            session.query(Tenant.id)
+            .filter(condition, Tenant.is_active.is_(True))
+            .order_by(Tenant.id)
+            .first()
+        )
+    return row[0] if row else None
+
+
+# key_hash -> (generation, expires_at, row or None). API keys change rarely, so most requests
+# authenticate from memory; ORM writes to api_keys in this process bump the generation, which
+# invalidates every entry at once, and other processes pick changes up within the TTL.
+API_KEY_CACHE_TTL = int(os.environ.get('API_KEY_CACHE_TTL', '30'))
+API_KEY_CACHE_MAXSIZE = 10000
+_api_key_cache = {}
+_api_key_cache_lock = threading.Lock()
+_api_key_generation = 0
+
+# One round trip for the key and the owning tenant's / user's active flags
+_api_key_stmt = (
+    select(
+        ApiKey.id, ApiKey.tenant_id, ApiKey.user_id, ApiKey.permissions, ApiKey.is_active,
+        ApiKey.expires_at,
+        Tenant.is_active.label('tenant_active'), User.is_active.label('user_active'),
+    )
+    .join(Tenant, Tenant.id == ApiKey.tenant_id)
+    .outerjoin(User, User.id == ApiKey.user_id)
+    .where(ApiKey.key_hash == bindparam('key_hash'))
+)
+
+
+def invalidate_api_keys(*args):
+    """Drop every cached API key lookup in this process (also the api_keys write listener)"""
+    global _api_key_generation
+    with _api_key_cache_lock:
+        _api_key_generation += 1
+        _api_key_cache.clear()
+
+
+for _event_name in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(ApiKey, _event_name, invalidate_api_keys)
+# Cached rows carry the tenant/user active flags too
+for _model in (Tenant, User):
+    event.listen(_model, 'after_update', invalidate_api_keys)
+
+
+def lookup_api_key(key_hash):
+    """
+    The api_keys row (a dict of id, tenant_id, user_id, permissions, is_active, expires_at,
+    tenant_active, user_active; user_active is None for tenant-wide keys) for key_hash, or
+    None. Callers still check the active flags and expires_at.
+    """
+    now = time.monotonic()
+    with _api_key_cache_lock:
+        hit = _api_key_cache.get(key_hash)
+        generation = _api_key_generation
+    if hit is not None and hit[0] == generation and hit[1] > now:
+        return hit[2]
+
+    with enterprise_session_factory() as session:
+        row = session.execute(_api_key_stmt, {'key_hash': key_hash}).mappings().first()
+    found = dict(row) if row is not None else None
+    with _api_key_cache_lock:
+        # Skip storing a row read before a concurrent invalidation
+        if generation == _api_key_generation:
+            if len(_api_key_cache) >= API_KEY_CACHE_MAXSIZE:
+                _api_key_cache.pop(next(iter(_api_key_cache)), None)
+            _api_key_cache[key_hash] = (generation, now + API_KEY_CACHE_TTL, found)
+    return found
+
+
+def hash_api_key(api_key):
+    """The key_hash stored for a raw API key: keys are only ever kept as SHA-256 hex digests"""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+
+
+def authenticate_api_key(api_key):
+    """
+    The lookup_api_key row for a raw API key that may be used now, or None: the key is active
+    and unexpired, its tenant is active and, for a user's key, so is the user.
+    """
+    row = lookup_api_key(hash_api_key(api_key))
+    if row is None or not row['is_active'] or not row['tenant_active']:
+        return None
+    if row['user_id'] is not None and not row['user_active']:
+        return None
+    if row['expires_at'] is not None and row['expires_at'] <= datetime.utcnow():
+        return None
+    return row
+
+
+def insert_audit_rows(rows):
+    """Insert audit_logs rows (dicts of column values) in one transaction, as one executemany"""
+    if not rows:
+        return
+    with enterprise_session_factory() as session, session.begin():
+        session.bulk_insert_mappings(AuditLog, rows)
+
+
 def init_enterprise_db():
     """
     Initialize enterprise database tables
@@ -85,7 +351,98 @@ def init_enterprise_db():
     EnterpriseBase.metadata.create_all(bind=enterprise_engine)
 
 
-def close_enterprise_db():
-    """Close enterprise database connections"""
+def vacuum_enterprise_db(pages=1000):
+    """
+    Return up to `pages` free pages (left by pruned audit_logs / quota_usage rows) to the
+    filesystem. Cheap with auto_vacuum=INCREMENTAL: no file rewrite, unlike VACUUM.
+    No-op for non-SQLite databases; returns the number of free pages remaining.
+    """
+    if enterprise_engine.dialect.name != 'sqlite':
+        return 0
+    with enterprise_engine.connect() as conn:
+        # The pragma frees one page per step, so drain its result to run it to completion
+        conn.exec_driver_sql(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+        conn.commit()
+        return conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+
+
+def _next_month(day):
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def ensure_audit_partitions(months_ahead=2):
+    """
+    Create the monthly audit_logs partitions from this month through months_ahead ahead,
+    moving in any of their rows that landed in the DEFAULT partition meanwhile. Postgres only,
+    once the partition_audit_logs migration has run; idempotent. Returns the names of the
+    partitions created.
+    """
+    if enterprise_engine.dialect.name != 'postgresql':
+        return []
+    created = []
+    with enterprise_engine.begin() as conn:
+        if conn.execute(text(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('audit_logs')"
+        )).first() is None:
+            return []
+        has_default = conn.execute(
+            text("SELECT to_regclass('audit_logs_default')")
+        ).scalar() is not None
+        month = datetime.utcnow().date().replace(day=1)
+        for _ in range(months_ahead + 1):
+            name = f"audit_logs_{month:%Y_%m}"
+            if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is None:
+                _create_audit_partition(conn, name, month, _next_month(month), has_default)
+                created.append(name)
+            month = _next_month(month)
+    return created
+
+
+def _create_audit_partition(conn, name, start, end, has_default):
+    bounds = {"start": start, "end": end}
+    in_default = has_default and conn.execute(text(
+        "SELECT 1 FROM audit_logs_default WHERE created_at >= :start AND created_at < :end LIMIT 1"
+    ), bounds).first() is not None
+    if in_default:
+        # Postgres refuses a partition whose range already has rows in the default partition
+        # (written while this job wasn't running): detach the default, create the month, move
+        # its rows over and reattach, all in this transaction
+        conn.exec_driver_sql("ALTER TABLE audit_logs DETACH PARTITION audit_logs_default")
+    conn.exec_driver_sql(
+        f"CREATE TABLE {name} PARTITION OF audit_logs FOR VALUES FROM ('{start}') TO ('{end}')"
+    )
+    if in_default:
+        conn.execute(text(
+            "INSERT INTO audit_logs SELECT * FROM audit_logs_default "
+            "WHERE created_at >= :start AND created_at < :end"
+        ), bounds)
+        conn.execute(text(
+            "DELETE FROM audit_logs_default WHERE created_at >= :start AND created_at < :end"
+        ), bounds)
+        conn.exec_driver_sql("ALTER TABLE audit_logs ATTACH PARTITION audit_logs_default DEFAULT")
+
+
+def close_enterprise_db(grace_seconds=None):
+    """
+    Close enterprise database connections without cutting off queries in flight: refuse new
+    sessions, flush buffered audit rows, wait up to grace_seconds (DB_SHUTDOWN_GRACE_SECONDS)
+    for checked-out connections to be returned, then dispose of the pool.
+    """
+    global _shutting_down
+    _shutting_down = True
+    # Write out buffered audit rows first, if this process queued any
+    audit_queue = sys.modules.get('backend.audit_queue') or sys.modules.get('audit_queue')
+    if audit_queue is not None:
+        audit_queue.drain()
     enterprise_session.remove()
+
+    checkedout = getattr(enterprise_engine.pool, 'checkedout', None)
+    if checkedout is not None:
+        if grace_seconds is None:
+            grace_seconds = DB_SHUTDOWN_GRACE_SECONDS
+        deadline = time.monotonic() + grace_seconds
+        delay = 0.01
+        while checkedout() > 0 and time.monotonic() < deadline:
+            time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * 2, 0.5)
     enterprise_engine.dispose()
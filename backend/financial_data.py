@@ -4,8 +4,12 @@ Handles fetching financial data from external APIs like Alpha Vantage
 """
 
 import os
+import time
+import threading
+import functools
 import requests
 import json
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import logging
@@ -14,6 +18,41 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Per-process cache of upstream responses; fundamentals change at most daily
+FINANCIAL_CACHE_TTL = int(os.environ.get('FINANCIAL_CACHE_TTL', '900'))
+FINANCIAL_CACHE_MAXSIZE = 512
+
+# LRU order: hits move to the end, evictions pop the front (both O(1))
+_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _ttl_cached(fn):
+    """Cache successful results of an API method keyed on (method, upper-cased ticker, args)"""
+    @functools.wraps(fn)
+    def wrapper(self, ticker: str, *args, **kwargs):
+        key = (fn.__name__, ticker.upper()) + args + tuple(sorted(kwargs.items()))
+        now = time.monotonic()
+        with _cache_lock:
+            hit = _cache.get(key)
+            if hit is not None:
+                if hit[0] > now:
+                    _cache.move_to_end(key)
+                    return hit[1]
+                del _cache[key]
+
+        data = fn(self, ticker, *args, **kwargs)
+        # Errors and rate-limit notes come back as None; don't pin them for the TTL
+        if data is not None:
+            with _cache_lock:
+                _cache[key] = (now + FINANCIAL_CACHE_TTL, data)
+                _cache.move_to_end(key)
+                if len(_cache) > FINANCIAL_CACHE_MAXSIZE:
+                    _cache.popitem(last=False)
+        return data
+    return wrapper
+
+
 class FinancialDataAPI:
     """Financial data API client for fetching market data"""
     
@@ -21,6 +60,7 @@ class FinancialDataAPI:
         self.alpha_vantage_key = os.environ.get('ALPHA_VANTAGE_API_KEY')
         self.base_url = "https://www.alphavantage.co/query"
         
+    @_ttl_cached
     def get_company_overview(self, ticker: str) -> Optional[Dict[str, Any]]:
         """Get company overview data from Alpha Vantage"""
         if not self.alpha_vantage_key:
@@ -61,6 +101,7 @@ class FinancialDataAPI:
             logger.error(f"Error fetching company overview: {e}")
             return None
     
+    @_ttl_cached
     def get_income_statement(self, ticker: str) -> Optional[Dict[str, Any]]:
         """Get income statement data from Alpha Vantage"""
         if not self.alpha_vantage_key:
@@ -97,6 +138,7 @@ class FinancialDataAPI:
             logger.error(f"Error fetching income statement: {e}")
             return None
     
+    @_ttl_cached
     def get_balance_sheet(self, ticker: str) -> Optional[Dict[str, Any]]:
         """Get balance sheet data from Alpha Vantage"""
         if not self.alpha_vantage_key:
@@ -133,6 +175,7 @@ class FinancialDataAPI:
             logger.error(f"Error fetching balance sheet: {e}")
             return None
     
+    @_ttl_cached
     def get_cash_flow(self, ticker: str) -> Optional[Dict[str, Any]]:
         """Get cash flow statement data from Alpha Vantage"""
         if not self.alpha_vantage_key:
@@ -169,6 +212,7 @@ class FinancialDataAPI:
             logger.error(f"Error fetching cash flow: {e}")
             return None
     
+    @_ttl_cached
     def get_historical_prices(self, ticker: str, interval: str = 'daily') -> Optional[Dict[str, Any]]:
         """Get historical price data from Alpha Vantage"""
         if not self.alpha_vantage_key:
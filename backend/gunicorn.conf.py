@@ -6,18 +6,21 @@
 import multiprocessing
 import os
 import random
+import sys
 
 bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
 
-# Workers: start with CPU count; gthread for mixed I/O; can switch to gevent if desired
+# Workers: start with CPU count; gthread for mixed I/O; can switch to gevent if desired.
+# Keep workers x threads within the SQLAlchemy pool (DB_POOL_SIZE + DB_MAX_OVERFLOW per worker).
 workers = int(os.environ.get("GUNICORN_WORKERS", max(2, multiprocessing.cpu_count())))
 worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
-threads = int(os.environ.get("GUNICORN_THREADS", 2))
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
 
 # Timeouts and keepalive tuned for interactive APIs
 timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
 graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
-keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 2))
+# Long enough to reuse connections from nginx/the load balancer between requests
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 15))
 
 # Mitigate memory bloat
 max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
@@ -36,6 +39,31 @@ limit_request_field_size = int(os.environ.get("GUNICORN_LIMIT_REQUEST_FIELD_SIZE
 # Preload app to share memory pages across workers if safe
 preload_app = os.environ.get("GUNICORN_PRELOAD", "false").lower() in {"1", "true", "yes"}
 
+def post_fork(server, worker):
+    # With preload_app the master may already hold pooled DB sockets; drop the inherited pools
+    # so each worker opens its own (close=False leaves the master's connections untouched)
+    for name in ("backend.db_enterprise", "db_enterprise"):
+        module = sys.modules.get(name)
+        if module is not None:
+            module.enterprise_engine.dispose(close=False)
+    # The Dockerfile preloads "app:app", so the Flask module may be registered as "app"
+    for name in ("backend.app", "app"):
+        app_module = sys.modules.get(name)
+        if app_module is not None:
+            with app_module.app.app_context():
+                app_module.db.engine.dispose(close=False)
+
+    # gevent workers: make psycopg2 cooperative so DB waits yield to other greenlets
+    if worker_class == "gevent":
+        try:
+            from psycogreen.gevent import patch_psycopg
+            patch_psycopg()
+        except ImportError:
+            server.log.warning(
+                "gevent worker without psycogreen: database calls will block the worker"
+            )
+
+
 def post_worker_init(worker):
     # [P5] Hook for initializing any per-worker state if needed
     pass
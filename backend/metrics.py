@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import os
+import threading
 import time
+from functools import lru_cache
 from typing import Optional
 
 from flask import g, Response, current_app, has_request_context, request
@@ -43,6 +45,13 @@ QUOTA_INCREMENT_FAILURE_TOTAL: Optional[Counter] = None
 # Optional extended labels for model/variant metrics to avoid cardinality blowup
 FEATURE_MODEL_VARIANT_METRICS: bool = getattr(settings, "FEATURE_MODEL_VARIANT_METRICS", False)
 
+# Set once every metric above exists; later _init_metrics() calls return on this flag
+_metrics_initialized = False
+_init_lock = threading.Lock()
+
+# settings.FEATURE_PROMETHEUS_METRICS as of init_app
+_ENABLED = False
+
 
 def get_registry() -> CollectorRegistry:
     global _registry
@@ -60,6 +69,16 @@ def get_registry() -> CollectorRegistry:
 
 
 def _init_metrics() -> None:
+    global _metrics_initialized
+    if _metrics_initialized:
+        return
+    with _init_lock:
+        if not _metrics_initialized:
+            _create_metrics()
+            _metrics_initialized = True
+
+
+def _create_metrics() -> None:
     global HTTP_REQUESTS_TOTAL, HTTP_REQUEST_DURATION_SECONDS
     global CELERY_TASKS_TOTAL, CELERY_TASK_DURATION_SECONDS
     global ACTIVE_USERS, CACHE_HIT_RATIO
@@ -188,8 +207,11 @@ def _init_metrics() -> None:
 
 
 def init_app(app) -> None:
-    if not settings.FEATURE_PROMETHEUS_METRICS:
+    global _ENABLED
+    _ENABLED = bool(settings.FEATURE_PROMETHEUS_METRICS)
+    if not _ENABLED:
         return
+    # Created here, once at startup, so the request hooks below never have to check
     _init_metrics()
 
     @app.route(settings.METRICS_ROUTE)
@@ -201,34 +223,58 @@ def init_app(app) -> None:
 
 
 def before_request() -> None:
-    if not settings.FEATURE_PROMETHEUS_METRICS:
-        return
-    _init_metrics()
     if has_request_context():
-        g._metrics_start_time = time.time()
+        g._metrics_start_time = time.perf_counter()
+
+
+# Label-bound children per label tuple, so the hot path skips .labels()' kwargs validation and
+# the metric's internal dict lookup under its lock. Bounded: rare combinations just rebind.
+@lru_cache(maxsize=4096)
+def _request_counter(method: str, endpoint: str, status: str, tenant: str):
+    return HTTP_REQUESTS_TOTAL.labels(method, endpoint, status, tenant)
+
+
+@lru_cache(maxsize=4096)
+def _request_histogram(method: str, endpoint: str, tenant: str):
+    return HTTP_REQUEST_DURATION_SECONDS.labels(method, endpoint, tenant)
+
+
+def prebind_request_metrics(app) -> None:
+    """
+    Bind the duration histogram child for every registered route and method up front (for
+    requests without a tenant header), so first requests skip .labels() too. Call after all
+    routes are registered; the series are exported with zero counts until traffic arrives.
+    """
+    if not _ENABLED or HTTP_REQUEST_DURATION_SECONDS is None:
+        return
+    for rule in app.url_map.iter_rules():
+        for method in rule.methods or ():
+            _request_histogram(method, rule.endpoint, "None")
 
 
 def after_request(response):
-    if not settings.FEATURE_PROMETHEUS_METRICS:
-        return response
     if not has_request_context():
         return response
+    # Preflights are answered before the timer starts; don't count them as traffic
+    if getattr(g, "_metrics_start_time", None) is None and request.method == "OPTIONS":
+        return response
 
     try:
         method = request.method
-        endpoint = request.endpoint or request.path
+        # The route's endpoint name, never the raw path: unmatched URLs would add a series each
+        endpoint = request.endpoint or "unknown"
         status = getattr(response, "status_code", None)
-        tenant = getattr(g, "tenant_id", "unknown")
+        tenant = str(getattr(g, "tenant_id", "unknown"))
 
         # Increment request counter
         if HTTP_REQUESTS_TOTAL is not None and status is not None:
-            HTTP_REQUESTS_TOTAL.labels(method=method, endpoint=endpoint, status=str(status), tenant=tenant).inc()
+            _request_counter(method, endpoint, str(status), tenant).inc()
 
         # Observe duration
         start = getattr(g, "_metrics_start_time", None)
         if start is not None and HTTP_REQUEST_DURATION_SECONDS is not None:
-            duration = time.time() - start
-            HTTP_REQUEST_DURATION_SECONDS.labels(method=method, endpoint=endpoint, tenant=tenant).observe(duration)
+            duration = time.perf_counter() - start
+            _request_histogram(method, endpoint, tenant).observe(duration)
     except Exception:
         # Do not break responses on metrics errors
         pass
@@ -236,39 +282,32 @@ def after_request(response):
     return response
 
 
-# Celery instrumentation helpers
-def celery_task_started(task_name: str) -> float:
-    if not settings.FEATURE_PROMETHEUS_METRICS:
-        return time.time()
+# Celery instrumentation helpers. Start times are perf_counter_ns() readings: monotonic (no
+# NTP jumps inside a task) and integer, converted to seconds only when observed.
+def celery_task_started(task_name: str) -> int:
     _init_metrics()
-    return time.time()
+    return time.perf_counter_ns()
 
 
-def celery_task_succeeded(task_name: str, start_time: float) -> None:
-    if not settings.FEATURE_PROMETHEUS_METRICS:
-        return
+def celery_task_succeeded(task_name: str, start_time: int) -> None:
     _init_metrics()
     if CELERY_TASKS_TOTAL is not None:
         CELERY_TASKS_TOTAL.labels(task_name=task_name, status="success").inc()
     if CELERY_TASK_DURATION_SECONDS is not None:
-        CELERY_TASK_DURATION_SECONDS.labels(task_name=task_name).observe(time.time() - start_time)
+        CELERY_TASK_DURATION_SECONDS.labels(task_name=task_name).observe((time.perf_counter_ns() - start_time) / 1e9)
 
 
-def celery_task_failed(task_name: str, start_time: float) -> None:
-    if not settings.FEATURE_PROMETHEUS_METRICS:
-        return
+def celery_task_failed(task_name: str, start_time: int) -> None:
     _init_metrics()
     if CELERY_TASKS_TOTAL is not None:
         CELERY_TASKS_TOTAL.labels(task_name=task_name, status="failure").inc()
     if CELERY_TASK_DURATION_SECONDS is not None:
-        CELERY_TASK_DURATION_SECONDS.labels(task_name=task_name).observe(time.time() - start_time)
+        CELERY_TASK_DURATION_SECONDS.labels(task_name=task_name).observe((time.perf_counter_ns() - start_time) / 1e9)
 
 
 # Rate limiting metrics helpers
 def rate_limit_allowed(tenant: str, limit_type: str) -> None:
     """Record a rate limit allow event"""
-    if not settings.FEATURE_PROMETHEUS_METRICS:
-        return
     _init_metrics()
     if RATE_LIMIT_ALLOWED_TOTAL is not None:
         # Hash tenant to avoid cardinality issues
@@ -278,8 +317,6 @@ def rate_limit_allowed(tenant: str, limit_type: str) -> None:
 
 def rate_limit_blocked(tenant: str, limit_type: str) -> None:
     """Record a rate limit block event"""
-    if not settings.FEATURE_PROMETHEUS_METRICS:
-        return
     _init_metrics()
     if RATE_LIMIT_BLOCKED_TOTAL is not None:
         # Hash tenant to avoid cardinality issues
@@ -290,8 +327,6 @@ def rate_limit_blocked(tenant: str, limit_type: str) -> None:
 # Quota metrics helpers
 def quota_increment_success(tenant: str, quota_type: str) -> None:
     """Record a successful quota increment"""
-    if not settings.FEATURE_PROMETHEUS_METRICS:
-        return
     _init_metrics()
     if QUOTA_INCREMENT_SUCCESS_TOTAL is not None:
         # Hash tenant to avoid cardinality issues
@@ -301,10 +336,39 @@ def quota_increment_success(tenant: str, quota_type: str) -> None:
 
 def quota_increment_failure(tenant: str, quota_type: str) -> None:
     """Record a failed quota increment"""
-    if not settings.FEATURE_PROMETHEUS_METRICS:
-        return
     _init_metrics()
     if QUOTA_INCREMENT_FAILURE_TOTAL is not None:
         # Hash tenant to avoid cardinality issues
         tenant_hash = str(hash(tenant) % 10000)
         QUOTA_INCREMENT_FAILURE_TOTAL.labels(tenant=tenant_hash, quota_type=quota_type).inc()
+
+
+# With metrics disabled the hooks and helpers above are rebound to no-ops here, at import,
+# before app.py, tasks.py and rate_limiter.py bind them by name: the disabled path costs one
+# empty call, and the real implementations carry no per-call flag check. The flag is
+# therefore read once per process; changing it requires a restart.
+if not settings.FEATURE_PROMETHEUS_METRICS:
+
+    def before_request() -> None:
+        return None
+
+    def after_request(response):
+        return response
+
+    def celery_task_started(task_name: str) -> int:
+        return time.perf_counter_ns()
+
+    def celery_task_succeeded(task_name: str, start_time: int) -> None:
+        return None
+
+    celery_task_failed = celery_task_succeeded
+
+    def rate_limit_allowed(tenant: str, limit_type: str) -> None:
+        return None
+
+    rate_limit_blocked = rate_limit_allowed
+
+    def quota_increment_success(tenant: str, quota_type: str) -> None:
+        return None
+
+    quota_increment_failure = quota_increment_success
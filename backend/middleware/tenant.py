@@ -1,20 +1,85 @@
+import os
+import re
+import threading
+import time
 from functools import wraps
-from flask import g, request, Response
-from typing import Callable, Any, Tuple
-from .rate_limiter import rate_limiter
+from flask import after_this_request, g, request, Response
+from typing import Callable, Any, Dict, Optional, Tuple
+from ..audit_queue import audit_request
+from ..rate_limiter import rate_limiter
+
+# Tenant slugs or numeric ids; anything else is rejected before touching the database
+TENANT_ID_REGEX = re.compile(r'[A-Za-z0-9_-]{1,64}')
+
+# X-Tenant-ID -> (expires_at, tenant pk or None). Unknown tenants are cached too, so a bad
+# header can't turn every request into a query; deactivation takes effect within the TTL.
+TENANT_CACHE_TTL = int(os.environ.get('TENANT_CACHE_TTL', '60'))
+TENANT_CACHE_MAXSIZE = 1024
+_tenant_cache: Dict[str, tuple] = {}
+_tenant_cache_lock = threading.Lock()
 
 
 def _error(message: str, status: int) -> Tuple[dict, int]:
     return {"error": message}, status
 
 
+def _resolve_tenant(tenant_id: str) -> Optional[int]:
+    """Primary key of the active tenant for an X-Tenant-ID value, from cache or the enterprise DB"""
+    now = time.monotonic()
+    with _tenant_cache_lock:
+        hit = _tenant_cache.get(tenant_id)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+
+    # Imported lazily: creating the enterprise engine is deferred until a tenant route runs
+    from ..db_enterprise import find_active_tenant_id
+
+    tenant_pk = find_active_tenant_id(tenant_id)
+    with _tenant_cache_lock:
+        if len(_tenant_cache) >= TENANT_CACHE_MAXSIZE:
+            _tenant_cache.pop(next(iter(_tenant_cache)), None)
+        _tenant_cache[tenant_id] = (now + TENANT_CACHE_TTL, tenant_pk)
+    return tenant_pk
+
+
+def _audit_api_call(response):
+    """Queue the request's 'api_call' audit row once its status is known"""
+    audit_request(
+        'api_call',
+        resource_type=request.endpoint,
+        resource_id=request.path[:255],
+        context={'method': request.method, 'status': response.status_code},
+    )
+    return response
+
+
 def tenant_required(f: Callable[..., Any]) -> Callable[..., Any]:
     @wraps(f)
     def decorated_function(*args, **kwargs):
         tenant_id = request.headers.get("X-Tenant-ID")
         if not tenant_id:
             return _error("Tenant ID required", 400)
+        if not TENANT_ID_REGEX.fullmatch(tenant_id):
+            return _error("Invalid tenant ID", 400)
+        tenant_pk = _resolve_tenant(tenant_id)
+        if tenant_pk is None:
+            return _error("Unknown or inactive tenant", 403)
         g.tenant_id = tenant_id
+        g.tenant_pk = tenant_pk
+        api_key = request.headers.get("X-API-Key")
+        if api_key:
+            from ..db_enterprise import authenticate_api_key
+
+            key = authenticate_api_key(api_key)
+            if key is None:
+                return _error("Invalid API key", 401)
+            if key['tenant_id'] != tenant_pk:
+                return _error("API key does not belong to this tenant", 403)
+            g.api_key_id = key['id']
+            g.api_key_permissions = key['permissions']
+            # The enterprise users.id, unlike g.user_id (the main app's JWT subject)
+            g.enterprise_user_id = key['user_id']
+        after_this_request(_audit_api_call)
         
         # Apply rate limiting and add precise headers
         client_key = rate_limiter.get_client_key()
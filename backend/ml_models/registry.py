@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import functools
 import importlib
 import random
+import threading
 import time
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, Optional, List, Tuple
@@ -12,6 +14,9 @@ class ModelSpec:
     module: str
     class_name: str
     factory: Optional[Callable[[], Any]] = None
+    # Build a new instance on every get() instead of sharing one per alias; also honoured
+    # as a __per_call__ = True attribute on factory
+    per_call: bool = False
 
 
 @dataclass(frozen=True)
@@ -59,18 +64,34 @@ class ModelRegistry:
         self._performance_metrics: Dict[str, List[float]] = {}
         # Model usage counters
         self._usage_counters: Dict[str, int] = {}
-
-    def register(self, alias: str, module: str, class_name: str, factory: Optional[Callable[[], Any]] = None) -> None:
-        self._registry[alias] = ModelSpec(module=module, class_name=class_name, factory=factory)
+        # Imported classes and shared instances per resolved alias, so warm get() calls skip
+        # importlib (and its import lock) and model construction
+        self._classes: Dict[str, type] = {}
+        self._instances: Dict[str, Any] = {}
+        self._build_lock = threading.Lock()
+        # Memoized routing for aliases without an enabled A/B test; cleared on any routing change
+        self._route = functools.lru_cache(maxsize=None)(self._static_route)
+
+    def register(self, alias: str, module: str, class_name: str, factory: Optional[Callable[[], Any]] = None,
+                 per_call: bool = False) -> None:
+        with self._build_lock:
+            self._registry[alias] = ModelSpec(module=module, class_name=class_name, factory=factory, per_call=per_call)
+            self._classes.pop(alias, None)
+            self._instances.pop(alias, None)
 
     def set_variant(self, base_alias: str, variant_alias: str) -> None:
         """
         Route base_alias to variant_alias. If variant_alias is empty, remove override.
         """
+        # Tasks re-apply their configured variant on every call; only a real change may
+        # drop the memoized routes
+        if self._variants.get(base_alias) == (variant_alias or None):
+            return
         if variant_alias:
             self._variants[base_alias] = variant_alias
-        elif base_alias in self._variants:
+        else:
             del self._variants[base_alias]
+        self._route.cache_clear()
 
     def configure_ab_test(self, base_alias: str, variant_a: str, variant_b: str, 
                          traffic_split: float = 0.5, enabled: bool = True) -> None:
@@ -90,25 +111,34 @@ class ModelRegistry:
             traffic_split=traffic_split,
             enabled=enabled
         )
+        self._route.cache_clear()
+
+    def _static_route(self, alias: str) -> Optional[str]:
+        """Variant-mapped alias, or None when an enabled A/B test picks per call."""
+        ab_config = self._ab_tests.get(alias)
+        if ab_config is not None and ab_config.enabled:
+            return None
+        return self._variants.get(alias, alias)
 
     def resolve_alias(self, alias: str) -> str:
         """
         Return final alias considering variants and A/B testing.
+
+        Pure apart from the A/B coin flip: nothing is recorded (see resolve_alias_tracked).
         """
-        # Check if A/B testing is configured for this alias
-        if alias in self._ab_tests and self._ab_tests[alias].enabled:
-            ab_config = self._ab_tests[alias]
+        final = self._route(alias)
+        if final is None:
             # Use random selection based on traffic split
-            if random.random() < ab_config.traffic_split:
-                final = ab_config.variant_b
-            else:
-                final = ab_config.variant_a
-        else:
-            # Use standard variant routing
-            final = self._variants.get(alias, alias)
-        
-        # store for introspection/metrics/tests
-        self._last_resolution[alias] = final
+            ab_config = self._ab_tests[alias]
+            final = ab_config.variant_b if random.random() < ab_config.traffic_split else ab_config.variant_a
+        return final
+
+    def resolve_alias_tracked(self, alias: str) -> str:
+        """resolve_alias(), also storing the result in _last_resolution for logs/metrics."""
+        final = self.resolve_alias(alias)
+        # Read first: the mapping rarely changes, so most calls skip the dict write
+        if self._last_resolution.get(alias) != final:
+            self._last_resolution[alias] = final
         return final
 
     def get(self, alias: str) -> Any:
@@ -122,11 +152,16 @@ class ModelRegistry:
         4) dynamic import of module.class_name
 
         Fallback: if variant resolves to unknown alias, fallback to base alias.
+
+        The instance is built once per resolved alias and shared (callers only predict/optimize);
+        specs registered with per_call=True get a new instance on every call.
         """
-        final_alias = self.resolve_alias(alias)
+        final_alias = self.resolve_alias_tracked(alias)
+        spec_alias = final_alias
         spec = self._registry.get(final_alias)
         if spec is None and final_alias != alias:
             # variant unknown, fallback to base
+            spec_alias = alias
             spec = self._registry.get(alias)
 
         if spec is None:
@@ -135,11 +170,25 @@ class ModelRegistry:
         # Track usage
         self._usage_counters[final_alias] = self._usage_counters.get(final_alias, 0) + 1
 
+        if spec.per_call or getattr(spec.factory, "__per_call__", False):
+            return self._build(spec_alias, spec)
+
+        instance = self._instances.get(spec_alias)
+        if instance is None:
+            with self._build_lock:
+                instance = self._instances.get(spec_alias)
+                if instance is None:
+                    instance = self._instances[spec_alias] = self._build(spec_alias, spec)
+        return instance
+
+    def _build(self, spec_alias: str, spec: ModelSpec) -> Any:
         if spec.factory:
             return spec.factory()
 
-        module = importlib.import_module(spec.module)
-        cls = getattr(module, spec.class_name)
+        cls = self._classes.get(spec_alias)
+        if cls is None:
+            module = importlib.import_module(spec.module)
+            cls = self._classes[spec_alias] = getattr(module, spec.class_name)
         return cls()
 
     def track_performance(self, alias: str, execution_time: float) -> None:
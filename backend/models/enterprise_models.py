@@ -22,12 +22,16 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, selectinload
 
 # Separate base for enterprise models
 EnterpriseBase = declarative_base()
 
+# JSON documents: binary, indexable JSONB on Postgres; JSON-encoded TEXT elsewhere
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
 
 class Tenant(EnterpriseBase):
     """Tenant/Organization model"""
@@ -41,7 +45,8 @@ class Tenant(EnterpriseBase):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
-    # Relationships
+    # Relationships (lazy: loading a tenant, e.g. through User.tenant, doesn't pull in every
+    # user and key; pages of tenants batch-load them with selectinload, as list() does)
     users = relationship("User", back_populates="tenant")
     api_keys = relationship("ApiKey", back_populates="tenant")
     rate_limits = relationship("RateLimit", back_populates="tenant")
@@ -52,6 +57,18 @@ class Tenant(EnterpriseBase):
         Index('idx_tenant_domain', 'domain'),
     )
 
+    @classmethod
+    def list(cls, session, limit: int = 50, offset: int = 0):
+        """A page of tenants ordered by id, with users and api_keys batch-loaded"""
+        return (
+            session.query(cls)
+            .options(selectinload(cls.users), selectinload(cls.api_keys))
+            .order_by(cls.id)
+            .limit(limit)
+            .offset(offset)
+            .all()
+        )
+
 
 class User(EnterpriseBase):
     """User model"""
@@ -70,7 +87,8 @@ class User(EnterpriseBase):
     # Relationships
     tenant = relationship("Tenant", back_populates="users")
     api_keys = relationship("ApiKey", back_populates="user")
-    audit_logs = relationship("AuditLog", back_populates="user")
+    # Unbounded; query AuditLog directly (paged) rather than lazy-loading it per user
+    audit_logs = relationship("AuditLog", back_populates="user", lazy="raise_on_sql")
     
     __table_args__ = (
         Index('idx_user_email', 'email'),
@@ -89,7 +107,7 @@ class ApiKey(EnterpriseBase):
     key_hash = Column(String(255), unique=True, nullable=False, index=True)
     name = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
-    permissions = Column(Text, nullable=True)  # JSON array of permissions as text
+    permissions = Column(JSONDocument, nullable=True)  # JSON array of permission strings
     last_used_at = Column(DateTime, nullable=True)
     expires_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -101,6 +119,8 @@ class ApiKey(EnterpriseBase):
     __table_args__ = (
         Index('idx_api_key_hash', 'key_hash'),
         Index('idx_api_key_tenant', 'tenant_id'),
+        # Serves permissions @> '["read:analytics"]' containment checks
+        Index('idx_api_key_perm_gin', 'permissions', postgresql_using='gin').ddl_if(dialect='postgresql'),
     )
 
 
@@ -142,7 +162,16 @@ class TenantPlan(EnterpriseBase):
     )
 
     tenant = relationship("Tenant", back_populates="tenant_plans")
-    plan = relationship("PlanDefinition", back_populates="tenant_plans")
+    # Few distinct plans behind many tenant rows: batch-load them with one IN query
+    plan = relationship("PlanDefinition", back_populates="tenant_plans", lazy="selectin")
+
+    @classmethod
+    def active(cls, session, tenant_ids=None):
+        """Active tenant plans (optionally for the given tenant ids) with plan loaded"""
+        query = session.query(cls).options(selectinload(cls.plan)).filter(cls.is_active.is_(True))
+        if tenant_ids is not None:
+            query = query.filter(cls.tenant_id.in_(list(tenant_ids)))
+        return query.order_by(cls.tenant_id).all()
 
     def __repr__(self) -> str:
         return f"<TenantPlan tenant_id={self.tenant_id!r} plan_id={self.plan_id} active={self.is_active}>"
@@ -156,7 +185,7 @@ class QuotaUsage(EnterpriseBase):
     tenant_id = Column(Integer, ForeignKey('tenants.id'), nullable=False)
     user_id = Column(String(64), nullable=True, index=True)
     quota_type = Column(String(100), nullable=False)  # e.g., 'api_calls', 'storage_mb'
-    metric_key = Column(String(64), nullable=False, index=True)  # e.g., 'requests', 'tokens', 'jobs'
+    metric_key = Column(String(64), nullable=False)  # e.g., 'requests', 'tokens', 'jobs'
     usage_count = Column(Integer, default=0, nullable=False)
     usage_amount = Column(Float, default=0.0, nullable=False)  # For storage, etc.
     window_start = Column(DateTime, nullable=False, index=True)
@@ -169,10 +198,12 @@ class QuotaUsage(EnterpriseBase):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     __table_args__ = (
-        Index('idx_quota_tenant_type', 'tenant_id', 'quota_type'),
         Index('idx_quota_period', 'period_start', 'period_end'),
+        # Its index also serves (tenant_id, quota_type) lookups as a prefix
         UniqueConstraint('tenant_id', 'quota_type', 'period_start', name='uq_quota_tenant_type_period'),
         UniqueConstraint("tenant_id", "user_id", "window_start", "metric_key", name="uq_quota_window_metric"),
+        # Quota enforcement: tenant_id = ? AND metric_key = ? AND window_start >= ? as one range seek
+        Index('ix_quota_lookup', 'tenant_id', 'metric_key', 'window_start'),
         CheckConstraint("window_end IS NULL OR window_end >= window_start", name="ck_quota_window_bounds"),
     )
 
@@ -189,7 +220,7 @@ class RateLimit(EnterpriseBase):
     user_id = Column(String(64), nullable=True, index=True)
     endpoint = Column(String(255), nullable=False)  # e.g., '/api/v1/analytics'
     method = Column(String(10), nullable=False)  # GET, POST, etc.
-    bucket_key = Column(String(128), nullable=False, index=True)  # scope of limit (route or feature)
+    bucket_key = Column(String(128), nullable=False)  # scope of limit (route or feature)
     requests_per_minute = Column(Integer, default=60, nullable=False)
     burst_limit = Column(Integer, default=100, nullable=False)
     capacity = Column(Integer, nullable=False)  # tokens
@@ -208,6 +239,7 @@ class RateLimit(EnterpriseBase):
         Index('idx_rate_limit_tenant_endpoint', 'tenant_id', 'endpoint'),
         UniqueConstraint('tenant_id', 'endpoint', 'method', name='uq_rate_limit_tenant_endpoint_method'),
         UniqueConstraint("tenant_id", "user_id", "bucket_key", name="uq_ratelimit_bucket"),
+        Index('ix_ratelimit_lookup', 'tenant_id', 'bucket_key', 'user_id'),
     )
 
     def __repr__(self) -> str:
@@ -216,6 +248,9 @@ class RateLimit(EnterpriseBase):
 
 class AuditLog(EnterpriseBase):
     """Audit logging for compliance and debugging"""
+    # On Postgres the table is RANGE (created_at) partitioned by month (migration
+    # d41a7c08e6f3), with primary key (id, created_at); id stays unique from its sequence
+    # and remains the ORM identity here, so SQLite keeps its rowid-backed integer key.
     __tablename__ = 'audit_logs'
     
     id = Column(Integer, primary_key=True)
@@ -226,15 +261,19 @@ class AuditLog(EnterpriseBase):
     resource_id = Column(String(255), nullable=True)
     ip_address = Column(String(45), nullable=True)  # IPv6 compatible
     user_agent = Column(Text, nullable=True)
-    context_data = Column(Text, nullable=True)  # Additional context as text
+    context_data = Column(JSONDocument, nullable=True)  # Additional context
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
-    # Relationships
-    user = relationship("User", back_populates="audit_logs")
+    # Relationships (never lazy-loaded per row while paging logs; use selectinload/joinedload)
+    user = relationship("User", back_populates="audit_logs", lazy="raise")
     
     __table_args__ = (
         Index('idx_audit_tenant_action', 'tenant_id', 'action'),
         Index('idx_audit_created_at', 'created_at'),
+        # "Latest N logs for a tenant": a backward range scan; INCLUDE makes the dashboard
+        # columns index-only on Postgres
+        Index('idx_audit_tenant_created', 'tenant_id', 'created_at',
+              postgresql_include=['action', 'resource_type']),
         Index('idx_audit_user', 'user_id'),
     )
 
@@ -243,10 +282,12 @@ class BillingEvent(EnterpriseBase):
     __tablename__ = "billing_events"
     __table_args__ = (
         UniqueConstraint("idempotency_key", name="uq_billing_idempotency"),
+        # Unprocessed-events scan per tenant, oldest first; also serves tenant_id lookups
+        Index('ix_billing_tenant_processed', 'tenant_id', 'processed', 'created_at'),
     )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    tenant_id = Column(Integer, ForeignKey('tenants.id'), nullable=False, index=True)
+    tenant_id = Column(Integer, ForeignKey('tenants.id'), nullable=False)
     event_type = Column(String(64), nullable=False)  # e.g., 'usage.report', 'invoice.paid'
     idempotency_key = Column(String(128), nullable=False, index=True)
     payload = Column(JSON, nullable=True)
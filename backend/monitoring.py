@@ -13,6 +13,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, asdict
 from collections import defaultdict, deque
+import numpy as np
 import psutil
 import redis
 from flask import Flask, request, g, current_app
@@ -322,13 +323,44 @@ class PrometheusMetrics:
 # System Monitoring
 # =============================================================================
 
+# SystemMonitor history: one preallocated float64 column per field plus a timestamp column,
+# written round-robin. 1024 samples is ~17 hours at the default 60 s interval.
+HISTORY_SIZE = 1024
+HISTORY_FIELDS = (
+    "cpu.percent",
+    "memory.percent",
+    "memory.available_gb",
+    "disk.percent",
+    "disk.free_gb",
+    "process.cpu_percent",
+    "process.memory_percent",
+    "process.memory_rss_mb",
+)
+
+# Alert thresholds on the latest sample, checked together as one vectorized comparison.
+# Sign +1 flags values above the threshold; -1 would flag values below (e.g. hit rates).
+THRESHOLD_FIELDS = ("cpu.percent", "memory.percent", "disk.percent")
+THRESHOLD_VALUES = np.array([80.0, 85.0, 90.0])
+THRESHOLD_SIGNS = np.array([1.0, 1.0, 1.0])
+
 class SystemMonitor:
     """System resource monitoring"""
     
     def __init__(self):
         self.metrics = {}
+        self._history_ts = np.zeros(HISTORY_SIZE, dtype=np.float64)
+        self._history = {
+            field: np.zeros(HISTORY_SIZE, dtype=np.float64) for field in HISTORY_FIELDS
+        }
+        # Total samples written; the next one goes to row _history_head % HISTORY_SIZE
+        self._history_head = 0
         self._monitoring_thread = None
         self._stop_monitoring = False
+        # cpu_percent(interval=None) reports usage since the previous call; prime both
+        # counters here so the first collection has a baseline instead of blocking for one
+        self._process = psutil.Process()
+        psutil.cpu_percent(interval=None)
+        self._process.cpu_percent(interval=None)
     
     def start_monitoring(self, interval: int = 60):
         """Start system monitoring in background thread"""
@@ -364,8 +396,9 @@ class SystemMonitor:
     def _collect_system_metrics(self):
         """Collect system metrics"""
         try:
-            # CPU metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU metrics: averaged over the time since the last collection (the loop's
+            # sleep sets the window), so the monitor thread never blocks here
+            cpu_percent = psutil.cpu_percent(interval=None)
             cpu_count = psutil.cpu_count()
             
             # Memory metrics
@@ -383,11 +416,11 @@ class SystemMonitor:
             network_bytes_sent = network.bytes_sent
             network_bytes_recv = network.bytes_recv
             
-            # Process metrics
-            process = psutil.Process()
-            process_cpu_percent = process.cpu_percent()
-            process_memory_percent = process.memory_percent()
-            process_memory_rss = process.memory_info().rss / (1024**2)  # MB
+            # Process metrics, read from one snapshot of /proc/self inside oneshot()
+            with self._process.oneshot():
+                process_cpu_percent = self._process.cpu_percent(interval=None)
+                process_memory_percent = self._process.memory_percent()
+                process_memory_rss = self._process.memory_info().rss / (1024**2)  # MB
             
             self.metrics = {
                 "timestamp": datetime.utcnow().isoformat(),
@@ -414,14 +447,72 @@ class SystemMonitor:
                 }
             }
             
+            self._record_history({
+                "cpu.percent": cpu_percent,
+                "memory.percent": memory_percent,
+                "memory.available_gb": memory_available,
+                "disk.percent": disk_percent,
+                "disk.free_gb": disk_free,
+                "process.cpu_percent": process_cpu_percent,
+                "process.memory_percent": process_memory_percent,
+                "process.memory_rss_mb": process_memory_rss,
+            })
+            
             logger.debug("System metrics collected", metrics=self.metrics)
             
         except Exception as e:
             logger.error("Failed to collect system metrics", error=str(e))
     
+    def _record_history(self, values: Dict[str, float]):
+        """Write one sample into the history ring"""
+        row = self._history_head % HISTORY_SIZE
+        self._history_ts[row] = time.time()
+        for field, value in values.items():
+            self._history[field][row] = value
+        # Advanced last, so readers never include the row being written
+        self._history_head += 1
+    
     def get_system_metrics(self) -> Dict[str, Any]:
         """Get current system metrics"""
         return self.metrics.copy()
+    
+    def check_thresholds(self, hours: float = 1) -> List[Dict[str, Any]]:
+        """Threshold violations in the latest sample, each with the field's p95 over `hours`"""
+        head = self._history_head
+        if not head:
+            return []
+        row = (head - 1) % HISTORY_SIZE
+        current = np.array([self._history[field][row] for field in THRESHOLD_FIELDS])
+        violated = np.flatnonzero((current - THRESHOLD_VALUES) * THRESHOLD_SIGNS > 0)
+        if not violated.size:
+            return []
+        history = self.get_historical_metrics(hours)
+        return [
+            {
+                "metric": THRESHOLD_FIELDS[i],
+                "value": float(current[i]),
+                "threshold": float(THRESHOLD_VALUES[i]),
+                # None when the latest sample is itself older than the window
+                "p95": (
+                    float(np.percentile(history[THRESHOLD_FIELDS[i]], 95))
+                    if history["timestamps"] else None
+                ),
+            }
+            for i in violated
+        ]
+    
+    def get_historical_metrics(self, hours: float = 1) -> Dict[str, List[float]]:
+        """Samples from the last `hours`, oldest first: {"timestamps": [...], "<field>": [...]}"""
+        head = self._history_head
+        count = min(head, HISTORY_SIZE)
+        # Ring rows in write order, so the timestamps are sorted and can be binary searched
+        rows = np.arange(head - count, head) % HISTORY_SIZE
+        timestamps = self._history_ts[rows]
+        rows = rows[np.searchsorted(timestamps, time.time() - hours * 3600):]
+        history = {"timestamps": self._history_ts[rows].tolist()}
+        for field, column in self._history.items():
+            history[field] = column[rows].tolist()
+        return history
 
 # =============================================================================
 # Health Checks
@@ -430,9 +521,11 @@ class SystemMonitor:
 class HealthChecker:
     """Comprehensive health checking"""
     
-    def __init__(self, app: Flask, redis_client: Optional[redis.Redis] = None):
+    def __init__(self, app: Flask, redis_client: Optional[redis.Redis] = None,
+                 system_monitor: Optional[SystemMonitor] = None):
         self.app = app
         self.redis_client = redis_client
+        self.system_monitor = system_monitor
         self.checks = {}
         self._register_default_checks()
     
@@ -443,6 +536,8 @@ class HealthChecker:
         self.register_check("external_apis", self._check_external_apis)
         self.register_check("disk_space", self._check_disk_space)
         self.register_check("memory_usage", self._check_memory_usage)
+        if self.system_monitor is not None:
+            self.register_check("system_thresholds", self._check_system_thresholds)
     
     def register_check(self, name: str, check_func: Callable[[], Dict[str, Any]]):
         """Register a health check"""
@@ -510,6 +605,18 @@ class HealthChecker:
         except Exception as e:
             return {"status": "unhealthy", "message": f"Memory check error: {str(e)}"}
     
+    def _check_system_thresholds(self) -> Dict[str, Any]:
+        """Check the latest SystemMonitor sample against THRESHOLD_VALUES"""
+        violations = self.system_monitor.check_thresholds()
+        if not violations:
+            return {"status": "healthy", "message": "System metrics within thresholds"}
+        metrics = ", ".join(v["metric"] for v in violations)
+        return {
+            "status": "degraded",
+            "message": f"Thresholds exceeded: {metrics}",
+            "violations": violations,
+        }
+    
     def run_health_checks(self) -> Dict[str, Any]:
         """Run all health checks"""
         results = {}
@@ -551,7 +658,7 @@ class MonitoringManager:
         self.slo_manager = SLOManager(redis_client)
         self.prometheus_metrics = PrometheusMetrics()
         self.system_monitor = SystemMonitor()
-        self.health_checker = HealthChecker(app, redis_client)
+        self.health_checker = HealthChecker(app, redis_client, self.system_monitor)
         
         # Start monitoring
         self.system_monitor.start_monitoring()
@@ -566,13 +673,13 @@ class MonitoringManager:
         
         @self.app.before_request
         def before_request():
-            g.start_time = time.time()
+            g.start_time = time.perf_counter()
             g.tenant_id = request.headers.get('X-Tenant-ID', 'default')
         
         @self.app.after_request
         def after_request(response):
             if hasattr(g, 'start_time'):
-                duration = time.time() - g.start_time
+                duration = time.perf_counter() - g.start_time
                 tenant = getattr(g, 'tenant_id', 'default')
                 
                 # Record HTTP metrics
@@ -633,6 +740,10 @@ class MonitoringManager:
         """Get system metrics"""
         return self.system_monitor.get_system_metrics()
     
+    def get_historical_metrics(self, hours: float = 1) -> Dict[str, List[float]]:
+        """Get system metrics history"""
+        return self.system_monitor.get_historical_metrics(hours)
+    
     def record_financial_calculation(self, calculation_type: str, duration: float, success: bool, tenant: str = "default"):
         """Record financial calculation metrics"""
         self.prometheus_metrics.record_financial_calculation(calculation_type, duration, success, tenant)
@@ -731,4 +842,12 @@ def init_monitoring_routes(app: Flask, monitoring_manager: MonitoringManager):
         """System metrics endpoint"""
         return monitoring_manager.get_system_metrics()
     
+    @app.route('/system/metrics/history')
+    def system_metrics_history():
+        """System metrics history endpoint (?hours=N, default 1)"""
+        hours = request.args.get('hours', 1, type=float)
+        if hours <= 0:
+            return {"error": "hours must be a positive number"}, 400
+        return monitoring_manager.get_historical_metrics(hours)
+    
     logger.info("Monitoring routes initialized")
\ No newline at end of file
@@ -5,6 +5,7 @@ Implements API rate limiting to prevent abuse and ensure fair usage
 
 import time
 import threading
+import zlib
 from collections import defaultdict, deque
 from typing import Dict, Deque, Optional
 from functools import wraps
@@ -14,12 +15,54 @@ from .metrics import rate_limit_allowed, rate_limit_blocked
 
 logger = logging.getLogger(__name__)
 
+# Token bucket, refilled continuously at ARGV[2] tokens/second up to ARGV[1], as a hash of
+# {tokens, ts} per key. One EVALSHA per check; the clock is Redis's, shared by all workers.
+# Returns {allowed, tokens left (floored), ms until the next token if denied, else until full}.
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2]) / 1000
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local reset_ms
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+    reset_ms = math.ceil((capacity - tokens) / rate)
+else
+    reset_ms = math.ceil((1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate) + 1000)
+return {allowed, math.floor(tokens), reset_ms}
+"""
+
+# After a Redis error, use the in-process sliding window for this long before retrying Redis
+REDIS_RETRY_SECONDS = 5.0
+
 class RateLimiter:
-    """Rate limiter implementation using sliding window"""
+    """
+    Rate limiter: a Redis token bucket shared by all workers when use_redis() has been
+    called, otherwise (or while Redis is unreachable) a per-process sliding window.
+    """
     
-    def __init__(self):
+    def __init__(self, redis_client=None):
         self.requests: Dict[str, Deque[float]] = defaultdict(deque)
         self.lock = threading.Lock()
+        self.redis_client = None
+        self._bucket_script = None
+        self._redis_retry_at = 0.0
+        # key -> monotonic deadline: a denied key is refused locally until its next token is
+        # due, so clients hammering past their limit don't cost a Redis call per request
+        self._denied_until: Dict[str, float] = {}
+        # Last bucket state seen by this thread, for get_remaining_requests after is_allowed
+        self._last = threading.local()
+        if redis_client is not None:
+            self.use_redis(redis_client)
         
         # Default rate limits (requests per window)
         self.default_limits = {
@@ -29,8 +72,52 @@ class RateLimiter:
             'heavy_operations': {'requests': 10, 'window': 60}  # 10 heavy operations per minute
         }
     
+    def use_redis(self, redis_client) -> None:
+        """Enforce limits with the Redis token bucket (script loaded once, then EVALSHA)"""
+        self.redis_client = redis_client
+        # redis-py's Script calls EVALSHA and reloads the script itself after a NOSCRIPT
+        self._bucket_script = redis_client.register_script(TOKEN_BUCKET_LUA)
+    
+    def _take_token(self, key: str, limit_type: str) -> Optional[bool]:
+        """Redis token bucket check; None when Redis isn't configured or reachable"""
+        self._last.state = None
+        if self._bucket_script is None or time.monotonic() < self._redis_retry_at:
+            return None
+        limit_config = self.default_limits.get(limit_type, self.default_limits['api'])
+        bucket = f"{limit_type}:{key}"
+        denied_until = self._denied_until.get(bucket)
+        if denied_until is not None:
+            wait = denied_until - time.monotonic()
+            if wait > 0:
+                self._last.state = (bucket, 0, int(time.time() + wait))
+                return False
+            self._denied_until.pop(bucket, None)
+        try:
+            allowed, tokens, reset_ms = self._bucket_script(
+                keys=[f"ratelimit:{bucket}"],
+                args=[limit_config['requests'], limit_config['requests'] / limit_config['window']],
+            )
+        except Exception as e:
+            logger.warning(f"Redis rate limiting unavailable, using in-process limits: {e}")
+            self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+            return None
+        if not allowed:
+            if len(self._denied_until) >= 10000:
+                self._denied_until.clear()
+            self._denied_until[bucket] = time.monotonic() + reset_ms / 1000
+        self._last.state = (bucket, int(tokens), int(time.time() + reset_ms / 1000))
+        return bool(allowed)
+    
     def is_allowed(self, key: str, limit_type: str = 'api') -> bool:
         """Check if request is allowed based on rate limits"""
+        allowed = self._take_token(key, limit_type)
+        if allowed is not None:
+            tenant_id = getattr(g, 'tenant_id', 'unknown')
+            if allowed:
+                rate_limit_allowed(tenant_id, limit_type)
+            else:
+                rate_limit_blocked(tenant_id, limit_type)
+            return allowed
         with self.lock:
             current_time = time.time()
             limit_config = self.default_limits.get(limit_type, self.default_limits['api'])
@@ -58,6 +145,16 @@ class RateLimiter:
     
     def get_remaining_requests(self, key: str, limit_type: str = 'api') -> Dict[str, int]:
         """Get remaining requests and reset time for a key"""
+        state = getattr(self._last, 'state', None)
+        if state is not None and state[0] == f"{limit_type}:{key}":
+            # Token bucket: answered from the is_allowed call just made on this thread
+            limit_config = self.default_limits.get(limit_type, self.default_limits['api'])
+            return {
+                'remaining': state[1],
+                'limit': limit_config['requests'],
+                'reset_time': state[2],
+                'window': limit_config['window']
+            }
         with self.lock:
             current_time = time.time()
             limit_config = self.default_limits.get(limit_type, self.default_limits['api'])
@@ -97,7 +194,9 @@ class RateLimiter:
         # Add user agent for additional uniqueness
         user_agent = request.headers.get('User-Agent', 'unknown')
         
-        return f"{client_ip}:{hash(user_agent) % 10000}"
+        # crc32, not hash(): str hashes are salted per process, and the Redis bucket key
+        # must be the same in every worker
+        return f"{client_ip}:{zlib.crc32(user_agent.encode()) % 10000}"
 
 # Global rate limiter instance
 rate_limiter = RateLimiter()
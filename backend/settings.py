@@ -16,6 +16,10 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "change-me"
     JWT_SECRET_KEY: str = "change-me"
 
+    # API docs; skipped in background workers (WORKER_CLASS=background)
+    ENABLE_SWAGGER: bool = True
+    WORKER_CLASS: str = ""
+
     # External APIs
     ALPHA_VANTAGE_API_KEY: str = ""
     
@@ -54,6 +58,9 @@ class Settings(BaseSettings):
     # Observability / Logging
     LOG_JSON: bool = True
     LOG_LEVEL: str = "INFO"
+    # Records held in memory before a write (flushed early on ERROR and at exit);
+    # 0 writes each record
+    LOG_BUFFER_CAPACITY: int = 0
     FEATURE_PROMETHEUS_METRICS: bool = True
     # When true, adds {model, variant} labels to model metrics. Beware label cardinality.
     FEATURE_MODEL_VARIANT_METRICS: bool = False
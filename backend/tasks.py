@@ -1,9 +1,10 @@
+import orjson
 import time
 import logging
 from typing import List, Dict, Any
 
 from celery import Celery
-from celery.signals import task_prerun, task_postrun, task_success, task_failure
+from celery.signals import task_prerun, task_postrun, task_success, task_failure, worker_init
 import contextvars
 
 from .settings import settings
@@ -23,7 +24,14 @@ celery_app = Celery("valor_ivx", broker=settings.REDIS_URL, backend=settings.RED
 _request_id_ctx: contextvars.ContextVar[str | None] = contextvars.ContextVar("request_id", default=None)
 
 # Instrumentation state (per-task timing)
-_task_start_times: Dict[str, float] = {}
+_task_start_times: Dict[str, int] = {}
+
+
+@worker_init.connect
+def _on_worker_init(**kwargs):
+    # Tasks import the Flask app lazily; mark the process so it skips web-only setup (Swagger)
+    if not settings.WORKER_CLASS:
+        settings.WORKER_CLASS = "background"
 
 
 @task_prerun.connect
@@ -93,11 +101,11 @@ def run_revenue_prediction(ticker: str, historical_data: List[Dict[str, Any]]) -
         pass
 
     try:
-        start_time = time.time()
+        start_time = time.perf_counter()
         predictor = get_model(base_alias)
         effective_alias = registry._last_resolution.get(base_alias, base_alias)  # introspection for logs/metrics
         result = predictor.predict(historical_data)
-        execution_time = time.time() - start_time
+        execution_time = time.perf_counter() - start_time
         
         # Track performance
         track_model_performance(effective_alias, execution_time)
@@ -138,11 +146,11 @@ def run_portfolio_optimization(assets: List[Dict[str, Any]], constraints: Dict[s
         pass
 
     try:
-        start_time = time.time()
+        start_time = time.perf_counter()
         optimizer = get_model(base_alias)
         effective_alias = registry._last_resolution.get(base_alias, base_alias)
         result = optimizer.optimize(assets, constraints)
-        execution_time = time.time() - start_time
+        execution_time = time.perf_counter() - start_time
         
         # Track performance
         track_model_performance(effective_alias, execution_time)
@@ -164,3 +172,93 @@ def run_portfolio_optimization(assets: List[Dict[str, Any]], constraints: Dict[s
             effective_model=registry._last_resolution.get(base_alias, base_alias),
         )
         raise
+
+
+def _run_save_job(job_id: str, user_id: int, persist_name: str, *args: Any) -> Any:
+    """
+    Run app.<persist_name>(user_id, *args) inside the Flask app context for a job enqueued
+    with ?async=true, recording progress in the job hash polled via /api/jobs/<job_id>.
+    """
+    # Imported lazily: the Flask app pulls in this module's celery_app
+    from . import app as app_module
+
+    key = app_module._job_key(job_id)
+    redis_client = app_module.redis_client
+    with app_module.app.app_context():
+        try:
+            if redis_client is not None:
+                redis_client.hset(key, "status", "running")
+            result = getattr(app_module, persist_name)(user_id, *args)
+            if redis_client is not None:
+                redis_client.hset(key, mapping={"status": "done", "result": orjson.dumps(result)})
+            logger.info("save_job_done", job_id=job_id, user_id=user_id, persist=persist_name)
+            return result
+        except Exception as e:
+            if redis_client is not None:
+                redis_client.hset(key, mapping={"status": "failed", "error": "Failed to save"})
+            logger.error("save_job_failed", job_id=job_id, user_id=user_id, persist=persist_name, error=str(e))
+            raise
+
+
+@celery_app.task(name="ma.save_scenarios")
+def save_ma_scenarios(user_id: int, scenarios_data: List[Dict[str, Any]], job_id: str) -> int:
+    """Persist an M&A scenario batch enqueued by POST /api/ma/scenarios?async=true."""
+    return len(_run_save_job(job_id, user_id, "persist_ma_scenarios", scenarios_data))
+
+
+@celery_app.task(name="ma.save_run")
+def save_ma_run(user_id: int, run_id: str, payload: Dict[str, Any], job_id: str) -> str:
+    """Persist an M&A run enqueued by POST /api/ma/runs?async=true."""
+    return _run_save_job(job_id, user_id, "persist_ma_run", run_id, payload)["run_id"]
+
+
+@celery_app.task(name="lbo.save_scenarios")
+def save_lbo_scenarios(user_id: int, tenant_id: int, scenarios_data: List[Dict[str, Any]], job_id: str) -> int:
+    """Persist an LBO scenario batch enqueued by POST /api/lbo/scenarios?async=true."""
+    return _run_save_job(job_id, user_id, "persist_lbo_scenarios", tenant_id, scenarios_data)
+
+
+@celery_app.task(name="auth.flush_last_login")
+def flush_last_login() -> int:
+    """Drain last_login timestamps buffered in Redis by AuthManager into one batched UPDATE."""
+    # Imported lazily: the Flask app pulls in this module's celery_app
+    from . import app as app_module
+    from .auth import flush_last_logins
+
+    if app_module.redis_client is None:
+        return 0
+    with app_module.app.app_context():
+        written = flush_last_logins(app_module.db, app_module.User, app_module.redis_client)
+    if written:
+        logger.info("last_login_flushed", rows=written)
+    return written
+
+
+@celery_app.task(name="enterprise.vacuum_audit_tables")
+def vacuum_audit_tables(pages: int = 1000) -> int:
+    """Reclaim SQLite pages freed by audit_logs / quota_usage pruning (incremental vacuum)."""
+    from .db_enterprise import vacuum_enterprise_db
+
+    remaining = vacuum_enterprise_db(pages)
+    logger.info("enterprise_db_vacuumed", pages=pages, free_pages_remaining=remaining)
+    return remaining
+
+
+@celery_app.task(name="enterprise.ensure_audit_partitions")
+def ensure_audit_partitions(months_ahead: int = 2) -> List[str]:
+    """Keep monthly audit_logs partitions created ahead of time (Postgres only)."""
+    from .db_enterprise import ensure_audit_partitions as ensure
+
+    created = ensure(months_ahead)
+    if created:
+        logger.info("audit_partitions_created", partitions=created)
+    return created
+
+
+celery_app.conf.beat_schedule = {
+    **(celery_app.conf.beat_schedule or {}),
+    "flush-last-login": {"task": "auth.flush_last_login", "schedule": 60.0},
+    "vacuum-audit-tables": {"task": "enterprise.vacuum_audit_tables", "schedule": 3600.0},
+    # Daily, so a missed run never leaves the next month without a partition
+    "ensure-audit-partitions": {"task": "enterprise.ensure_audit_partitions", "schedule": 86400.0},
+}
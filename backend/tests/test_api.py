@@ -4,7 +4,9 @@ API Tests for Valor IVX Backend
 
 import json
 import pytest
+from contextlib import contextmanager
 from datetime import datetime
+from sqlalchemy import event
 from app import app, db, User, Run, Scenario, Note
 
 @pytest.fixture
@@ -258,6 +260,73 @@ class TestNotesEndpoints:
         assert data['success'] is True
         assert data['content'] == ''
 
+@contextmanager
+def count_queries():
+    """Collect the SQL statements executed inside the block"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+class TestListQueryCount:
+    """List endpoints must not issue per-row queries while serializing"""
+    
+    def test_list_scenarios_query_count_is_constant(self, client, sample_scenario_data):
+        """Test that listing scenarios costs the same number of queries for 1 or 5 rows"""
+        client.post('/api/scenarios',
+                   data=json.dumps([sample_scenario_data]),
+                   content_type='application/json')
+        with count_queries() as one_row:
+            response = client.get('/api/scenarios')
+        assert response.status_code == 200
+        
+        more = [dict(sample_scenario_data, name=f'Scenario {i}') for i in range(4)]
+        client.post('/api/scenarios',
+                   data=json.dumps(more),
+                   content_type='application/json')
+        with count_queries() as five_rows:
+            response = client.get('/api/scenarios')
+        assert response.status_code == 200
+        
+        data = json.loads(response.data)
+        assert len(data['scenarios']) == 5
+        assert len(five_rows) == len(one_row)
+    
+    def test_summary_fields_skip_payload_columns(self, client, sample_scenario_data):
+        """Test that ?fields=summary returns only the summary columns"""
+        client.post('/api/scenarios',
+                   data=json.dumps([sample_scenario_data]),
+                   content_type='application/json')
+        
+        response = client.get('/api/scenarios?fields=summary')
+        assert response.status_code == 200
+        
+        scenario = json.loads(response.data)['scenarios'][0]
+        assert set(scenario) == set(Scenario.SUMMARY_FIELDS)
+
+class TestConditionalGet:
+    """Test ETag / If-None-Match on read endpoints"""
+
+    def test_last_run_not_modified(self, client, sample_run_data):
+        """Test that a matching If-None-Match returns an empty 304"""
+        client.post('/api/runs',
+                   data=json.dumps(sample_run_data),
+                   content_type='application/json')
+
+        response = client.get('/api/runs/last')
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+
+        response = client.get('/api/runs/last', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+
 class TestErrorHandling:
     """Test error handling"""
     
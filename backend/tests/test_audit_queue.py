@@ -0,0 +1,223 @@
+"""
+Tests for the buffered audit writer: batching, must_persist spill files and orphan replay
+"""
+
+import fcntl
+import os
+import threading
+import time
+
+import orjson
+import pytest
+from flask import Flask, g
+from sqlalchemy.exc import IntegrityError
+
+from backend import audit_queue
+
+
+@pytest.fixture
+def writes(tmp_path, monkeypatch):
+    """Fresh writer state with spill files in tmp_path; collects each inserted batch"""
+    batches = []
+    monkeypatch.setattr(audit_queue, 'AUDIT_SPILL_DIR', str(tmp_path))
+    monkeypatch.setattr(audit_queue, '_writer_pid', None)
+    monkeypatch.setattr(audit_queue, '_spill_file', None)
+    monkeypatch.setattr(audit_queue, '_insert_rows', lambda rows: batches.append(list(rows)))
+    yield batches
+    if audit_queue._spill_file is not None:
+        audit_queue._spill_file.close()
+
+
+def spill_files(tmp_path):
+    return sorted(tmp_path.glob('audit-spill-*.jsonl'))
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+class TestBatching:
+    def test_rows_written_in_one_batch(self, writes):
+        for i in range(5):
+            audit_queue.enqueue_audit({'action': f'a{i}', 'tenant_id': 1})
+        assert audit_queue.drain(timeout=5)
+
+        assert [row['action'] for batch in writes for row in batch] == [f'a{i}' for i in range(5)]
+        assert len(writes) == 1
+
+    def test_batches_capped_at_batch_size(self, writes, monkeypatch):
+        monkeypatch.setattr(audit_queue, 'AUDIT_BATCH_SIZE', 2)
+        for i in range(5):
+            audit_queue.enqueue_audit({'action': f'a{i}', 'tenant_id': 1})
+        assert audit_queue.drain(timeout=5)
+
+        assert sum(len(batch) for batch in writes) == 5
+        assert max(len(batch) for batch in writes) <= 2
+
+    def test_created_at_defaults_to_enqueue_time(self, writes):
+        audit_queue.enqueue_audit({'action': 'login', 'tenant_id': 1})
+        assert audit_queue.drain(timeout=5)
+        assert writes[0][0]['created_at'] is not None
+
+    def test_row_without_tenant_dropped(self, writes):
+        audit_queue.enqueue_audit({'action': 'orphan'})
+        audit_queue.enqueue_audit({'action': 'kept', 'tenant_id': 1})
+        assert audit_queue.drain(timeout=5)
+
+        assert [row['action'] for batch in writes for row in batch] == ['kept']
+
+    def test_rejected_row_does_not_sink_its_batch(self, writes, monkeypatch):
+        def strict_insert(rows):
+            if any(row['action'] == 'bad' for row in rows):
+                raise IntegrityError('INSERT', {}, Exception('violates foreign key'))
+            writes.append(list(rows))
+
+        monkeypatch.setattr(audit_queue, '_insert_rows', strict_insert)
+        for action in ('a', 'bad', 'b'):
+            audit_queue.enqueue_audit({'action': action, 'tenant_id': 1})
+        assert audit_queue.drain(timeout=5)
+
+        assert [row['action'] for batch in writes for row in batch] == ['a', 'b']
+
+
+class TestAuditRequest:
+    def test_user_id_is_the_enterprise_user(self, writes):
+        with Flask(__name__).test_request_context(headers={'User-Agent': 'pytest'}):
+            g.tenant_pk, g.user_id, g.enterprise_user_id = 1, 42, 7
+            audit_queue.audit_request('export', context={'format': 'csv'})
+        assert audit_queue.drain(timeout=5)
+
+        (row,) = writes[0]
+        assert (row['tenant_id'], row['user_id']) == (1, 7)
+        assert row['context_data'] == {'format': 'csv', 'app_user_id': 42}
+        assert row['user_agent'] == 'pytest'
+
+    def test_jwt_only_request_has_no_user_id(self, writes):
+        with Flask(__name__).test_request_context():
+            g.tenant_pk, g.user_id = 1, 42
+            audit_queue.audit_request('export')
+        assert audit_queue.drain(timeout=5)
+
+        (row,) = writes[0]
+        assert row['user_id'] is None
+        assert row['context_data'] == {'app_user_id': 42}
+
+
+class TestSpill:
+    def test_must_persist_row_spilled_before_commit_then_truncated(self, writes, tmp_path,
+                                                                  monkeypatch):
+        release = threading.Event()
+
+        def slow_insert(rows):
+            release.wait(5)
+            writes.append(list(rows))
+
+        monkeypatch.setattr(audit_queue, '_insert_rows', slow_insert)
+        audit_queue.enqueue_audit({'action': 'login', 'tenant_id': 1}, must_persist=True)
+
+        (spill,) = spill_files(tmp_path)
+        assert orjson.loads(spill.read_bytes().splitlines()[0])['action'] == 'login'
+
+        release.set()
+        assert audit_queue.drain(timeout=5)
+        assert spill.read_bytes() == b''
+
+    def test_spill_kept_when_insert_fails(self, writes, tmp_path, monkeypatch):
+        def failing_insert(rows):
+            raise RuntimeError('database down')
+
+        monkeypatch.setattr(audit_queue, '_insert_rows', failing_insert)
+        audit_queue.enqueue_audit({'action': 'login', 'tenant_id': 1}, must_persist=True)
+        assert audit_queue.drain(timeout=5)
+
+        (spill,) = spill_files(tmp_path)
+        assert len(spill.read_bytes().splitlines()) == 1
+
+    def test_unwritten_spilled_row_retried_with_next_batch(self, writes, tmp_path, monkeypatch):
+        database_up = threading.Event()
+
+        def flaky_insert(rows):
+            if not database_up.is_set():
+                raise RuntimeError('database down')
+            writes.append(list(rows))
+
+        monkeypatch.setattr(audit_queue, '_insert_rows', flaky_insert)
+        audit_queue.enqueue_audit({'action': 'login', 'tenant_id': 1}, must_persist=True)
+        audit_queue.enqueue_audit({'action': 'lost', 'tenant_id': 1})
+        assert audit_queue.drain(timeout=5)
+        assert writes == []
+
+        database_up.set()
+        audit_queue.enqueue_audit({'action': 'next', 'tenant_id': 1})
+        assert audit_queue.drain(timeout=5)
+
+        assert [row['action'] for batch in writes for row in batch] == ['login', 'next']
+        (spill,) = spill_files(tmp_path)
+        assert spill.read_bytes() == b''
+
+    def test_file_rewritten_to_pending_entries(self, writes, tmp_path, monkeypatch):
+        gates = [threading.Event(), threading.Event()]
+        calls = []
+
+        def gated_insert(rows):
+            gate = gates[len(calls)]
+            calls.append(rows)
+            gate.wait(5)
+            writes.append(list(rows))
+
+        monkeypatch.setattr(audit_queue, '_insert_rows', gated_insert)
+        audit_queue.enqueue_audit({'action': 'first', 'tenant_id': 1}, must_persist=True)
+        wait_until(lambda: len(calls) == 1)
+        audit_queue.enqueue_audit({'action': 'second', 'tenant_id': 1}, must_persist=True)
+
+        gates[0].set()
+        wait_until(lambda: len(calls) == 2)
+        (spill,) = spill_files(tmp_path)
+        assert [orjson.loads(line)['action'] for line in spill.read_bytes().splitlines()] == [
+            'second'
+        ]
+
+        gates[1].set()
+        assert audit_queue.drain(timeout=5)
+        (spill,) = spill_files(tmp_path)
+        assert spill.read_bytes() == b''
+
+    def test_spill_file_is_locked_by_its_writer(self, writes, tmp_path):
+        audit_queue.enqueue_audit({'action': 'login', 'tenant_id': 1}, must_persist=True)
+        assert audit_queue.drain(timeout=5)
+
+        (spill,) = spill_files(tmp_path)
+        with open(spill, 'rb') as other:
+            with pytest.raises(OSError):
+                fcntl.flock(other.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+class TestReplay:
+    def orphan(self, tmp_path, name, action):
+        path = tmp_path / f'audit-spill-{name}.jsonl'
+        row = {'action': action, 'tenant_id': 1, 'created_at': '2026-01-01T00:00:00'}
+        path.write_bytes(orjson.dumps(row) + b'\n' + b'{"torn')
+        return path
+
+    def test_unlocked_orphan_replayed_and_removed(self, writes, tmp_path):
+        # Same PID as this process: only the lock, not the name, decides ownership
+        path = self.orphan(tmp_path, f'{os.getpid()}-deadbeef', 'orphaned')
+        audit_queue.enqueue_audit({'action': 'new', 'tenant_id': 1})
+        assert audit_queue.drain(timeout=5)
+
+        actions = [row['action'] for batch in writes for row in batch]
+        assert actions == ['orphaned', 'new']
+        assert not path.exists()
+
+    def test_locked_spill_file_not_replayed(self, writes, tmp_path):
+        path = self.orphan(tmp_path, '1-livewriter', 'still-owned')
+        with open(path, 'rb') as owner:
+            fcntl.flock(owner.fileno(), fcntl.LOCK_EX)
+            audit_queue.enqueue_audit({'action': 'new', 'tenant_id': 1})
+            assert audit_queue.drain(timeout=5)
+
+        assert [row['action'] for batch in writes for row in batch] == ['new']
+        assert path.exists()
@@ -6,10 +6,16 @@ Tests user registration, login, token management, and rate limiting
 import pytest
 import json
 import time
+import jwt
 from datetime import datetime, timedelta
 from werkzeug.security import generate_password_hash
-from auth import AuthManager, auth_required, get_current_user_id
-from rate_limiter import RateLimiter, rate_limiter
+from backend import auth as auth_module
+from backend.auth import (
+    LAST_LOGIN_KEY, USERNAME_REGEX, AuthManager, _bcrypt_rounds, _hash_password,
+    _verified_user_id, auth_required, flush_last_logins, get_current_user_id,
+    load_request_identity,
+)
+from backend.rate_limiter import RateLimiter, rate_limiter
 
 @pytest.fixture
 def auth_manager(app, db):
@@ -370,4 +376,289 @@ class TestAuthDecorators:
         assert response.status_code == 200
         data = json.loads(response.data)
         assert data['success'] is True
-        assert data['user_id'] == sample_user.id 
\ No newline at end of file
+        assert data['user_id'] == sample_user.id 
+
+
+@pytest.fixture
+def login_app():
+    """A throwaway app with its own users table, for AuthManager against a real session"""
+    from flask import Flask
+    from flask_jwt_extended import JWTManager
+    from flask_sqlalchemy import SQLAlchemy
+
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://', JWT_SECRET_KEY='test-secret')
+    JWTManager(app)
+    login_db = SQLAlchemy(app)
+
+    class LoginUser(login_db.Model):
+        id = login_db.Column(login_db.Integer, primary_key=True)
+        username = login_db.Column(login_db.String(80), unique=True, nullable=False)
+        email = login_db.Column(login_db.String(120), unique=True, nullable=False)
+        password_hash = login_db.Column(login_db.String(255), nullable=False)
+        created_at = login_db.Column(login_db.DateTime)
+        last_login = login_db.Column(login_db.DateTime)
+
+    with app.app_context():
+        login_db.create_all()
+        login_db.session.add(LoginUser(
+            username='testuser', email='test@example.com',
+            password_hash=_hash_password('Secure-password-123'),
+        ))
+        login_db.session.commit()
+        yield app, login_db, LoginUser
+
+
+class FakeLoginRedis:
+    """In-memory stand-in for the hash and MULTI commands the last_login buffer uses"""
+
+    def __init__(self):
+        self.hashes = {}
+
+    @staticmethod
+    def _bytes(value):
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[self._bytes(field)] = self._bytes(value)
+
+    def hsetnx(self, key, field, value):
+        self.hashes.setdefault(key, {}).setdefault(self._bytes(field), self._bytes(value))
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def delete(self, key):
+        return int(self.hashes.pop(key, None) is not None)
+
+    def pipeline(self):
+        return FakeLoginPipeline(self)
+
+
+class FakeLoginPipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    def execute(self):
+        return [getattr(self.redis_client, name)(*args) for name, args in self.commands]
+
+
+class TestLastLoginBuffer:
+    """Test that logins buffer last_login in Redis and the beat task writes it back"""
+
+    def test_login_buffers_last_login(self, login_app):
+        """Test that a login with Redis leaves the row alone and records the time in the hash"""
+        app, login_db, LoginUser = login_app
+        redis_client = FakeLoginRedis()
+        result = AuthManager(login_db, LoginUser, redis_client).login_user(
+            'testuser', 'Secure-password-123'
+        )
+
+        assert result['valid'] is True
+        assert list(redis_client.hgetall(LAST_LOGIN_KEY)) == [str(result['user']['id']).encode()]
+        login_db.session.expire_all()
+        assert login_db.session.get(LoginUser, result['user']['id']).last_login is None
+
+    def test_login_without_redis_writes_row(self, login_app):
+        """Test that without Redis last_login is written on login as before"""
+        app, login_db, LoginUser = login_app
+        result = AuthManager(login_db, LoginUser).login_user('testuser', 'Secure-password-123')
+
+        login_db.session.expire_all()
+        assert login_db.session.get(LoginUser, result['user']['id']).last_login is not None
+
+    def test_flush_writes_buffered_logins(self, login_app):
+        """Test that the flush writes every buffered timestamp and empties the hash"""
+        app, login_db, LoginUser = login_app
+        redis_client = FakeLoginRedis()
+        user = LoginUser.query.filter_by(username='testuser').one()
+        redis_client.hset(LAST_LOGIN_KEY, user.id, 1700000000.5)
+
+        assert flush_last_logins(login_db, LoginUser, redis_client) == 1
+        assert redis_client.hgetall(LAST_LOGIN_KEY) == {}
+        login_db.session.expire_all()
+        assert login_db.session.get(LoginUser, user.id).last_login == datetime.utcfromtimestamp(
+            1700000000.5
+        )
+
+    def test_flush_with_nothing_buffered(self, login_app):
+        """Test that an empty buffer costs no UPDATE"""
+        app, login_db, LoginUser = login_app
+        assert flush_last_logins(login_db, LoginUser, FakeLoginRedis()) == 0
+
+    def test_failed_flush_restores_entries(self, login_app, monkeypatch):
+        """Test that entries go back into the hash when the UPDATE fails"""
+        app, login_db, LoginUser = login_app
+        redis_client = FakeLoginRedis()
+        redis_client.hset(LAST_LOGIN_KEY, 1, 1700000000)
+
+        def failing_execute(*args, **kwargs):
+            raise RuntimeError('database down')
+
+        monkeypatch.setattr(login_db.session, 'execute', failing_execute)
+        with pytest.raises(RuntimeError):
+            flush_last_logins(login_db, LoginUser, redis_client)
+
+        assert redis_client.hgetall(LAST_LOGIN_KEY) == {b'1': b'1700000000'}
+
+
+class TestBcryptCost:
+    """Test the configurable bcrypt work factor and the rehash on login"""
+
+    def test_rounds_clamped_to_bcrypt_range(self):
+        """Test that out-of-range BCRYPT_ROUNDS values are clamped instead of failing gensalt"""
+        assert _bcrypt_rounds('2') == 4
+        assert _bcrypt_rounds('40') == 31
+        assert _bcrypt_rounds('10') == 10
+
+    def test_login_rehashes_on_cost_mismatch(self, login_app, monkeypatch):
+        """Test that a hash made at another cost is rewritten at BCRYPT_ROUNDS on login"""
+        app, login_db, LoginUser = login_app
+        monkeypatch.setattr(auth_module, 'BCRYPT_ROUNDS', 4)
+        result = AuthManager(login_db, LoginUser, FakeLoginRedis()).login_user(
+            'testuser', 'Secure-password-123'
+        )
+
+        assert result['valid'] is True
+        login_db.session.expire_all()
+        password_hash = login_db.session.get(LoginUser, result['user']['id']).password_hash
+        assert password_hash.startswith('$2b$04$')
+        assert AuthManager(login_db, LoginUser).login_user(
+            'testuser', 'Secure-password-123'
+        )['valid'] is True
+
+    def test_login_keeps_hash_at_configured_cost(self, login_app):
+        """Test that a hash already at BCRYPT_ROUNDS is left as it is"""
+        app, login_db, LoginUser = login_app
+        before = LoginUser.query.filter_by(username='testuser').one().password_hash
+        AuthManager(login_db, LoginUser, FakeLoginRedis()).login_user(
+            'testuser', 'Secure-password-123'
+        )
+
+        login_db.session.expire_all()
+        assert LoginUser.query.filter_by(username='testuser').one().password_hash == before
+
+
+JWT_TEST_SECRET = 'test-secret'
+
+
+def make_token(exp_in=3600, **claims):
+    payload = {'sub': '7', 'exp': int(time.time()) + exp_in, **claims}
+    return jwt.encode(payload, JWT_TEST_SECRET, algorithm='HS256')
+
+
+@pytest.fixture
+def identity_client():
+    """An app with one auth_required route and the before_request identity hook"""
+    from flask import Flask, jsonify
+
+    auth_module._jwt_cache.clear()
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = JWT_TEST_SECRET
+    app.before_request(load_request_identity)
+
+    @app.route('/whoami')
+    @auth_required
+    def whoami():
+        return jsonify({'user_id': get_current_user_id()})
+
+    return app.test_client()
+
+
+class TestRequestIdentity:
+    """Test the cached JWT verification and the 401 responses built on it"""
+
+    def test_valid_token(self, identity_client):
+        """Test that a valid bearer token resolves to its subject"""
+        response = identity_client.get('/whoami',
+                                       headers={'Authorization': f'Bearer {make_token()}'})
+        assert response.status_code == 200
+        assert response.get_json() == {'user_id': '7'}
+
+    @pytest.mark.parametrize('header, message', [
+        (None, 'Authorization header required'),
+        ('Token abc', 'Invalid authorization header format'),
+        ('Bearer not-a-jwt', 'Invalid token'),
+    ])
+    def test_401_messages_unchanged(self, identity_client, header, message):
+        """Test the 401 body for missing, malformed and undecodable credentials"""
+        headers = {'Authorization': header} if header else {}
+        response = identity_client.get('/whoami', headers=headers)
+        assert response.status_code == 401
+        assert response.get_json() == {'error': message}
+
+    def test_expired_token_message(self, identity_client):
+        """Test that an expired token is reported as expired"""
+        token = make_token(exp_in=-10)
+        response = identity_client.get('/whoami', headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == 401
+        assert response.get_json() == {'error': 'Token expired'}
+
+    def test_token_without_subject_rejected(self, identity_client):
+        """Test that a token with an empty sub is rejected"""
+        token = make_token(sub='')
+        response = identity_client.get('/whoami', headers={'Authorization': f'Bearer {token}'})
+        assert response.get_json() == {'error': 'Invalid token'}
+
+    def test_cached_token_rejected_once_expired(self):
+        """Test that a cached token stops verifying at its exp, before the cache TTL runs out"""
+        auth_module._jwt_cache.clear()
+        token = make_token(exp_in=1)
+        assert _verified_user_id(token, JWT_TEST_SECRET) == '7'
+        assert _verified_user_id(token, JWT_TEST_SECRET) == '7'
+
+        time.sleep(2.1)
+        with pytest.raises(jwt.ExpiredSignatureError):
+            _verified_user_id(token, JWT_TEST_SECRET)
+
+    def test_cache_keyed_by_secret(self):
+        """Test that a token cached under one secret doesn't verify under another"""
+        auth_module._jwt_cache.clear()
+        token = make_token()
+        assert _verified_user_id(token, JWT_TEST_SECRET) == '7'
+        with pytest.raises(jwt.InvalidSignatureError):
+            _verified_user_id(token, 'rotated-secret')
+
+
+class TestUsernameAndLoginLookup:
+    """Test the single-pass username check and the email-or-username login lookup"""
+
+    @pytest.mark.parametrize('username', ['__-', '___', '-', 'a b', 'bad@name'])
+    def test_username_regex_rejects(self, username):
+        """Test that usernames without a letter or digit, or with other characters, fail"""
+        assert USERNAME_REGEX.fullmatch(username) is None
+
+    @pytest.mark.parametrize('username', ['abc', 'a_b-1', '_x_', '9'])
+    def test_username_regex_accepts(self, username):
+        """Test that letters, digits, underscores and hyphens are accepted"""
+        assert USERNAME_REGEX.fullmatch(username) is not None
+
+    def test_login_by_email(self, login_app):
+        """Test that an address with '@' logs in through the email lookup"""
+        app, login_db, LoginUser = login_app
+        result = AuthManager(login_db, LoginUser, FakeLoginRedis()).login_user(
+            'test@example.com', 'Secure-password-123'
+        )
+        assert result['valid'] is True
+        assert result['user']['username'] == 'testuser'
+
+    def test_login_by_username(self, login_app):
+        """Test that a plain name logs in through the username lookup"""
+        app, login_db, LoginUser = login_app
+        result = AuthManager(login_db, LoginUser, FakeLoginRedis()).login_user(
+            'testuser', 'Secure-password-123'
+        )
+        assert result['valid'] is True
+        assert result['user']['email'] == 'test@example.com'
+
+    def test_login_with_wrong_password(self, login_app):
+        """Test that a bad password gets the generic error"""
+        app, login_db, LoginUser = login_app
+        result = AuthManager(login_db, LoginUser, FakeLoginRedis()).login_user(
+            'test@example.com', 'Wrong-password-123'
+        )
+        assert result == {'valid': False, 'error': 'Invalid username or password'}
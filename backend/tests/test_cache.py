@@ -0,0 +1,219 @@
+"""
+Tests for cache_result: key equivalence and fallback keys, the write-behind queue,
+MGET reads, SCAN invalidation and hit/miss counters
+"""
+
+import fnmatch
+import os
+import queue
+import time
+
+import pytest
+
+from backend import cache
+from backend.cache import cache_result
+
+
+class FakeRedis:
+    """The commands cache.py issues, against a dict; SETEX TTLs are recorded, not enforced"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.unlink_calls = []
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def unlink(self, *keys):
+        self.unlink_calls.append(keys)
+        return self.delete(*keys)
+
+    def scan_iter(self, match=None, count=None):
+        return [key for key in list(self.data) if fnmatch.fnmatchcase(key, match)]
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append((key, ttl, value))
+
+    def execute(self):
+        for key, ttl, value in self.commands:
+            self.redis_client.setex(key, ttl, value)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = FakeRedis()
+    monkeypatch.setattr(cache, 'redis_client', client)
+    # A fresh writer thread and queue for each test
+    monkeypatch.setattr(cache, '_writer_pid', None)
+    return client
+
+
+def settle(fake_redis, key, timeout=5):
+    """Wait for the write-behind thread to store key"""
+    deadline = time.monotonic() + timeout
+    while key not in fake_redis.data:
+        assert time.monotonic() < deadline, f'{key} never written'
+        time.sleep(0.01)
+
+
+class TestKeys:
+    def test_positional_keyword_and_default_spellings_share_a_key(self):
+        def f(ticker, period=1):
+            pass
+
+        build = cache._specialized_key_builder(f, 'f')
+        assert build('AAPL') == build('AAPL', 1) == build('AAPL', period=1)
+        assert build(ticker='AAPL', period=1) == build('AAPL')
+        assert build('AAPL', 2) != build('AAPL')
+
+    def test_keyword_only_and_positional_only_parameters(self):
+        def f(a, /, b, *, c=3):
+            pass
+
+        build = cache._specialized_key_builder(f, 'f')
+        assert build(1, 2) == build(1, b=2) == build(1, 2, c=3)
+        assert build(1, 2, c=4) != build(1, 2)
+
+    def test_var_args_fall_back_to_generic_key(self):
+        def f(*args, **kwargs):
+            pass
+
+        assert cache._specialized_key_builder(f, 'f') is None
+        assert cache._cache_key('f', (1,), {'b': 2, 'a': 1}) == cache._cache_key(
+            'f', (1,), {'a': 1, 'b': 2}
+        )
+
+    def test_int_and_str_dict_keys_differ(self):
+        assert cache._hash_key('f', ({1: 'x'},)) != cache._hash_key('f', ({'1': 'x'},))
+
+    @pytest.mark.parametrize('value', [{(1, 2): 'x'}, 2 ** 70])
+    def test_unencodable_arguments_key_by_repr(self, value):
+        key = cache._hash_key('f', (value,))
+        assert key == cache._hash_key('f', (value,))
+        assert key.startswith('cache:f:')
+        assert key != cache._hash_key('f', (repr(value),))
+
+    def test_non_json_arguments_hash_by_repr(self):
+        class Point:
+            def __repr__(self):
+                return 'Point(1, 2)'
+
+        assert cache._hash_key('f', (Point(),)) == cache._hash_key('f', (Point(),))
+
+
+class TestCacheResult:
+    def test_miss_then_hit(self, fake_redis):
+        calls = []
+
+        @cache_result(ttl=60, key_prefix='square')
+        def square(x):
+            calls.append(x)
+            return {'value': x * x}
+
+        assert square(3) == {'value': 9}
+        settle(fake_redis, square.cache_key(3))
+        assert square(x=3) == {'value': 9}
+
+        assert calls == [3]
+        assert fake_redis.ttls[square.cache_key(3)] == 60
+        assert square.cache_info() == {'hits': 1, 'misses': 1}
+        assert square.cache_info() == {'hits': 1, 'misses': 1}
+
+    def test_results_over_max_bytes_not_written(self, fake_redis):
+        @cache_result(key_prefix='big', max_bytes=10)
+        def big(n):
+            return 'x' * n
+
+        big(100)
+        big(1)
+        settle(fake_redis, big.cache_key(1))
+        assert big.cache_key(100) not in fake_redis.data
+
+    def test_get_many_returns_hits_only(self, fake_redis):
+        @cache_result(key_prefix='double')
+        def double(x):
+            return x * 2
+
+        double(1)
+        settle(fake_redis, double.cache_key(1))
+        fake_redis.data['cache:double:corrupt'] = b'{not json'
+
+        keys = [double.cache_key(1), double.cache_key(2), 'cache:double:corrupt']
+        assert cache.get_many(keys) == {double.cache_key(1): 2}
+
+    def test_cache_clear_unlinks_in_batches(self, fake_redis):
+        for i in range(5):
+            fake_redis.data[f'cache:batchy:{i}'] = b'1'
+        fake_redis.data['cache:other:0'] = b'1'
+
+        assert cache.invalidate_pattern('cache:batchy:*', batch_size=2) == 5
+        assert [len(keys) for keys in fake_redis.unlink_calls] == [2, 2, 1]
+        assert list(fake_redis.data) == ['cache:other:0']
+
+
+class TestWriteBehind:
+    def test_writer_batches_into_one_pipeline(self, fake_redis, monkeypatch):
+        executed = []
+        original_execute = FakePipeline.execute
+
+        def recording_execute(pipe):
+            executed.append(len(pipe.commands))
+            original_execute(pipe)
+
+        monkeypatch.setattr(FakePipeline, 'execute', recording_execute)
+        monkeypatch.setattr(cache, 'WRITE_BATCH_WAIT', 0.2)
+        for i in range(3):
+            cache._enqueue_write(f'cache:w:{i}', b'1', 30)
+        settle(fake_redis, 'cache:w:2')
+
+        assert executed == [3]
+
+    def test_full_queue_drops_writes(self, fake_redis, monkeypatch):
+        # No writer thread: entries stay queued, as when Redis is stalling the writer
+        monkeypatch.setattr(cache, '_writer_pid', os.getpid())
+        monkeypatch.setattr(cache, '_write_queue', queue.Queue(maxsize=2))
+        for i in range(5):
+            cache._enqueue_write(f'cache:w:{i}', b'1', 30)
+
+        assert cache._write_queue.qsize() == 2
+
+    def test_writer_survives_redis_errors(self, fake_redis, monkeypatch):
+        original_pipeline = fake_redis.pipeline
+        failures = []
+
+        def flaky_pipeline(transaction=True):
+            if not failures:
+                failures.append(1)
+                raise ConnectionError('redis down')
+            return original_pipeline(transaction)
+
+        monkeypatch.setattr(fake_redis, 'pipeline', flaky_pipeline)
+        cache._enqueue_write('cache:w:lost', b'1', 30)
+        deadline = time.monotonic() + 5
+        while not failures:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        cache._enqueue_write('cache:w:kept', b'1', 30)
+        settle(fake_redis, 'cache:w:kept')
+        assert 'cache:w:lost' not in fake_redis.data
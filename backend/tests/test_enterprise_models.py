@@ -0,0 +1,71 @@
+"""
+Query-count tests for enterprise model loaders
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.models.enterprise_models import ApiKey, EnterpriseBase, Tenant, User
+
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite://')
+    EnterpriseBase.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        tenant = Tenant(name='Acme', slug='acme')
+        session.add(tenant)
+        session.flush()
+        users = [
+            User(tenant_id=tenant.id, username=f'user{i}', email=f'user{i}@acme.test')
+            for i in range(3)
+        ]
+        session.add_all(users)
+        session.flush()
+        session.add_all([
+            ApiKey(tenant_id=tenant.id, user_id=users[i].id, key_hash=f'hash{i}', name=f'key{i}')
+            for i in range(3)
+        ])
+        session.add(ApiKey(tenant_id=tenant.id, user_id=users[0].id, key_hash='expired',
+                           name='old', expires_at=datetime.utcnow() - timedelta(days=1)))
+        session.commit()
+        session.expunge_all()
+        yield session
+    engine.dispose()
+
+
+@contextmanager
+def count_queries(session):
+    """Collect the SQL statements executed inside the block"""
+    statements = []
+    engine = session.get_bind()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+class TestTenantRelationships:
+    def test_lazy_tenant_load_skips_its_users_and_keys(self, session):
+        user = session.query(User).filter_by(username='user0').one()
+        with count_queries(session) as statements:
+            assert user.tenant.slug == 'acme'
+
+        assert len(statements) == 1
+
+    def test_list_batch_loads_users_and_keys(self, session):
+        with count_queries(session) as statements:
+            (tenant,) = Tenant.list(session)
+            assert len(tenant.users) == 3
+            assert len(tenant.api_keys) == 4
+
+        assert len(statements) == 3
@@ -0,0 +1,61 @@
+"""
+Tests for enterprise_session's per-thread and per-asyncio-task scoping
+"""
+
+import asyncio
+import os
+
+# An in-memory enterprise database for this process, set before db_enterprise builds its engine
+os.environ.setdefault('DB_URL', 'sqlite://')
+
+from backend.db_enterprise import enterprise_session  # noqa: E402
+
+
+def registry():
+    return enterprise_session.registry.registry
+
+
+class TestSessionScope:
+    def test_thread_session_is_reused(self):
+        try:
+            assert enterprise_session() is enterprise_session()
+        finally:
+            enterprise_session.remove()
+
+    def test_tasks_get_separate_sessions(self):
+        async def session_of_task():
+            first = enterprise_session()
+            await asyncio.sleep(0)
+            assert enterprise_session() is first
+            return first
+
+        async def main():
+            return await asyncio.gather(session_of_task(), session_of_task())
+
+        first, second = asyncio.run(main())
+        assert first is not second
+
+    def test_finished_task_session_released(self):
+        async def use_session():
+            enterprise_session()
+            return asyncio.current_task()
+
+        async def main():
+            task = asyncio.ensure_future(use_session())
+            await task
+            # Done callbacks run on the next loop iteration
+            await asyncio.sleep(0)
+            return task
+
+        task = asyncio.run(main())
+        assert task not in registry()
+        assert not any(isinstance(key, asyncio.Task) for key in registry())
+
+    def test_remove_inside_task_still_releases(self):
+        async def main():
+            enterprise_session()
+            enterprise_session.remove()
+            enterprise_session()
+
+        asyncio.run(main())
+        assert not any(isinstance(key, asyncio.Task) for key in registry())
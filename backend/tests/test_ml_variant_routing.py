@@ -6,7 +6,7 @@ Phase 3: ML/Analytics Hardening
 import pytest
 from unittest.mock import patch, MagicMock
 from backend.app import init_ml_variant_routing
-from backend.ml_models.registry import registry as ml_registry
+from backend.ml_models.registry import ModelRegistry, registry as ml_registry
 from backend.settings import settings
 
 
@@ -165,6 +165,19 @@ class TestMLVariantRoutingIntegration:
         # Test prediction - should not return v2 variant marker
         result = model.predict([{"x": 1}])
         assert not (isinstance(result, dict) and result.get("variant") == "v2")
+    
+    def test_unchanged_variant_keeps_memoized_routes(self):
+        """Test that re-applying the same variant (as tasks do per call) keeps the route cache"""
+        registry = ModelRegistry()
+        registry.set_variant("revenue_predictor", "revenue_predictor_v2")
+        assert registry.resolve_alias("revenue_predictor") == "revenue_predictor_v2"
+        
+        registry.set_variant("revenue_predictor", "revenue_predictor_v2")
+        assert registry._route.cache_info().currsize == 1
+        
+        registry.set_variant("revenue_predictor", "")
+        assert registry._route.cache_info().currsize == 0
+        assert registry.resolve_alias("revenue_predictor") == "revenue_predictor"
 
 
 class TestMLVariantMetrics:
@@ -191,7 +204,7 @@ class TestMLVariantMetrics:
         ml_registry.set_variant("revenue_predictor", "revenue_predictor_v2")
         
         # Resolve alias
-        final_alias = ml_registry.resolve_alias("revenue_predictor")
+        final_alias = ml_registry.resolve_alias_tracked("revenue_predictor")
         
         # Verify tracking
         assert ml_registry._last_resolution.get("revenue_predictor") == "revenue_predictor_v2"
@@ -0,0 +1,130 @@
+"""
+Tests for SystemMonitor's history ring and thresholds, the system_thresholds health check
+and the system metrics history route
+"""
+
+import time
+
+import pytest
+from flask import Flask
+
+from backend import monitoring
+from backend.monitoring import (
+    HISTORY_FIELDS,
+    HealthChecker,
+    SystemMonitor,
+    init_monitoring_routes,
+)
+
+
+def sample(field, value):
+    """One collection with field set to value and every other field zero"""
+    row = dict.fromkeys(HISTORY_FIELDS, 0.0)
+    row[field] = value
+    return row
+
+
+@pytest.fixture
+def monitor():
+    return SystemMonitor()
+
+
+class FakeManager:
+    """The MonitoringManager methods the routes call, backed by a real SystemMonitor"""
+
+    def __init__(self, system_monitor):
+        self.system_monitor = system_monitor
+
+    def get_historical_metrics(self, hours=1):
+        return self.system_monitor.get_historical_metrics(hours)
+
+
+class TestHistory:
+    def test_empty_history(self, monitor):
+        history = monitor.get_historical_metrics()
+        assert history['timestamps'] == []
+        assert set(history) == {'timestamps', *HISTORY_FIELDS}
+
+    def test_samples_returned_oldest_first(self, monitor):
+        for value in (10.0, 20.0, 30.0):
+            monitor._record_history(sample('cpu.percent', value))
+
+        history = monitor.get_historical_metrics()
+        assert history['cpu.percent'] == [10.0, 20.0, 30.0]
+        assert history['timestamps'] == sorted(history['timestamps'])
+
+    def test_ring_keeps_newest_samples(self, monkeypatch):
+        monkeypatch.setattr(monitoring, 'HISTORY_SIZE', 3)
+        monitor = SystemMonitor()
+        for value in range(5):
+            monitor._record_history(sample('cpu.percent', float(value)))
+
+        assert monitor.get_historical_metrics()['cpu.percent'] == [2.0, 3.0, 4.0]
+
+    def test_window_excludes_older_samples(self, monitor, monkeypatch):
+        now = time.time()
+        clock = iter([now - 7200, now - 60])
+        monkeypatch.setattr(monitoring.time, 'time', lambda: next(clock, now))
+        monitor._record_history(sample('cpu.percent', 1.0))
+        monitor._record_history(sample('cpu.percent', 2.0))
+
+        assert monitor.get_historical_metrics(hours=1)['cpu.percent'] == [2.0]
+        assert monitor.get_historical_metrics(hours=3)['cpu.percent'] == [1.0, 2.0]
+
+
+class TestThresholds:
+    def test_no_samples_no_violations(self, monitor):
+        assert monitor.check_thresholds() == []
+
+    def test_only_latest_sample_checked(self, monitor):
+        monitor._record_history(sample('cpu.percent', 99.0))
+        monitor._record_history(sample('cpu.percent', 10.0))
+        assert monitor.check_thresholds() == []
+
+    def test_violation_carries_window_p95(self, monitor):
+        for value in (50.0, 60.0, 95.0):
+            row = sample('cpu.percent', value)
+            row['disk.percent'] = 91.0
+            monitor._record_history(row)
+
+        violations = {v['metric']: v for v in monitor.check_thresholds()}
+        assert set(violations) == {'cpu.percent', 'disk.percent'}
+        assert violations['cpu.percent']['value'] == 95.0
+        assert violations['cpu.percent']['threshold'] == 80.0
+        assert 60.0 < violations['cpu.percent']['p95'] <= 95.0
+        assert violations['disk.percent']['p95'] == 91.0
+
+
+class TestSystemThresholdsCheck:
+    def test_registered_only_with_a_monitor(self, monitor):
+        assert 'system_thresholds' not in HealthChecker(Flask(__name__)).checks
+        assert 'system_thresholds' in HealthChecker(Flask(__name__), system_monitor=monitor).checks
+
+    def test_healthy_then_degraded(self, monitor):
+        check = HealthChecker(Flask(__name__), system_monitor=monitor).checks['system_thresholds']
+        assert check()['status'] == 'healthy'
+
+        monitor._record_history(sample('memory.percent', 90.0))
+        result = check()
+        assert result['status'] == 'degraded'
+        assert result['message'] == 'Thresholds exceeded: memory.percent'
+        assert [v['metric'] for v in result['violations']] == ['memory.percent']
+
+
+class TestHistoryRoute:
+    @pytest.fixture
+    def client(self, monitor):
+        app = Flask(__name__)
+        init_monitoring_routes(app, FakeManager(monitor))
+        return app.test_client()
+
+    def test_history_route(self, client, monitor):
+        monitor._record_history(sample('memory.percent', 42.0))
+
+        response = client.get('/system/metrics/history?hours=0.5')
+        assert response.status_code == 200
+        assert response.get_json()['memory.percent'] == [42.0]
+
+    @pytest.mark.parametrize('hours', ['0', '-1'])
+    def test_invalid_hours_rejected(self, client, hours):
+        assert client.get(f'/system/metrics/history?hours={hours}').status_code == 400
@@ -0,0 +1,158 @@
+"""
+Tests for RateLimiter's Redis token bucket, local denial gate and in-process fallback
+"""
+
+import os
+import time
+import uuid
+import zlib
+
+import pytest
+import redis
+from flask import Flask
+
+from backend import rate_limiter as rate_limiter_module
+from backend.rate_limiter import RateLimiter
+
+
+@pytest.fixture(autouse=True)
+def app_context():
+    # is_allowed records metrics against g.tenant_id
+    with Flask(__name__).app_context():
+        yield
+
+
+@pytest.fixture
+def redis_client():
+    """A live Redis (REDIS_URL or localhost); the Lua bucket tests skip without one"""
+    client = redis.Redis.from_url(os.environ.get("REDIS_URL", "redis://localhost:6379/0"))
+    try:
+        client.ping()
+    except redis.RedisError:
+        pytest.skip("Redis not available")
+    yield client
+    for key in client.scan_iter(match="ratelimit:*"):
+        client.delete(key)
+
+
+class FakeScript:
+    """Stands in for a registered Lua script, returning queued results or raising"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = 0
+
+    def __call__(self, keys=None, args=None):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class FakeRedis:
+    def __init__(self, script):
+        self.script = script
+
+    def register_script(self, source):
+        return self.script
+
+
+def limiter_with(results, requests=2, window=1):
+    script = FakeScript(results)
+    limiter = RateLimiter(FakeRedis(script))
+    limiter.default_limits['test'] = {'requests': requests, 'window': window}
+    return limiter, script
+
+
+class TestClientKey:
+    def test_client_key_is_stable_across_processes(self):
+        """Test that the user agent suffix doesn't depend on the per-process str hash seed"""
+        app = Flask(__name__)
+        with app.test_request_context(headers={'User-Agent': 'pytest-agent'},
+                                      environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+            key = RateLimiter().get_client_key()
+        assert key == f"10.0.0.1:{zlib.crc32(b'pytest-agent') % 10000}"
+
+
+class TestTokenBucketScript:
+    def test_allows_up_to_capacity_then_denies(self, redis_client):
+        limiter = RateLimiter(redis_client)
+        limiter.default_limits['test'] = {'requests': 3, 'window': 60}
+        key = uuid.uuid4().hex
+
+        assert [limiter.is_allowed(key, 'test') for _ in range(3)] == [True, True, True]
+        assert limiter.is_allowed(key, 'test') is False
+
+        info = limiter.get_remaining_requests(key, 'test')
+        assert info['remaining'] == 0
+        assert info['limit'] == 3
+
+    def test_refills_over_time(self, redis_client):
+        limiter = RateLimiter(redis_client)
+        # 2 tokens, refilled at 4 per second
+        limiter.default_limits['test'] = {'requests': 2, 'window': 0.5}
+        key = uuid.uuid4().hex
+
+        assert limiter.is_allowed(key, 'test') is True
+        assert limiter.is_allowed(key, 'test') is True
+        assert limiter.is_allowed(key, 'test') is False
+
+        time.sleep(0.3)
+        assert limiter.is_allowed(key, 'test') is True
+
+    def test_bucket_is_shared_between_limiters(self, redis_client):
+        """Test that two workers (limiters) draw from the same bucket"""
+        first, second = RateLimiter(redis_client), RateLimiter(redis_client)
+        for limiter in (first, second):
+            limiter.default_limits['test'] = {'requests': 2, 'window': 60}
+        key = uuid.uuid4().hex
+
+        assert first.is_allowed(key, 'test') is True
+        assert second.is_allowed(key, 'test') is True
+        assert first.is_allowed(key, 'test') is False
+
+
+class TestLocalDenialGate:
+    def test_denied_key_skips_redis_until_next_token(self):
+        limiter, script = limiter_with([[0, 0, 200], [1, 0, 500]])
+
+        assert limiter.is_allowed('client', 'test') is False
+        assert limiter.is_allowed('client', 'test') is False
+        assert script.calls == 1
+        assert limiter.get_remaining_requests('client', 'test')['remaining'] == 0
+
+        time.sleep(0.25)
+        assert limiter.is_allowed('client', 'test') is True
+        assert script.calls == 2
+
+    def test_gate_is_per_key(self):
+        limiter, script = limiter_with([[0, 0, 1000], [1, 1, 500]])
+
+        assert limiter.is_allowed('blocked', 'test') is False
+        assert limiter.is_allowed('other', 'test') is True
+        assert script.calls == 2
+
+
+class TestRedisFallback:
+    def test_error_falls_back_to_in_process_window(self):
+        limiter, script = limiter_with([redis.ConnectionError("down"), [1, 1, 500]])
+
+        # Sliding window allows 2 per window while Redis is skipped
+        assert limiter.is_allowed('client', 'test') is True
+        assert limiter.is_allowed('client', 'test') is True
+        assert limiter.is_allowed('client', 'test') is False
+        assert script.calls == 1
+        assert len(limiter.requests['client']) == 2
+
+    def test_redis_retried_after_retry_interval(self, monkeypatch):
+        monkeypatch.setattr(rate_limiter_module, 'REDIS_RETRY_SECONDS', 0.05)
+        limiter, script = limiter_with([redis.ConnectionError("down"), [1, 1, 500]])
+
+        assert limiter.is_allowed('client', 'test') is True
+        assert script.calls == 1
+
+        time.sleep(0.1)
+        assert limiter.is_allowed('client', 'test') is True
+        assert script.calls == 2
+        assert len(limiter.requests['client']) == 1
@@ -0,0 +1,117 @@
+"""
+Tests for tenant_required's X-Tenant-ID resolution and X-API-Key authentication
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask, g
+
+# An in-memory enterprise database for this process, set before db_enterprise builds its engine
+os.environ.setdefault('DB_URL', 'sqlite://')
+
+from backend import audit_queue, db_enterprise  # noqa: E402
+from backend.db_enterprise import ApiKey, Tenant, User, hash_api_key  # noqa: E402
+from backend.middleware import tenant as tenant_middleware  # noqa: E402
+from backend.middleware.tenant import tenant_required  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def tenants():
+    db_enterprise.init_enterprise_db()
+    with db_enterprise.enterprise_session_factory() as session:
+        acme, other = Tenant(name='Acme', slug='acme'), Tenant(name='Other', slug='other')
+        session.add_all([acme, other])
+        session.flush()
+        active = User(tenant_id=acme.id, username='alice', email='alice@acme.test')
+        inactive = User(tenant_id=acme.id, username='bob', email='bob@acme.test', is_active=False)
+        session.add_all([active, inactive])
+        session.flush()
+        session.add_all([
+            ApiKey(tenant_id=acme.id, user_id=active.id, key_hash=hash_api_key('vk_user'),
+                   name='user key', permissions=['read:analytics']),
+            ApiKey(tenant_id=acme.id, key_hash=hash_api_key('vk_tenant'), name='tenant key'),
+            ApiKey(tenant_id=acme.id, user_id=inactive.id, key_hash=hash_api_key('vk_inactive'),
+                   name='inactive user key'),
+            ApiKey(tenant_id=acme.id, key_hash=hash_api_key('vk_revoked'), name='revoked',
+                   is_active=False),
+            ApiKey(tenant_id=acme.id, key_hash=hash_api_key('vk_expired'), name='expired',
+                   expires_at=datetime.utcnow() - timedelta(days=1)),
+            ApiKey(tenant_id=other.id, key_hash=hash_api_key('vk_other'), name='other tenant'),
+        ])
+        session.commit()
+        yield {'acme': acme.id, 'other': other.id, 'alice': active.id}
+
+
+@pytest.fixture
+def client(tenants):
+    tenant_middleware._tenant_cache.clear()
+    db_enterprise.invalidate_api_keys()
+    app = Flask(__name__)
+
+    @app.route('/whoami')
+    @tenant_required
+    def whoami():
+        return {
+            'tenant_pk': g.tenant_pk,
+            'api_key_id': g.get('api_key_id'),
+            'enterprise_user_id': g.get('enterprise_user_id'),
+        }
+
+    yield app.test_client()
+    # Write out the api_call rows these requests queued, so no later test's writer sees them
+    audit_queue.drain()
+
+
+class TestAuthenticateApiKey:
+    def test_active_user_key(self, tenants):
+        key = db_enterprise.authenticate_api_key('vk_user')
+        assert key['tenant_id'] == tenants['acme']
+        assert key['user_id'] == tenants['alice']
+        assert key['permissions'] == ['read:analytics']
+
+    def test_tenant_wide_key(self, tenants):
+        assert db_enterprise.authenticate_api_key('vk_tenant')['user_id'] is None
+
+    @pytest.mark.parametrize('api_key', ['vk_unknown', 'vk_revoked', 'vk_expired', 'vk_inactive'])
+    def test_unusable_keys_rejected(self, tenants, api_key):
+        assert db_enterprise.authenticate_api_key(api_key) is None
+
+
+class TestTenantRequired:
+    def test_tenant_without_api_key(self, client, tenants):
+        response = client.get('/whoami', headers={'X-Tenant-ID': 'acme'})
+        assert response.status_code == 200
+        assert response.get_json() == {
+            'tenant_pk': tenants['acme'], 'api_key_id': None, 'enterprise_user_id': None,
+        }
+
+    def test_api_key_sets_enterprise_user(self, client, tenants):
+        response = client.get('/whoami', headers={'X-Tenant-ID': 'acme', 'X-API-Key': 'vk_user'})
+        assert response.status_code == 200
+        assert response.get_json()['enterprise_user_id'] == tenants['alice']
+
+    def test_invalid_api_key_rejected(self, client):
+        response = client.get('/whoami', headers={'X-Tenant-ID': 'acme', 'X-API-Key': 'vk_nope'})
+        assert response.status_code == 401
+        assert response.get_json() == {'error': 'Invalid API key'}
+
+    def test_api_key_of_another_tenant_rejected(self, client):
+        response = client.get('/whoami', headers={'X-Tenant-ID': 'acme', 'X-API-Key': 'vk_other'})
+        assert response.status_code == 403
+
+    def test_unknown_tenant_rejected(self, client):
+        response = client.get('/whoami', headers={'X-Tenant-ID': 'nobody'})
+        assert response.status_code == 403
+
+    def test_api_call_audited_with_final_status(self, client, tenants, monkeypatch):
+        audited = []
+        monkeypatch.setattr(tenant_middleware, 'audit_request',
+                            lambda action, **fields: audited.append((action, fields, g.tenant_pk)))
+        client.get('/whoami', headers={'X-Tenant-ID': 'acme'})
+
+        ((action, fields, tenant_pk),) = audited
+        assert (action, tenant_pk) == ('api_call', tenants['acme'])
+        assert fields['resource_id'] == '/whoami'
+        assert fields['context'] == {'method': 'GET', 'status': 200}
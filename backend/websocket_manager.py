@@ -35,6 +35,8 @@ class WebSocketManager:
         self.socketio = None
         self.users: Dict[str, User] = {}
         self.rooms: Dict[str, Set[str]] = {}
+        # socket_id -> user_id, so disconnects don't scan every connected user
+        self.user_by_socket: Dict[str, str] = {}
         self.collaboration_data: Dict[str, Dict] = {}
         # Presence: room_id -> { user_id: { "tenant": str, "last_seen": datetime, "meta": dict } }
         self.presence: Dict[str, Dict[str, Dict]] = {}
@@ -218,7 +220,11 @@ class WebSocketManager:
                 joined_at=datetime.now(),
                 last_seen=datetime.now()
             )
+            previous = self.users.get(user_id)
+            if previous is not None and previous.socket_id != socket_id:
+                self.user_by_socket.pop(previous.socket_id, None)
             self.users[user_id] = user
+            self.user_by_socket[socket_id] = user_id
             
             # Add user to room
             if room_id not in self.rooms:
@@ -294,11 +300,8 @@ class WebSocketManager:
         """Handle user disconnection"""
         try:
             # Find user by socket ID
-            user = None
-            for u in self.users.values():
-                if u.socket_id == socket_id:
-                    user = u
-                    break
+            user_id = self.user_by_socket.pop(socket_id, None)
+            user = self.users.get(user_id) if user_id is not None else None
             
             if user:
                 # Handle leaving room